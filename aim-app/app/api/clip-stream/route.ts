@@ -4,6 +4,7 @@ export const dynamic = "force-dynamic";
 export const revalidate = 0;
 
 const backend = process.env.NEXT_PUBLIC_BASE_URL ?? "http://127.0.0.1:8000";
+const forwardedHeaders = ["range", "if-range", "if-none-match", "if-modified-since"];
 
 export async function GET(request: NextRequest) {
   const params = request.nextUrl.searchParams;
@@ -14,11 +15,21 @@ export async function GET(request: NextRequest) {
     return new Response("Missing params", { status: 400 });
   }
 
+  const headers: Record<string, string> = { Authorization: `Bearer ${token}` };
+  for (const name of forwardedHeaders) {
+    const value = request.headers.get(name);
+    if (value) headers[name] = value;
+  }
+
   const upstream = await fetch(`${backend}/api/v1/teams/${teamId}/clips/${clipId}/stream`, {
     cache: "no-store",
-    headers: { Authorization: `Bearer ${token}` },
+    headers,
   });
 
+  if (upstream.status === 304) {
+    return new Response(null, { status: 304, headers: upstream.headers });
+  }
+
   if (!upstream.ok || !upstream.body) {
     const body = await upstream.text();
     return new Response(body, { status: upstream.status });
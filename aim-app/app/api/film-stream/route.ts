@@ -4,6 +4,7 @@ export const dynamic = "force-dynamic";
 export const revalidate = 0;
 
 const backend = process.env.NEXT_PUBLIC_BASE_URL ?? "http://127.0.0.1:8000";
+const forwardedHeaders = ["range", "if-range", "if-none-match", "if-modified-since"];
 
 export async function GET(request: NextRequest) {
   const searchParams = request.nextUrl.searchParams;
@@ -14,21 +15,28 @@ export async function GET(request: NextRequest) {
     return new Response("Missing params", { status: 400 });
   }
 
+  const headers: Record<string, string> = { Authorization: `Bearer ${token}` };
+  for (const name of forwardedHeaders) {
+    const value = request.headers.get(name);
+    if (value) headers[name] = value;
+  }
+
   const upstream = await fetch(`${backend}/api/v1/teams/${teamId}/film/${uploadId}/stream`, {
     cache: "no-store",
-    headers: {
-      Authorization: `Bearer ${token}`,
-    },
+    headers,
   });
 
+  if (upstream.status === 304) {
+    return new Response(null, { status: 304, headers: upstream.headers });
+  }
+
   if (!upstream.ok || !upstream.body) {
     const text = await upstream.text();
     return new Response(text, { status: upstream.status });
   }
 
-  const headers = new Headers(upstream.headers);
   return new Response(upstream.body, {
     status: upstream.status,
-    headers,
+    headers: new Headers(upstream.headers),
   });
 }
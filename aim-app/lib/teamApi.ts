@@ -92,8 +92,27 @@ async function request<T>(path: string, token: string, init?: RequestInit): Prom
   return response.json() as Promise<T>;
 }
 
+// List endpoints are keyset-paginated: follow X-Next-Cursor until the last page.
+async function fetchAllPages<T>(path: string, token: string, errorMessage: string): Promise<T[]> {
+  const items: T[] = [];
+  let cursor: string | null = null;
+  do {
+    const query: string = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+    const response: Response = await fetch(`${baseUrl}${path}${query}`, {
+      headers: { Authorization: `Bearer ${token}` },
+    });
+    if (!response.ok) {
+      const detail = await response.json().catch(() => ({}));
+      throw new Error(detail.detail ?? detail.message ?? errorMessage);
+    }
+    items.push(...((await response.json()) as T[]));
+    cursor = response.headers.get("X-Next-Cursor");
+  } while (cursor);
+  return items;
+}
+
 export function fetchTeams(token: string): Promise<TeamMembership[]> {
-  return request<TeamMembership[]>("/api/v1/teams", token);
+  return fetchAllPages<TeamMembership>("/api/v1/teams", token, "Request failed");
 }
 
 export function createTeam(
@@ -143,17 +162,8 @@ export async function uploadTeamClip(
   return response.json();
 }
 
-export async function fetchTeamClips(token: string, teamId: number): Promise<ClipRecord[]> {
-  const response = await fetch(`${baseUrl}/api/v1/teams/${teamId}/clips`, {
-    headers: {
-      Authorization: `Bearer ${token}`,
-    },
-  });
-  if (!response.ok) {
-    const detail = await response.json().catch(() => ({}));
-    throw new Error(detail.detail ?? "Failed to load clips");
-  }
-  return response.json();
+export function fetchTeamClips(token: string, teamId: number): Promise<ClipRecord[]> {
+  return fetchAllPages<ClipRecord>(`/api/v1/teams/${teamId}/clips`, token, "Failed to load clips");
 }
 
 export async function deleteClip(token: string, teamId: number, clipId: number): Promise<void> {
@@ -197,15 +207,8 @@ export async function uploadGameFilm(
   return response.json();
 }
 
-export async function fetchGameFilm(token: string, teamId: number): Promise<GameUploadRecord[]> {
-  const response = await fetch(`${baseUrl}/api/v1/teams/${teamId}/film`, {
-    headers: { Authorization: `Bearer ${token}` },
-  });
-  if (!response.ok) {
-    const detail = await response.json().catch(() => ({}));
-    throw new Error(detail.detail ?? "Failed to load film");
-  }
-  return response.json();
+export function fetchGameFilm(token: string, teamId: number): Promise<GameUploadRecord[]> {
+  return fetchAllPages<GameUploadRecord>(`/api/v1/teams/${teamId}/film`, token, "Failed to load film");
 }
 
 export async function fetchGameUpload(token: string, teamId: number, uploadId: number): Promise<GameUploadRecord> {
@@ -241,19 +244,16 @@ export type FilmSegment = {
   created_at: string;
 };
 
-export async function fetchFilmSegments(
+export function fetchFilmSegments(
   token: string,
   teamId: number,
   uploadId: number
 ): Promise<FilmSegment[]> {
-  const response = await fetch(`${baseUrl}/api/v1/teams/${teamId}/film/${uploadId}/segments`, {
-    headers: { Authorization: `Bearer ${token}` },
-  });
-  if (!response.ok) {
-    const detail = await response.json().catch(() => ({}));
-    throw new Error(detail.detail ?? "Failed to load segments");
-  }
-  return response.json();
+  return fetchAllPages<FilmSegment>(
+    `/api/v1/teams/${teamId}/film/${uploadId}/segments`,
+    token,
+    "Failed to load segments"
+  );
 }
 
 export async function createFilmSegment(
@@ -0,0 +1,29 @@
+"""index possession video ranges per game
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_possession_game_video_range",
+        "possession",
+        ["game_id", "video_start_second", "video_end_second"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_possession_game_video_range", table_name="possession")
@@ -0,0 +1,37 @@
+"""materialized per-game stats snapshots
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0011"
+down_revision: Union[str, None] = "0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "game_stats_snapshot",
+        sa.Column("game_id", sa.Integer(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("refreshed_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["game_id"], ["game.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("game_id"),
+    )
+    op.create_index("ix_game_scheduled_at", "game", ["scheduled_at"])
+    op.create_index("ix_game_matchup_scheduled_at", "game", ["matchup", "scheduled_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_game_matchup_scheduled_at", table_name="game")
+    op.drop_index("ix_game_scheduled_at", table_name="game")
+    op.drop_table("game_stats_snapshot")
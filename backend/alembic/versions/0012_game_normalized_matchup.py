@@ -0,0 +1,33 @@
+"""store normalized game matchups
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0012"
+down_revision: Union[str, None] = "0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("game", sa.Column("normalized_matchup", sa.String(), nullable=True))
+    # Mirrors app.core.text.normalize_text.
+    op.execute(
+        "UPDATE game SET normalized_matchup = "
+        "btrim(regexp_replace(lower(matchup), '[^a-z0-9]+', ' ', 'g'))"
+    )
+    op.create_index("ix_game_normalized_matchup", "game", ["normalized_matchup"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_game_normalized_matchup", table_name="game")
+    op.drop_column("game", "normalized_matchup")
@@ -0,0 +1,41 @@
+"""store normalized upload text for matchup linking
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0013"
+down_revision: Union[str, None] = "0012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column("game_upload", sa.Column("normalized_text", sa.Text(), nullable=True))
+    # Mirrors app.core.text.normalize_text over "title notes".
+    op.execute(
+        "UPDATE game_upload SET normalized_text = "
+        "btrim(regexp_replace(lower(title || ' ' || coalesce(notes, '')), '[^a-z0-9]+', ' ', 'g'))"
+    )
+    op.create_index(
+        "ix_game_upload_unlinked_text_trgm",
+        "game_upload",
+        ["normalized_text"],
+        postgresql_using="gin",
+        postgresql_ops={"normalized_text": "gin_trgm_ops"},
+        postgresql_where=sa.text("game_id IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_game_upload_unlinked_text_trgm", table_name="game_upload")
+    op.drop_column("game_upload", "normalized_text")
@@ -0,0 +1,45 @@
+"""content-addressed media blobs
+
+Revision ID: 0016
+Revises: 0015
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0016"
+down_revision: Union[str, None] = "0015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "media_blob",
+        sa.Column("digest", sa.String(length=64), nullable=False),
+        sa.Column("storage_url", sa.String(), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("digest"),
+    )
+    # Existing rows keep a NULL digest and their original per-upload file.
+    for table in ("game_upload", "clip"):
+        op.add_column(table, sa.Column("content_digest", sa.String(length=64), nullable=True))
+        op.create_index(f"ix_{table}_content_digest", table, ["content_digest"])
+        op.create_foreign_key(
+            f"{table}_content_digest_fkey", table, "media_blob", ["content_digest"], ["digest"]
+        )
+
+
+def downgrade() -> None:
+    for table in ("clip", "game_upload"):
+        op.drop_constraint(f"{table}_content_digest_fkey", table, type_="foreignkey")
+        op.drop_index(f"ix_{table}_content_digest", table_name=table)
+        op.drop_column(table, "content_digest")
+    op.drop_table("media_blob")
@@ -0,0 +1,28 @@
+"""thumbnail sprite sheets for game uploads
+
+Revision ID: 0017
+Revises: 0016
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0017"
+down_revision: Union[str, None] = "0016"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("game_upload", sa.Column("thumbnail_prefix", sa.String(), nullable=True))
+    op.add_column("game_upload", sa.Column("thumbnail_sheets", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("game_upload", "thumbnail_sheets")
+    op.drop_column("game_upload", "thumbnail_prefix")
@@ -0,0 +1,29 @@
+"""hls packaging token on game uploads
+
+Revision ID: 0018
+Revises: 0017
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0018"
+down_revision: Union[str, None] = "0017"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("game_upload", sa.Column("hls_token", sa.String(), nullable=True))
+    # Not unique: uploads of identical content share one packaging.
+    op.create_index("ix_game_upload_hls_token", "game_upload", ["hls_token"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_game_upload_hls_token", table_name="game_upload")
+    op.drop_column("game_upload", "hls_token")
@@ -0,0 +1,31 @@
+"""keyset pagination indexes for list endpoints
+
+Revision ID: 0021
+Revises: 0020
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0021"
+down_revision: Union[str, None] = "0020"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_clip_team_uploaded_at_id", "clip", ["team_id", "uploaded_at", "id"])
+    op.create_index("ix_game_upload_team_uploaded_at_id", "game_upload", ["team_id", "uploaded_at", "id"])
+    op.create_index("ix_film_segment_upload_start_id", "film_segment", ["upload_id", "start_second", "id"])
+    op.create_index("ix_team_membership_user_joined_at_id", "team_membership", ["user_id", "joined_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_team_membership_user_joined_at_id", table_name="team_membership")
+    op.drop_index("ix_film_segment_upload_start_id", table_name="film_segment")
+    op.drop_index("ix_game_upload_team_uploaded_at_id", table_name="game_upload")
+    op.drop_index("ix_clip_team_uploaded_at_id", table_name="clip")
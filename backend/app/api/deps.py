@@ -5,9 +5,9 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 
+from app.core.auth_cache import AuthMembership, AuthUser, get_auth_cache
 from app.core.config import get_settings
 from app.db.session import get_db
-from app.models.user import User
 from app.schemas.token import TokenPayload
 
 settings = get_settings()
@@ -20,7 +20,7 @@ def get_db_session() -> Generator[Session, None, None]:
 
 def get_current_user(
     db: Session = Depends(get_db_session), token: str = Depends(oauth2_scheme)
-) -> User:
+) -> AuthUser:
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.jwt_algorithm])
         token_data = TokenPayload(**payload)
@@ -28,7 +28,22 @@ def get_current_user(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Could not validate credentials") from exc
     if token_data.sub is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
-    user = db.query(User).filter(User.id == int(token_data.sub)).first()
+    auth_cache = get_auth_cache()
+    user = auth_cache.get_user(db, int(token_data.sub))
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    if token_data.teams is not None:
+        auth_cache.use_token_claims(db, user.id, token_data.teams)
     return user
+
+
+def require_team_member(db: Session, team_id: int, user_id: int) -> AuthMembership:
+    membership = get_auth_cache().get_membership(db, team_id, user_id)
+    if not membership:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this team")
+    return membership
+
+
+def require_superuser(user: AuthUser) -> None:
+    if not user.is_superuser:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Superuser access required")
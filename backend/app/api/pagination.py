@@ -0,0 +1,93 @@
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, Query, Response, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query as OrmQuery
+
+from app.core.config import get_settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+settings = get_settings()
+
+
+class PageParams:
+    """``limit``/``cursor`` query parameters shared by list endpoints."""
+
+    def __init__(
+        self,
+        limit: int = Query(settings.page_default_limit, ge=1, le=settings.page_max_limit),
+        cursor: str | None = Query(None, description=f"Value of the previous page's {NEXT_CURSOR_HEADER} header"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps([value.isoformat() if isinstance(value, datetime) else value for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: list) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError(cursor)
+        return [
+            datetime.fromisoformat(value) if column.type.python_type is datetime else column.type.python_type(value)
+            for column, value in zip(columns, values)
+        ]
+    except (ValueError, TypeError, NotImplementedError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+
+def keyset_page(query: OrmQuery, order: list[tuple], page: PageParams, response: Response) -> list:
+    """One page of ``query`` ordered by ``order`` (``[(column, descending), ...]``, unique as a whole).
+
+    Pages continue strictly after the cursor row (``WHERE (a, b) < (:a, :b)``
+    spelled out per column), so each page is an index range scan no matter
+    how deep the caller has paged. Sets ``X-Next-Cursor`` when more rows exist.
+    """
+    columns = [column for column, _ in order]
+    if page.cursor:
+        values = decode_cursor(page.cursor, columns)
+        clauses = []
+        for index, (column, descending) in enumerate(order):
+            beyond = column < values[index] if descending else column > values[index]
+            clauses.append(and_(*(columns[i] == values[i] for i in range(index)), beyond))
+        query = query.filter(or_(*clauses))
+    query = query.order_by(*(column.desc() if descending else column.asc() for column, descending in order))
+    rows = query.limit(page.limit + 1).all()
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([getattr(last, column.key) for column in columns])
+    return rows
+
+
+def parse_fields(fields: str | None, schema: type[BaseModel]) -> set[str] | None:
+    """``fields=id,title`` -> ``{"id", "title"}``; None means every field."""
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(schema.model_fields)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+        )
+    return requested
+
+
+def project(items: list, schema: type[BaseModel], fields: set[str] | None, response: Response):
+    """Return ``items`` as-is, or only the requested fields of each when projecting."""
+    if fields is None:
+        return items
+    content = [schema.model_validate(item).model_dump(mode="json", include=fields) for item in items]
+    # A returned Response bypasses FastAPI's merge of the injected one, so carry the cursor over.
+    headers = {key: response.headers[key] for key in (NEXT_CURSOR_HEADER,) if key in response.headers}
+    return JSONResponse(content=content, headers=headers)
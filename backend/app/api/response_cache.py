@@ -0,0 +1,66 @@
+import hashlib
+from functools import lru_cache
+from typing import Any, Callable
+
+from fastapi import Request, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.api.streaming import _etag_matches
+from app.core.config import get_settings
+from app.core.ttl_cache import TTLCache
+from app.db.cache_versions import get_versions
+
+CACHED_HEADERS = (NEXT_CURSOR_HEADER,)
+
+
+@lru_cache
+def get_body_cache() -> TTLCache | None:
+    settings = get_settings()
+    if settings.response_cache_max_entries <= 0:
+        return None
+    return TTLCache(settings.response_cache_max_entries, settings.response_cache_ttl_seconds)
+
+
+def _etag(request: Request, versions: dict[str, int]) -> str:
+    # Same URL + same data versions = same body, so the tag can be computed before any work is done.
+    query = "&".join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items()))
+    stamp = ",".join(f"{scope}={version}" for scope, version in sorted(versions.items()))
+    return f'W/"{hashlib.sha1(f"{request.url.path}?{query}|{stamp}".encode()).hexdigest()[:24]}"'
+
+
+def cached_json_response(
+    request: Request,
+    response: Response,
+    db: Session,
+    scopes: list[str],
+    adapter: TypeAdapter,
+    build: Callable[[], Any],
+) -> Response:
+    """Serve a JSON read endpoint with a weak ETag derived from ``cache_version`` counters.
+
+    A matching ``If-None-Match`` gets ``304`` after a single version lookup.
+    Otherwise the serialized body comes from the in-memory cache, or ``build()``
+    runs and its result is serialized with ``adapter`` and cached. ``build``
+    may also return a ready ``Response`` (e.g. a field projection).
+    """
+    etag = _etag(request, get_versions(db, scopes))
+    headers = {"etag": etag, "cache-control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    body_cache = get_body_cache()
+    cached = body_cache.get(etag) if body_cache is not None else None
+    if cached is None:
+        result = build()
+        if isinstance(result, Response):
+            body, source = result.body, result.headers
+        else:
+            body, source = adapter.dump_json(adapter.validate_python(result, from_attributes=True)), response.headers
+        cached = body, {key: source[key] for key in CACHED_HEADERS if key in source}
+        if body_cache is not None:
+            body_cache.set(etag, cached)
+    body, extra = cached
+    return Response(content=body, media_type="application/json", headers={**extra, **headers})
@@ -0,0 +1,246 @@
+import os
+import stat
+from abc import ABC, abstractmethod
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Callable
+from urllib.parse import quote
+
+import anyio
+import anyio.to_thread
+from fastapi import HTTPException, Request, status
+from starlette.responses import RedirectResponse, Response
+from starlette.types import Receive, Scope, Send
+
+from app.core.config import get_settings
+from app.services.storage import StorageBackend, resolve_storage_url
+
+CHUNK_SIZE = 256 * 1024
+
+
+class _RangeResponse(Response, ABC):
+    def __init__(self, start: int, length: int, status_code: int, headers: dict[str, str]):
+        super().__init__(status_code=status_code, headers=headers)
+        self.start = start
+        self.length = length
+
+    def init_headers(self, headers=None) -> None:
+        # Response.init_headers would add content-length: 0 for an empty body.
+        self.raw_headers = [(key.lower().encode("latin-1"), value.encode("latin-1")) for key, value in (headers or {}).items()]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"].upper() == "HEAD" or self.length == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        await self.send_body(scope, send)
+
+    @abstractmethod
+    async def send_body(self, scope: Scope, send: Send) -> None:
+        """Send ``length`` bytes from ``start`` as ``http.response.body`` messages."""
+
+
+class FileRangeResponse(_RangeResponse):
+    """Streams ``[start, start + length)`` of a file.
+
+    Uses the ASGI ``http.response.zerocopy`` extension (sendfile) when the
+    server offers it and falls back to chunked reads in a worker thread.
+    """
+
+    def __init__(self, path: Path, start: int, length: int, status_code: int, headers: dict[str, str]):
+        super().__init__(start, length, status_code, headers)
+        self.path = path
+
+    async def send_body(self, scope: Scope, send: Send) -> None:
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            if "http.response.zerocopy" in scope.get("extensions", {}):
+                await send(
+                    {
+                        "type": "http.response.zerocopy",
+                        "file": file.wrapped,
+                        "offset": self.start,
+                        "count": self.length,
+                        "more_body": False,
+                    }
+                )
+                return
+            await file.seek(self.start)
+            remaining = self.length
+            while remaining > 0:
+                chunk = await file.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+class ObjectRangeResponse(_RangeResponse):
+    """Streams ``[start, start + length)`` of an object from a remote storage backend."""
+
+    def __init__(self, backend: StorageBackend, key: str, start: int, length: int, status_code: int, headers: dict[str, str]):
+        super().__init__(start, length, status_code, headers)
+        self.backend = backend
+        self.key = key
+
+    async def send_body(self, scope: Scope, send: Send) -> None:
+        body = await anyio.to_thread.run_sync(self.backend.open_range, self.key, self.start, self.length)
+        try:
+            remaining = self.length
+            while remaining > 0:
+                chunk = await anyio.to_thread.run_sync(body.read, min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            await anyio.to_thread.run_sync(body.close)
+
+
+def _parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """Return an inclusive (start, end) for a single ``bytes=`` range, or None if malformed."""
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes":
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if first == "":
+            suffix = int(last)
+            if suffix <= 0:
+                return None
+            return max(size - suffix, 0), size - 1
+        start = int(first)
+        end = int(last) if last else None
+    except ValueError:
+        return None
+    if start < 0 or (end is not None and end < start):
+        return None
+    return start, size - 1 if end is None else min(end, size - 1)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    candidates = [value.strip() for value in header.split(",")]
+    weak_etag = etag.removeprefix("W/")
+    return "*" in candidates or any(value.removeprefix("W/") == weak_etag for value in candidates)
+
+
+def _not_modified_since(header: str | None, mtime: float) -> bool:
+    if not header:
+        return False
+    try:
+        return int(mtime) <= parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+
+def media_file_response(request: Request, path: Path, media_type: str, filename: str | None = None) -> Response:
+    """Serve a media file honouring Range, If-Range, If-None-Match and If-Modified-Since."""
+    try:
+        stat_result = os.stat(path)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Media file not found") from exc
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Media file not found")
+
+    size = stat_result.st_size
+    etag = f'"{stat_result.st_mtime_ns:x}-{size:x}"'
+    return _ranged_response(
+        request,
+        size,
+        stat_result.st_mtime,
+        etag,
+        media_type,
+        filename,
+        lambda start, length, code, headers: FileRangeResponse(path, start, length, code, headers),
+    )
+
+
+def stored_media_response(
+    request: Request, storage_url: str, media_type: str, filename: str | None = None
+) -> Response:
+    """Like ``media_file_response`` for any ``storage_url``, local or remote.
+
+    Local objects keep the sendfile path. Remote objects are proxied with
+    ranged reads, or redirected to a presigned URL when
+    ``Settings.storage_redirect_streams`` is on.
+    """
+    backend, key = resolve_storage_url(storage_url)
+    path = backend.local_path(key)
+    if path is not None:
+        return media_file_response(request, path, media_type, filename)
+    info = backend.stat(key)
+    if info is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Media file not found")
+    if get_settings().storage_redirect_streams:
+        presigned = backend.presigned_url(key)
+        if presigned:
+            return RedirectResponse(presigned, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+    return _ranged_response(
+        request,
+        info.size,
+        info.modified,
+        info.etag,
+        media_type,
+        filename,
+        lambda start, length, code, headers: ObjectRangeResponse(backend, key, start, length, code, headers),
+    )
+
+
+def _ranged_response(
+    request: Request,
+    size: int,
+    mtime: float,
+    etag: str,
+    media_type: str,
+    filename: str | None,
+    make_response: Callable[[int, int, int, dict[str, str]], Response],
+) -> Response:
+    last_modified = formatdate(mtime, usegmt=True)
+    headers = {"accept-ranges": "bytes", "etag": etag, "last-modified": last_modified}
+
+    if_none_match = request.headers.get("if-none-match")
+    if (if_none_match and _etag_matches(if_none_match, etag)) or (
+        not if_none_match and _not_modified_since(request.headers.get("if-modified-since"), mtime)
+    ):
+        return make_response(0, 0, status.HTTP_304_NOT_MODIFIED, headers)
+
+    headers["content-type"] = media_type
+    if filename:
+        quoted = quote(filename)
+        if quoted != filename:
+            headers["content-disposition"] = f"attachment; filename*=utf-8''{quoted}"
+        else:
+            headers["content-disposition"] = f'attachment; filename="{filename}"'
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and if_range and if_range.strip() not in (etag, last_modified):
+        range_header = None  # Representation changed: send the whole file.
+
+    if range_header:
+        if "," in range_header:
+            raise HTTPException(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                detail="Multiple ranges are not supported",
+                headers={"content-range": f"bytes */{size}"},
+            )
+        byte_range = _parse_range(range_header, size)
+        if byte_range is not None:
+            start, end = byte_range
+            if start >= size:
+                raise HTTPException(
+                    status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                    detail="Requested range not satisfiable",
+                    headers={"content-range": f"bytes */{size}"},
+                )
+            headers["content-range"] = f"bytes {start}-{end}/{size}"
+            headers["content-length"] = str(end - start + 1)
+            return make_response(start, end - start + 1, status.HTTP_206_PARTIAL_CONTENT, headers)
+
+    headers["content-length"] = str(size)
+    return make_response(0, size, status.HTTP_200_OK, headers)
@@ -1 +1 @@
-from . import auth, stats, ingestion, teams, clips, film  # noqa: F401
+from . import auth, stats, ingestion, teams, clips, film, film_sessions, hls  # noqa: F401
@@ -1,56 +1,112 @@
 from datetime import datetime, timedelta
+import asyncio
 import secrets
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from app.api import deps
+from app.core.auth_cache import get_auth_cache
 from app.core.config import get_settings
-from app.core.security import create_access_token, get_password_hash, verify_password
+from app.core.security import (
+    PasswordHasherBusy,
+    create_access_token,
+    get_password_hash,
+    get_password_hash_pool,
+    verify_and_update_password,
+)
+from app.models.team_membership import TeamMembership
 from app.models.user import User
 from app.schemas.token import Token
 from app.schemas.user import UserCreate, UserRead
-from app.services.email import EmailService
+from app.services.email import verification_email
+from app.services.email_outbox import EmailOutboxQueue
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 settings = get_settings()
-email_service = EmailService()
 
 
 class VerifyRequest(BaseModel):
     token: str
 
 
-@router.post("/register", response_model=UserRead)
-def register(user_in: UserCreate, db: Session = Depends(deps.get_db_session)):
-    user = db.query(User).filter(User.email == user_in.email).first()
-    if user:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
+async def _hash_pool_call(fn, *args):
+    """Run argon2 work on the dedicated pool; 503 with Retry-After when it is saturated."""
+    try:
+        future = get_password_hash_pool().submit(fn, *args)
+    except PasswordHasherBusy as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in attempts right now, please retry",
+            headers={"Retry-After": str(settings.password_hash_retry_after_seconds)},
+        ) from exc
+    return await asyncio.wrap_future(future)
+
+
+def _password_record(db: Session, email: str):
+    record = db.query(User.id, User.hashed_password).filter(User.email == email).first()
+    # End the read transaction so no pooled connection is held while argon2 runs.
+    db.rollback()
+    return record
+
+
+def _create_user(db: Session, user_in: UserCreate, hashed_password: str) -> User:
     verification_token = secrets.token_urlsafe(32)
     db_user = User(
         email=user_in.email,
         full_name=user_in.full_name,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=hashed_password,
         verification_token=verification_token,
         verification_sent_at=datetime.utcnow(),
         is_verified=False,
     )
     db.add(db_user)
+    # Same transaction as the user: the email is queued if and only if the account exists.
+    EmailOutboxQueue(db).enqueue(db_user.email, *verification_email(verification_token))
     db.commit()
     db.refresh(db_user)
-    email_service.send_verification_email(db_user.email, verification_token)
     return db_user
 
 
+def _issue_token(db: Session, user_id: int, new_hash: str | None) -> Token:
+    if new_hash:
+        # The argon2 settings changed since this password was stored; upgrade it transparently.
+        db.query(User).filter(User.id == user_id).update({User.hashed_password: new_hash})
+        db.commit()
+    claims = None
+    if settings.access_token_team_claims:
+        # Signed team roles let membership checks skip the database until the token expires.
+        memberships = db.query(TeamMembership.team_id, TeamMembership.role).filter(TeamMembership.user_id == user_id)
+        claims = {"teams": {str(team_id): role for team_id, role in memberships}}
+    access_token = create_access_token(
+        subject=str(user_id),
+        expires_delta=timedelta(minutes=settings.access_token_expire_minutes),
+        claims=claims,
+    )
+    return Token(access_token=access_token)
+
+
+@router.post("/register", response_model=UserRead)
+async def register(user_in: UserCreate, db: Session = Depends(deps.get_db_session)):
+    if await run_in_threadpool(_password_record, db, user_in.email):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
+    hashed_password = await _hash_pool_call(get_password_hash, user_in.password)
+    return await run_in_threadpool(_create_user, db, user_in, hashed_password)
+
+
 @router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(deps.get_db_session)):
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(deps.get_db_session)):
+    record = await run_in_threadpool(_password_record, db, form_data.username)
+    if not record:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Incorrect email or password")
-    access_token = create_access_token(subject=str(user.id), expires_delta=timedelta(minutes=settings.access_token_expire_minutes))
-    return Token(access_token=access_token)
+    user_id, hashed_password = record
+    valid, new_hash = await _hash_pool_call(verify_and_update_password, form_data.password, hashed_password)
+    if not valid:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Incorrect email or password")
+    return await run_in_threadpool(_issue_token, db, user_id, new_hash)
 
 
 @router.post("/verify")
@@ -62,4 +118,5 @@ def verify_account(payload: VerifyRequest, db: Session = Depends(deps.get_db_ses
     user.verification_token = None
     user.verification_sent_at = None
     db.commit()
+    get_auth_cache().invalidate_user(user.id)
     return {"detail": "Account verified"}
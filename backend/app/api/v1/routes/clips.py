@@ -1,35 +1,29 @@
+from datetime import datetime
 from pathlib import Path
-from uuid import uuid4
 import mimetypes
-import os
-import shutil
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, Response, UploadFile, status
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session, selectinload
 
 from app.api import deps
+from app.api.pagination import PageParams, keyset_page, parse_fields, project
+from app.api.response_cache import cached_json_response
+from app.api.streaming import media_file_response, stored_media_response
 from app.core.config import get_settings
+from app.db.after_commit import after_commit
+from app.db.cache_versions import STATS_SCOPE, team_scope
 from app.models.clip import Clip
-from app.models.team_membership import TeamMembership
 from app.schemas.clip import ClipRead
-from app.services.clip_stats import hydrate_clip_stats
+from app.services.clip_rendering import ClipRenderingService
+from app.services.clip_stats import hydrate_clip_stats, hydrate_clips_stats
+from app.services.media_store import MediaStore
+from app.services.storage import resolve_storage_url
 
 router = APIRouter(prefix="/teams/{team_id}/clips", tags=["clips"])
 settings = get_settings()
-media_root = Path(settings.media_root)
-media_root.mkdir(parents=True, exist_ok=True)
-
-
-def _require_membership(db: Session, team_id: int, user_id: int) -> TeamMembership:
-    membership = (
-        db.query(TeamMembership)
-        .filter(TeamMembership.team_id == team_id, TeamMembership.user_id == user_id)
-        .first()
-    )
-    if not membership:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this team")
-    return membership
+clip_renderer = ClipRenderingService()
+CLIP_LIST = TypeAdapter(list[ClipRead])
 
 
 def _get_clip(db: Session, team_id: int, clip_id: int) -> Clip:
@@ -43,30 +37,46 @@ def _get_clip(db: Session, team_id: int, clip_id: int) -> Clip:
     return clip
 
 
-def _store_upload(file: UploadFile) -> str:
-    suffix = Path(file.filename).suffix
-    destination = media_root / f"{uuid4().hex}{suffix}"
-    with destination.open("wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    return str(destination)
-
-
 @router.get("", response_model=list[ClipRead])
 def list_team_clips(
     team_id: int,
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    game_id: int | None = None,
+    source_upload_id: int | None = None,
+    clip_status: str | None = Query(None, alias="status"),
+    uploaded_after: datetime | None = None,
+    uploaded_before: datetime | None = None,
+    fields: str | None = Query(None, description="Comma-separated ClipRead fields to return"),
     db: Session = Depends(deps.get_db_session),
     current_user=Depends(deps.get_current_user),
 ):
-    _require_membership(db, team_id, current_user.id)
-    clips = (
-        db.query(Clip)
-        .filter(Clip.team_id == team_id)
-        .order_by(Clip.uploaded_at.desc())
-        .all()
-    )
-    for clip in clips:
-        hydrate_clip_stats(db, clip)
-    return clips
+    deps.require_team_member(db, team_id, current_user.id)
+    selected = parse_fields(fields, ClipRead)
+
+    def build():
+        query = db.query(Clip).filter(Clip.team_id == team_id)
+        if game_id is not None:
+            query = query.filter(Clip.game_id == game_id)
+        if source_upload_id is not None:
+            query = query.filter(Clip.source_upload_id == source_upload_id)
+        if clip_status is not None:
+            query = query.filter(Clip.status == clip_status)
+        if uploaded_after is not None:
+            query = query.filter(Clip.uploaded_at >= uploaded_after)
+        if uploaded_before is not None:
+            query = query.filter(Clip.uploaded_at < uploaded_before)
+        if selected is None or selected & {"game_matchup", "game_scheduled_at"}:
+            query = query.options(selectinload(Clip.game))
+        clips = keyset_page(query, [(Clip.uploaded_at, True), (Clip.id, True)], page, response)
+        # Possession context is the expensive part of a clip; only hydrate it when asked for.
+        if selected is None or selected & {"stats_summary", "possession_context"}:
+            hydrate_clips_stats(db, clips)
+        return project(clips, ClipRead, selected, response)
+
+    scopes = [team_scope(team_id), STATS_SCOPE]
+    return cached_json_response(request, response, db, scopes, CLIP_LIST, build)
 
 
 @router.get("/{clip_id}", response_model=ClipRead)
@@ -76,14 +86,14 @@ def get_clip(
     db: Session = Depends(deps.get_db_session),
     current_user=Depends(deps.get_current_user),
 ):
-    _require_membership(db, team_id, current_user.id)
+    deps.require_team_member(db, team_id, current_user.id)
     clip = _get_clip(db, team_id, clip_id)
     hydrate_clip_stats(db, clip)
     return clip
 
 
 @router.post("", response_model=ClipRead, status_code=status.HTTP_201_CREATED)
-async def upload_team_clip(
+def upload_team_clip(
     team_id: int,
     file: UploadFile = File(...),
     title: str = Form(...),
@@ -92,15 +102,16 @@ async def upload_team_clip(
     db: Session = Depends(deps.get_db_session),
     current_user=Depends(deps.get_current_user),
 ):
-    _require_membership(db, team_id, current_user.id)
-    storage_path = _store_upload(file)
+    deps.require_team_member(db, team_id, current_user.id)
+    blob = MediaStore(db).store_stream(file.file, Path(file.filename).suffix)
     clip = Clip(
         title=title,
         notes=notes,
         game_id=game_id,
         team_id=team_id,
         uploaded_by_id=current_user.id,
-        storage_url=storage_path,
+        storage_url=blob.storage_url,
+        content_digest=blob.digest,
         status="uploaded",
     )
     db.add(clip)
@@ -117,39 +128,40 @@ def delete_team_clip(
     db: Session = Depends(deps.get_db_session),
     current_user=Depends(deps.get_current_user),
 ):
-    _require_membership(db, team_id, current_user.id)
+    deps.require_team_member(db, team_id, current_user.id)
     clip = _get_clip(db, team_id, clip_id)
     if clip.uploaded_by_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Can only delete your own clips")
     # Clips that originate from a game upload share the same file as the raw film.
     # In that case we only remove the database record so the base film continues
     # to exist for other clips.
-    should_remove_file = clip.source_upload_id is None
-    try:
-        if should_remove_file and clip.storage_url and os.path.exists(clip.storage_url):
-            os.remove(clip.storage_url)
-    except OSError:
-        pass
     db.delete(clip)
+    if clip.content_digest:
+        db.flush()
+        MediaStore(db).release(clip.content_digest)
+    elif clip.source_upload_id is None and clip.storage_url:
+        backend, key = resolve_storage_url(clip.storage_url)
+        after_commit(db, lambda: backend.delete(key))
     db.commit()
     return None
 
 
 @router.get("/{clip_id}/stream")
 def stream_clip(
+    request: Request,
     team_id: int,
     clip_id: int,
     db: Session = Depends(deps.get_db_session),
     current_user=Depends(deps.get_current_user),
 ):
-    _require_membership(db, team_id, current_user.id)
+    deps.require_team_member(db, team_id, current_user.id)
     clip = _get_clip(db, team_id, clip_id)
-    file_path = Path(clip.storage_url)
-    if not file_path.exists():
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Clip file not found")
-    content_type, _ = mimetypes.guess_type(str(file_path))
-    return FileResponse(
-        str(file_path),
-        media_type=content_type or "video/mp4",
-        filename=file_path.name,
-    )
+    # Clips published from game film are served as their own time slice so
+    # playback cost scales with the clip, not the whole game.
+    rendered = clip_renderer.ensure_clip_file(clip)
+    if rendered is not None:
+        content_type, _ = mimetypes.guess_type(rendered.name)
+        return media_file_response(request, rendered, content_type or "video/mp4", rendered.name)
+    filename = Path(clip.storage_url).name
+    content_type, _ = mimetypes.guess_type(filename)
+    return stored_media_response(request, clip.storage_url, content_type or "video/mp4", filename)
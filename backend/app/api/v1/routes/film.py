@@ -1,43 +1,35 @@
+from datetime import datetime
 from pathlib import Path
-from uuid import uuid4
 import mimetypes
-import os
-import shutil
 
-from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, HTTPException, UploadFile, status
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, Response, UploadFile, status
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session, selectinload
 
 from app.api import deps
+from app.api.pagination import PageParams, keyset_page, parse_fields, project
+from app.api.response_cache import cached_json_response
+from app.api.streaming import stored_media_response
 from app.core.config import get_settings
-from app.db.session import SessionLocal
+from app.db.after_commit import after_commit
+from app.db.cache_versions import STATS_SCOPE, team_scope
 from app.models.game_upload import GameUpload
-from app.models.game import Game
-from app.models.team_membership import TeamMembership
 from app.models.film_segment import FilmSegment
 from app.models.clip import Clip
 from app.schemas.game_upload import GameUploadRead
 from app.schemas.film_segment import FilmSegmentRead, FilmSegmentCreate
 from app.schemas.clip import ClipRead
-from app.services.film_processing import FilmProcessingService
+from app.services.clip_rendering import ClipRenderingService
 from app.services.clip_stats import link_clip_to_possessions, hydrate_clip_stats
-from app.services.game_matching import find_game_for_upload
+from app.services.film_uploads import create_game_upload, resolve_upload_game
+from app.services.hls_packaging import HlsPackagingService
+from app.services.media_store import MediaStore
+from app.services.storage import get_storage, resolve_storage_url
+from app.services.thumbnails import ThumbnailService
 
 settings = get_settings()
 router = APIRouter(prefix="/teams/{team_id}/film", tags=["film"])
-raw_root = Path(settings.media_root) / "raw"
-raw_root.mkdir(parents=True, exist_ok=True)
-
-
-def _require_member(db: Session, team_id: int, user_id: int) -> TeamMembership:
-    membership = (
-        db.query(TeamMembership)
-        .filter(TeamMembership.team_id == team_id, TeamMembership.user_id == user_id)
-        .first()
-    )
-    if not membership:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this team")
-    return membership
+UPLOAD_LIST = TypeAdapter(list[GameUploadRead])
 
 
 def _get_upload(db: Session, team_id: int, upload_id: int) -> GameUpload:
@@ -51,42 +43,40 @@ def _get_upload(db: Session, team_id: int, upload_id: int) -> GameUpload:
     return upload
 
 
-def _get_game(db: Session, game_id: int) -> Game:
-    game = db.query(Game).filter(Game.id == game_id).first()
-    if not game:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Game not found")
-    return game
-
-
-def _save_raw_file(upload: UploadFile) -> str:
-    dest = raw_root / f"{uuid4().hex}{Path(upload.filename).suffix}"
-    with dest.open("wb") as buffer:
-        shutil.copyfileobj(upload.file, buffer)
-    return str(dest)
-
-
-def _process_upload_async(upload_id: int) -> None:
-    db = SessionLocal()
-    try:
-        FilmProcessingService(db).process_upload(upload_id)
-    finally:
-        db.close()
-
-
 @router.get("", response_model=list[GameUploadRead])
 def list_game_uploads(
     team_id: int,
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    game_id: int | None = None,
+    upload_status: str | None = Query(None, alias="status"),
+    uploaded_after: datetime | None = None,
+    uploaded_before: datetime | None = None,
+    fields: str | None = Query(None, description="Comma-separated GameUploadRead fields to return"),
     db: Session = Depends(deps.get_db_session),
     current_user=Depends(deps.get_current_user),
 ):
-    _require_member(db, team_id, current_user.id)
-    uploads = (
-        db.query(GameUpload)
-        .filter(GameUpload.team_id == team_id)
-        .order_by(GameUpload.uploaded_at.desc())
-        .all()
-    )
-    return uploads
+    deps.require_team_member(db, team_id, current_user.id)
+    selected = parse_fields(fields, GameUploadRead)
+
+    def build():
+        query = db.query(GameUpload).filter(GameUpload.team_id == team_id)
+        if game_id is not None:
+            query = query.filter(GameUpload.game_id == game_id)
+        if upload_status is not None:
+            query = query.filter(GameUpload.status == upload_status)
+        if uploaded_after is not None:
+            query = query.filter(GameUpload.uploaded_at >= uploaded_after)
+        if uploaded_before is not None:
+            query = query.filter(GameUpload.uploaded_at < uploaded_before)
+        if selected is None or selected & {"game_matchup", "game_scheduled_at"}:
+            query = query.options(selectinload(GameUpload.game))
+        uploads = keyset_page(query, [(GameUpload.uploaded_at, True), (GameUpload.id, True)], page, response)
+        return project(uploads, GameUploadRead, selected, response)
+
+    scopes = [team_scope(team_id), STATS_SCOPE]
+    return cached_json_response(request, response, db, scopes, UPLOAD_LIST, build)
 
 
 @router.get("/{upload_id}", response_model=GameUploadRead)
@@ -96,15 +86,14 @@ def get_game_upload(
     db: Session = Depends(deps.get_db_session),
     current_user=Depends(deps.get_current_user),
 ):
-    _require_member(db, team_id, current_user.id)
+    deps.require_team_member(db, team_id, current_user.id)
     upload = _get_upload(db, team_id, upload_id)
     return upload
 
 
 @router.post("", response_model=GameUploadRead, status_code=status.HTTP_201_CREATED)
-async def upload_game_film(
+def upload_game_film(
     team_id: int,
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     title: str = Form(...),
     notes: str | None = Form(None),
@@ -112,28 +101,19 @@ async def upload_game_film(
     db: Session = Depends(deps.get_db_session),
     current_user=Depends(deps.get_current_user),
 ):
-    _require_member(db, team_id, current_user.id)
-    game = None
-    if game_id is not None:
-        game = _get_game(db, game_id)
-    else:
-        game = find_game_for_upload(db, title, notes)
-    storage_url = _save_raw_file(file)
-    upload = GameUpload(
+    deps.require_team_member(db, team_id, current_user.id)
+    game = resolve_upload_game(db, game_id, title, notes)
+    blob = MediaStore(db).store_stream(file.file, Path(file.filename).suffix)
+    return create_game_upload(
+        db,
         team_id=team_id,
         uploaded_by_id=current_user.id,
         title=title,
         notes=notes,
-        storage_url=storage_url,
-        status="processing",
-        game_id=game.id if game else None,
+        game=game,
+        storage_url=blob.storage_url,
+        content_digest=blob.digest,
     )
-    db.add(upload)
-    db.commit()
-    db.refresh(upload)
-    if background_tasks is not None:
-        background_tasks.add_task(_process_upload_async, upload.id)
-    return upload
 
 
 @router.delete("/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -143,7 +123,7 @@ def delete_game_film(
     db: Session = Depends(deps.get_db_session),
     current_user=Depends(deps.get_current_user),
 ):
-    _require_member(db, team_id, current_user.id)
+    deps.require_team_member(db, team_id, current_user.id)
     upload = _get_upload(db, team_id, upload_id)
     # Remove any clips that were published from this upload so nothing points
     # at a file that is about to be deleted.
@@ -154,52 +134,99 @@ def delete_game_film(
     )
     for clip in linked_clips:
         db.delete(clip)
-    try:
-        if upload.storage_url and os.path.exists(upload.storage_url):
-            os.remove(upload.storage_url)
-    except OSError:
-        pass
+    # Files are deleted only after the commit, so a failed commit leaves the rows with their files.
+    upload_id = upload.id
+    after_commit(db, lambda: ClipRenderingService().purge_upload(upload_id))
+    ThumbnailService().purge(db, upload)
+    HlsPackagingService(db).purge(upload)
     db.delete(upload)
+    if upload.content_digest:
+        # Other teams may hold the same film; the blob goes with its last reference.
+        db.flush()
+        MediaStore(db).release(upload.content_digest)
+    elif upload.storage_url:
+        backend, key = resolve_storage_url(upload.storage_url)
+        after_commit(db, lambda: backend.delete(key))
     db.commit()
     return None
 
 
 @router.get("/{upload_id}/stream")
 def stream_game_film(
+    request: Request,
     team_id: int,
     upload_id: int,
     db: Session = Depends(deps.get_db_session),
     current_user=Depends(deps.get_current_user),
 ):
-    _require_member(db, team_id, current_user.id)
+    deps.require_team_member(db, team_id, current_user.id)
     upload = _get_upload(db, team_id, upload_id)
-    file_path = Path(upload.storage_url)
-    if not file_path.exists():
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Film file not found")
-    content_type, _ = mimetypes.guess_type(str(file_path))
-    return FileResponse(
-        str(file_path),
-        media_type=content_type or "video/mp4",
-        filename=file_path.name,
-    )
+    filename = Path(upload.storage_url).name
+    content_type, _ = mimetypes.guess_type(filename)
+    return stored_media_response(request, upload.storage_url, content_type or "video/mp4", filename)
+
+
+def _thumbnail_response(request: Request, key: str, media_type: str) -> Response:
+    response = stored_media_response(request, get_storage().url_for(key), media_type)
+    # Sheets only change when the upload is reprocessed; the ETag covers that.
+    response.headers["cache-control"] = f"private, max-age={settings.thumbnail_cache_max_age_seconds}"
+    return response
+
+
+@router.get("/{upload_id}/thumbnails.vtt")
+def get_thumbnail_index(
+    request: Request,
+    team_id: int,
+    upload_id: int,
+    db: Session = Depends(deps.get_db_session),
+    current_user=Depends(deps.get_current_user),
+):
+    """WebVTT index for timeline hover previews; cue URLs are relative to this path."""
+    deps.require_team_member(db, team_id, current_user.id)
+    upload = _get_upload(db, team_id, upload_id)
+    if not upload.thumbnail_prefix:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Thumbnails not available")
+    return _thumbnail_response(request, ThumbnailService.index_key(upload.thumbnail_prefix), "text/vtt")
+
+
+@router.get("/{upload_id}/thumbnails/{sheet}.jpg")
+def get_thumbnail_sheet(
+    request: Request,
+    team_id: int,
+    upload_id: int,
+    sheet: int,
+    db: Session = Depends(deps.get_db_session),
+    current_user=Depends(deps.get_current_user),
+):
+    deps.require_team_member(db, team_id, current_user.id)
+    upload = _get_upload(db, team_id, upload_id)
+    if not upload.thumbnail_prefix or not 0 <= sheet < (upload.thumbnail_sheets or 0):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Thumbnail sheet not found")
+    return _thumbnail_response(request, ThumbnailService.sheet_key(upload.thumbnail_prefix, sheet), "image/jpeg")
 
 
 @router.get("/{upload_id}/segments", response_model=list[FilmSegmentRead])
 def list_segments(
     team_id: int,
     upload_id: int,
+    response: Response,
+    page: PageParams = Depends(),
+    start_after: int | None = Query(None, description="Only segments starting at or after this second"),
+    start_before: int | None = Query(None, description="Only segments starting before this second"),
+    fields: str | None = Query(None, description="Comma-separated FilmSegmentRead fields to return"),
     db: Session = Depends(deps.get_db_session),
     current_user=Depends(deps.get_current_user),
 ):
-    _require_member(db, team_id, current_user.id)
+    deps.require_team_member(db, team_id, current_user.id)
+    selected = parse_fields(fields, FilmSegmentRead)
     _get_upload(db, team_id, upload_id)
-    segments = (
-        db.query(FilmSegment)
-        .filter(FilmSegment.upload_id == upload_id)
-        .order_by(FilmSegment.start_second.asc())
-        .all()
-    )
-    return segments
+    query = db.query(FilmSegment).filter(FilmSegment.upload_id == upload_id)
+    if start_after is not None:
+        query = query.filter(FilmSegment.start_second >= start_after)
+    if start_before is not None:
+        query = query.filter(FilmSegment.start_second < start_before)
+    segments = keyset_page(query, [(FilmSegment.start_second, False), (FilmSegment.id, False)], page, response)
+    return project(segments, FilmSegmentRead, selected, response)
 
 
 @router.post("/{upload_id}/segments", response_model=FilmSegmentRead, status_code=status.HTTP_201_CREATED)
@@ -210,7 +237,7 @@ def create_segment(
     db: Session = Depends(deps.get_db_session),
     current_user=Depends(deps.get_current_user),
 ):
-    _require_member(db, team_id, current_user.id)
+    deps.require_team_member(db, team_id, current_user.id)
     _get_upload(db, team_id, upload_id)
     if payload.end_second <= payload.start_second:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="End must be after start")
@@ -236,7 +263,7 @@ def publish_segment_as_clip(
     db: Session = Depends(deps.get_db_session),
     current_user=Depends(deps.get_current_user),
 ):
-    _require_member(db, team_id, current_user.id)
+    deps.require_team_member(db, team_id, current_user.id)
     upload = _get_upload(db, team_id, upload_id)
     segment = (
         db.query(FilmSegment)
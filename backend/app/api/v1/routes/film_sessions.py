@@ -0,0 +1,255 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+import hashlib
+import os
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.api import deps
+from app.core.config import get_settings
+from app.models.film_upload_chunk import FilmUploadChunk
+from app.models.film_upload_session import FilmUploadSession
+from app.schemas.film_upload_session import FilmUploadChunkRead, FilmUploadSessionCreate, FilmUploadSessionRead
+from app.schemas.game_upload import GameUploadRead
+from app.services.film_uploads import create_game_upload, resolve_upload_game
+from app.services.media_store import MediaStore
+
+settings = get_settings()
+router = APIRouter(prefix="/teams/{team_id}/film/sessions", tags=["film"])
+raw_root = Path(settings.media_root) / "raw"
+raw_root.mkdir(parents=True, exist_ok=True)
+
+MIN_CHUNK_SIZE = 256 * 1024
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+
+
+def _get_session(db: Session, team_id: int, session_id: str, user_id: int) -> FilmUploadSession:
+    deps.require_team_member(db, team_id, user_id)
+    session = (
+        db.query(FilmUploadSession)
+        .filter(
+            FilmUploadSession.id == session_id,
+            FilmUploadSession.team_id == team_id,
+            FilmUploadSession.uploaded_by_id == user_id,
+        )
+        .first()
+    )
+    if not session:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found")
+    return session
+
+
+def _get_open_session(db: Session, team_id: int, session_id: str, user_id: int) -> FilmUploadSession:
+    session = _get_session(db, team_id, session_id, user_id)
+    if session.status != "open":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Upload session is already complete")
+    if session.expires_at < datetime.utcnow():
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail="Upload session expired")
+    return session
+
+
+def _write_at(fd: int, data: bytes, position: int, digest) -> None:
+    digest.update(data)
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, position)
+        view = view[written:]
+        position += written
+
+
+def _forget_chunk(db: Session, session_id: str, index: int) -> None:
+    """Drop a chunk's record so ``complete`` refuses the session until the chunk is re-sent intact."""
+    db.query(FilmUploadChunk).filter(FilmUploadChunk.session_id == session_id, FilmUploadChunk.index == index).delete(
+        synchronize_session=False
+    )
+    db.commit()
+
+
+def _record_chunk(db: Session, session_id: str, index: int, size: int, sha256: str) -> FilmUploadChunk:
+    chunk = FilmUploadChunk(session_id=session_id, index=index, size=size, sha256=sha256)
+    try:
+        chunk = db.merge(chunk)
+        db.commit()
+    except IntegrityError:
+        # The same chunk was retried in parallel; last write wins.
+        db.rollback()
+        chunk = db.merge(chunk)
+        db.commit()
+    return chunk
+
+
+@router.post("", response_model=FilmUploadSessionRead, status_code=status.HTTP_201_CREATED)
+def create_upload_session(
+    team_id: int,
+    payload: FilmUploadSessionCreate,
+    db: Session = Depends(deps.get_db_session),
+    current_user=Depends(deps.get_current_user),
+):
+    deps.require_team_member(db, team_id, current_user.id)
+    if payload.game_id is not None:
+        resolve_upload_game(db, payload.game_id, payload.title, payload.notes)
+    if payload.total_size > settings.upload_session_max_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"total_size must be at most {settings.upload_session_max_size} bytes",
+        )
+    chunk_size = payload.chunk_size or settings.upload_session_chunk_size
+    if not MIN_CHUNK_SIZE <= chunk_size <= MAX_CHUNK_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"chunk_size must be between {MIN_CHUNK_SIZE} and {MAX_CHUNK_SIZE} bytes",
+        )
+
+    session_id = uuid4().hex
+    destination = raw_root / f"{session_id}{Path(payload.filename).suffix}"
+    # Sparse preallocation: chunks are written in place at their offsets.
+    with destination.open("wb") as buffer:
+        buffer.truncate(payload.total_size)
+    session = FilmUploadSession(
+        id=session_id,
+        team_id=team_id,
+        uploaded_by_id=current_user.id,
+        game_id=payload.game_id,
+        title=payload.title,
+        notes=payload.notes,
+        total_size=payload.total_size,
+        chunk_size=chunk_size,
+        storage_url=str(destination),
+        status="open",
+        expires_at=datetime.utcnow() + timedelta(hours=settings.upload_session_ttl_hours),
+    )
+    db.add(session)
+    db.commit()
+    db.refresh(session)
+    return session
+
+
+@router.get("/{session_id}", response_model=FilmUploadSessionRead)
+def get_upload_session(
+    team_id: int,
+    session_id: str,
+    db: Session = Depends(deps.get_db_session),
+    current_user=Depends(deps.get_current_user),
+):
+    return _get_session(db, team_id, session_id, current_user.id)
+
+
+@router.put("/{session_id}/chunks/{index}", response_model=FilmUploadChunkRead)
+async def upload_chunk(
+    team_id: int,
+    session_id: str,
+    index: int,
+    request: Request,
+    x_chunk_sha256: str | None = Header(default=None),
+    db: Session = Depends(deps.get_db_session),
+    current_user=Depends(deps.get_current_user),
+):
+    """Write one chunk at ``index * chunk_size``; chunks may arrive in any order and in parallel."""
+    session = await run_in_threadpool(_get_open_session, db, team_id, session_id, current_user.id)
+    if not 0 <= index < session.total_chunks:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Chunk index out of range")
+    expected = session.chunk_length(index)
+    position = index * session.chunk_size
+    digest = hashlib.sha256()
+    received = 0
+    buffer = bytearray()
+
+    # A retry overwrites the bytes of an already recorded chunk, so forget
+    # that record first: if this attempt fails, the chunk counts as missing.
+    await run_in_threadpool(_forget_chunk, db, session_id, index)
+    try:
+        fd = await run_in_threadpool(os.open, session.storage_url, os.O_WRONLY)
+        try:
+            async for piece in request.stream():
+                received += len(piece)
+                if received > expected:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"Chunk {index} must be {expected} bytes",
+                    )
+                buffer += piece
+                if len(buffer) >= settings.upload_chunk_size:
+                    await run_in_threadpool(_write_at, fd, bytes(buffer), position, digest)
+                    position += len(buffer)
+                    buffer.clear()
+            if buffer:
+                await run_in_threadpool(_write_at, fd, bytes(buffer), position, digest)
+        finally:
+            os.close(fd)
+
+        if received != expected:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Chunk {index} must be {expected} bytes")
+        checksum = digest.hexdigest()
+        if x_chunk_sha256 and x_chunk_sha256.lower() != checksum:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Chunk checksum mismatch")
+    except Exception:
+        # A parallel retry of the same chunk may have recorded itself over
+        # bytes this attempt has since clobbered.
+        await run_in_threadpool(_forget_chunk, db, session_id, index)
+        raise
+    return await run_in_threadpool(_record_chunk, db, session_id, index, received, checksum)
+
+
+@router.post("/{session_id}/complete", response_model=GameUploadRead, status_code=status.HTTP_201_CREATED)
+def complete_upload_session(
+    team_id: int,
+    session_id: str,
+    db: Session = Depends(deps.get_db_session),
+    current_user=Depends(deps.get_current_user),
+):
+    session = _get_open_session(db, team_id, session_id, current_user.id)
+    missing = sorted(set(range(session.total_chunks)) - set(session.received_chunks))
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Missing {len(missing)} chunk(s), first: {missing[:20]}",
+        )
+    game = resolve_upload_game(db, session.game_id, session.title, session.notes)
+    # Guarded transition so two concurrent completes can't create two uploads.
+    claimed = (
+        db.query(FilmUploadSession)
+        .filter(FilmUploadSession.id == session.id, FilmUploadSession.status == "open")
+        .update({FilmUploadSession.status: "complete"}, synchronize_session=False)
+    )
+    if not claimed:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Upload session is already complete")
+    assembled = Path(session.storage_url)
+    blob = MediaStore(db).store_file(assembled, assembled.suffix)
+    upload = create_game_upload(
+        db,
+        team_id=team_id,
+        uploaded_by_id=current_user.id,
+        title=session.title,
+        notes=session.notes,
+        game=game,
+        storage_url=blob.storage_url,
+        content_digest=blob.digest,
+    )
+    session.upload_id = upload.id
+    db.commit()
+    return upload
+
+
+@router.delete("/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
+def abort_upload_session(
+    team_id: int,
+    session_id: str,
+    db: Session = Depends(deps.get_db_session),
+    current_user=Depends(deps.get_current_user),
+):
+    session = _get_session(db, team_id, session_id, current_user.id)
+    if session.status != "open":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Upload session is already complete")
+    try:
+        if os.path.exists(session.storage_url):
+            os.remove(session.storage_url)
+    except OSError:
+        pass
+    db.delete(session)
+    db.commit()
+    return None
@@ -0,0 +1,27 @@
+import re
+
+from fastapi import APIRouter, HTTPException, Request, status
+
+from app.api.streaming import stored_media_response
+from app.services.hls_packaging import HlsPackagingService
+from app.services.storage import get_storage
+
+router = APIRouter(prefix="/hls", tags=["film"])
+
+# No auth: the random token in the path is the capability, which keeps these
+# URLs static and cacheable by browsers and CDNs.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+_TOKEN = re.compile(r"[A-Za-z0-9_-]{32}")
+_PATH = re.compile(r"(v\d+/)?[A-Za-z0-9_]+\.(m3u8|ts)")
+_MEDIA_TYPES = {"m3u8": "application/vnd.apple.mpegurl", "ts": "video/mp2t"}
+
+
+@router.get("/{token}/{path:path}")
+def get_hls_file(request: Request, token: str, path: str):
+    if not _TOKEN.fullmatch(token) or not _PATH.fullmatch(path):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    storage = get_storage()
+    media_type = _MEDIA_TYPES[path.rsplit(".", 1)[1]]
+    response = stored_media_response(request, storage.url_for(HlsPackagingService.key(token, path)), media_type)
+    response.headers["cache-control"] = IMMUTABLE_CACHE_CONTROL
+    return response
@@ -1,11 +1,10 @@
 from datetime import datetime
-from pathlib import Path
 
 from fastapi import APIRouter, Depends, File, Form, UploadFile
 from sqlalchemy.orm import Session
 
 from app.api import deps
-from app.services.ingestion import StatsIngestionService
+from app.services.ingestion import StatsIngestionService, iter_csv_rows
 
 router = APIRouter(prefix="/ingest", tags=["ingestion"])
 
@@ -17,9 +16,8 @@ def ingest_possessions(
     file: UploadFile = File(...),
     db: Session = Depends(deps.get_db_session),
 ):
-    temp_path = Path("/tmp") / file.filename
-    temp_path.write_bytes(file.file.read())
+    # Rows are pulled from the upload stream only as the service consumes each
+    # batch, so memory stays bounded by the ingestion batch size.
     service = StatsIngestionService(db)
-    game = service.ingest_possession_csv(temp_path, matchup, scheduled_at)
-    temp_path.unlink(missing_ok=True)
+    game = service.ingest_possession_rows(iter_csv_rows(file.file), matchup, scheduled_at)
     return {"game_id": game.id, "matchup": game.matchup}
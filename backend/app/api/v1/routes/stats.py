@@ -1,15 +1,27 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
+from pydantic import TypeAdapter
 
-from app.api import deps
+from app.api.response_cache import cached_json_response
+from app.db.cache_versions import STATS_SCOPE
 from app.schemas.stats import GameStats
 from app.services.stats import StatsService
 
 router = APIRouter(prefix="/stats", tags=["stats"])
+GAME_STATS = TypeAdapter(GameStats)
 
 
 @router.get("/game", response_model=GameStats)
 def read_game_stats(
+    request: Request,
+    response: Response,
     matchup: str | None = Query(default=None),
     stats_service: StatsService = Depends(StatsService.as_dependency),
 ):
-    return stats_service.get_stats(matchup)
+    return cached_json_response(
+        request,
+        response,
+        stats_service.db,
+        [STATS_SCOPE],
+        GAME_STATS,
+        lambda: stats_service.get_stats(matchup),
+    )
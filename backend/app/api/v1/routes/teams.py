@@ -1,10 +1,12 @@
 from datetime import datetime, timedelta
 import secrets
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session, contains_eager
 
 from app.api import deps
+from app.api.pagination import PageParams, keyset_page, parse_fields, project
+from app.core.auth_cache import get_auth_cache
 from app.models.team import Team
 from app.models.team_invite import TeamInvite
 from app.models.team_membership import TeamMembership
@@ -19,17 +21,6 @@ from app.schemas.team import (
 router = APIRouter(prefix="/teams", tags=["teams"])
 
 
-def _require_membership(db: Session, team_id: int, user_id: int) -> TeamMembership:
-    membership = (
-        db.query(TeamMembership)
-        .filter(TeamMembership.team_id == team_id, TeamMembership.user_id == user_id)
-        .first()
-    )
-    if not membership:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this team")
-    return membership
-
-
 def _generate_invite_code(db: Session) -> str:
     while True:
         candidate = secrets.token_urlsafe(5).upper()
@@ -54,23 +45,31 @@ def create_team(
     db.add(team)
     db.add(membership)
     db.commit()
+    get_auth_cache().invalidate_user(current_user.id)
     db.refresh(membership)
     return membership
 
 
 @router.get("", response_model=list[TeamMembershipRead])
 def list_my_teams(
+    response: Response,
+    page: PageParams = Depends(),
+    role: str | None = None,
+    fields: str | None = Query(None, description="Comma-separated TeamMembershipRead fields to return"),
     db: Session = Depends(deps.get_db_session),
     current_user=Depends(deps.get_current_user),
 ):
-    memberships = (
+    selected = parse_fields(fields, TeamMembershipRead)
+    query = (
         db.query(TeamMembership)
         .join(TeamMembership.team)
+        .options(contains_eager(TeamMembership.team))
         .filter(TeamMembership.user_id == current_user.id)
-        .order_by(TeamMembership.joined_at.desc())
-        .all()
     )
-    return memberships
+    if role is not None:
+        query = query.filter(TeamMembership.role == role)
+    memberships = keyset_page(query, [(TeamMembership.joined_at, True), (TeamMembership.id, True)], page, response)
+    return project(memberships, TeamMembershipRead, selected, response)
 
 
 @router.post("/{team_id}/invites", response_model=TeamInviteRead, status_code=status.HTTP_201_CREATED)
@@ -80,7 +79,7 @@ def create_invite(
     db: Session = Depends(deps.get_db_session),
     current_user=Depends(deps.get_current_user),
 ):
-    membership = _require_membership(db, team_id, current_user.id)
+    membership = deps.require_team_member(db, team_id, current_user.id)
     if membership.role not in {"coach", "admin"}:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only coaches can create invites")
 
@@ -132,5 +131,6 @@ def join_team_by_code(
     invite.uses += 1
     db.add(membership)
     db.commit()
+    get_auth_cache().invalidate_team(invite.team_id)
     db.refresh(membership)
     return membership
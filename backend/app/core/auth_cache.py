@@ -0,0 +1,163 @@
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.ttl_cache import TTLCache
+from app.models.team_membership import TeamMembership
+from app.models.user import User
+
+REQUEST_SCOPE_KEY = "auth_cache"
+
+
+@dataclass(frozen=True)
+class AuthUser:
+    """Detached snapshot of the authenticated user; routes only read these fields."""
+
+    id: int
+    email: str
+    full_name: str | None
+    is_active: bool
+    is_superuser: bool
+    is_verified: bool
+
+    @classmethod
+    def from_model(cls, user: User) -> "AuthUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            is_active=bool(user.is_active),
+            is_superuser=bool(user.is_superuser),
+            is_verified=bool(user.is_verified),
+        )
+
+
+@dataclass(frozen=True)
+class AuthMembership:
+    team_id: int
+    user_id: int
+    role: str
+
+
+class RequestScope:
+    """Per-request lookups, kept in ``Session.info`` (one session per request)."""
+
+    def __init__(self):
+        self.users: dict[int, AuthUser] = {}
+        self.memberships: dict[tuple[int, int], AuthMembership] = {}
+        self.claims_user_id: int | None = None
+        self.team_claims: dict[int, str] = {}
+
+
+class AuthCache:
+    """Process-level cache of users and team memberships used by auth dependencies.
+
+    Only positive results are cached, so a user who just joined a team is never
+    refused. Entries expire after ``auth_cache_ttl_seconds``; that TTL is also
+    the bound on staleness across API worker processes, since invalidation
+    only reaches the process that made the change.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.users = TTLCache(max_entries, ttl)
+        self.memberships = TTLCache(max_entries, ttl)
+        self.claim_hits = 0
+        self.request_hits = 0
+        self._counter_lock = threading.Lock()
+
+    @staticmethod
+    def scope(db: Session) -> RequestScope:
+        scope = db.info.get(REQUEST_SCOPE_KEY)
+        if scope is None:
+            scope = db.info[REQUEST_SCOPE_KEY] = RequestScope()
+        return scope
+
+    def get_user(self, db: Session, user_id: int) -> AuthUser | None:
+        scope = self.scope(db)
+        user = scope.users.get(user_id)
+        if user is not None:
+            self._count("request_hits")
+            return user
+        user = self.users.get(user_id)
+        if user is None:
+            row = db.query(User).filter(User.id == user_id).first()
+            if row is None:
+                return None
+            user = AuthUser.from_model(row)
+            self.users.set(user_id, user)
+        scope.users[user_id] = user
+        return user
+
+    def get_membership(self, db: Session, team_id: int, user_id: int) -> AuthMembership | None:
+        scope = self.scope(db)
+        key = (team_id, user_id)
+        membership = scope.memberships.get(key)
+        if membership is not None:
+            self._count("request_hits")
+            return membership
+        if scope.claims_user_id == user_id and team_id in scope.team_claims:
+            self._count("claim_hits")
+            membership = AuthMembership(team_id=team_id, user_id=user_id, role=scope.team_claims[team_id])
+        else:
+            membership = self.memberships.get(key)
+        if membership is None:
+            row = (
+                db.query(TeamMembership)
+                .filter(TeamMembership.team_id == team_id, TeamMembership.user_id == user_id)
+                .first()
+            )
+            if row is None:
+                return None
+            membership = AuthMembership(team_id=row.team_id, user_id=row.user_id, role=row.role)
+            self.memberships.set(key, membership)
+        scope.memberships[key] = membership
+        return membership
+
+    def use_token_claims(self, db: Session, user_id: int, teams: dict[str, str] | None) -> None:
+        """Trust the signed ``teams`` claim of this request's access token."""
+        scope = self.scope(db)
+        scope.claims_user_id = user_id
+        scope.team_claims = {int(team_id): role for team_id, role in (teams or {}).items()}
+
+    def invalidate_user(self, user_id: int) -> None:
+        self.users.discard(lambda key: key == user_id)
+        self.memberships.discard(lambda key: key[1] == user_id)
+
+    def invalidate_team(self, team_id: int) -> None:
+        self.memberships.discard(lambda key: key[0] == team_id)
+
+    def _count(self, name: str) -> None:
+        # Requests run on threadpool threads; += on an attribute is not atomic.
+        with self._counter_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self) -> dict:
+        def rate(cache: TTLCache) -> float:
+            lookups = cache.hits + cache.misses
+            return round(cache.hits / lookups, 4) if lookups else 0.0
+
+        return {
+            "users": {
+                "entries": len(self.users),
+                "hits": self.users.hits,
+                "misses": self.users.misses,
+                "hit_rate": rate(self.users),
+            },
+            "memberships": {
+                "entries": len(self.memberships),
+                "hits": self.memberships.hits,
+                "misses": self.memberships.misses,
+                "hit_rate": rate(self.memberships),
+            },
+            "token_claim_hits": self.claim_hits,
+            "request_hits": self.request_hits,
+        }
+
+
+@lru_cache
+def get_auth_cache() -> AuthCache:
+    settings = get_settings()
+    return AuthCache(settings.auth_cache_max_entries, settings.auth_cache_ttl_seconds)
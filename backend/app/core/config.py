@@ -8,17 +8,94 @@ class Settings(BaseSettings):
     secret_key: str
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 60
+    access_token_team_claims: bool = False  # sign team memberships into access tokens
+    auth_cache_ttl_seconds: int = 60
+    auth_cache_max_entries: int = 10000
+    # argon2 cost. Defaults are passlib 1.7.4's (t=3, m=64 MiB, p=4), which existing
+    # hashes were made with; changing them rehashes each user on their next login.
+    password_hash_time_cost: int = 3
+    password_hash_memory_kib: int = 64 * 1024
+    password_hash_parallelism: int = 4
+    password_hash_workers: int = 4
+    password_hash_max_queue: int = 32  # further logins get 503 + Retry-After
+    password_hash_retry_after_seconds: int = 2
 
     database_url: str
 
     model_gateway_url: str | None = None
     model_gateway_token: str | None = None
+    model_gateway_timeout_seconds: float = 20.0
+    model_gateway_max_concurrency: int = 8
+    model_gateway_max_retries: int = 3
+    model_gateway_backoff_seconds: float = 0.5
+    model_gateway_breaker_threshold: int = 5
+    model_gateway_breaker_reset_seconds: float = 30.0
+    model_gateway_batch_size: int = 1  # >1 groups concurrent uploads into one request
+    model_gateway_batch_window_ms: int = 50
     frontend_base_url: str = "http://localhost:3000"
     email_from_address: str | None = None
+    email_transport: str = "auto"  # "ses", "smtp", "log"; auto = SES when AWS creds are set
+    smtp_host: str = "localhost"
+    smtp_port: int = 587
+    smtp_username: str | None = None
+    smtp_password: str | None = None
+    smtp_starttls: bool = True
+    aws_ses_endpoint_url: str | None = None  # e.g. http://localhost:4566 for LocalStack
+    email_batch_size: int = 50
+    email_concurrency: int = 4
+    email_rate_per_second: float = 10.0  # stay under the provider's send quota
+    email_max_attempts: int = 5
+    email_retry_backoff_seconds: int = 60
+    email_poll_interval_seconds: float = 2.0
+    email_visibility_timeout_seconds: int = 300
     aws_access_key_id: str | None = None
     aws_secret_access_key: str | None = None
     aws_region: str | None = None
     media_root: str = "storage/uploads"
+    upload_chunk_size: int = 1024 * 1024
+    storage_backend: str = "local"  # "local" or "s3"
+    storage_s3_bucket: str | None = None
+    storage_s3_prefix: str = ""
+    storage_s3_endpoint_url: str | None = None  # e.g. http://localhost:9000 for MinIO
+    storage_presign_ttl_seconds: int = 3600
+    storage_redirect_streams: bool = False
+    upload_session_chunk_size: int = 8 * 1024 * 1024
+    upload_session_ttl_hours: int = 24
+    upload_session_max_size: int = 50 * 1024 * 1024 * 1024
+    ingestion_batch_size: int = 5000
+    page_default_limit: int = 100
+    page_max_limit: int = 500
+    response_cache_max_entries: int = 1024  # serialized list/stats bodies kept in memory; 0 disables
+    response_cache_ttl_seconds: int = 300
+    film_worker_concurrency: int = 2
+    job_max_attempts: int = 3
+    job_retry_backoff_seconds: int = 30
+    job_poll_interval_seconds: float = 2.0
+    job_visibility_timeout_seconds: int = 1800
+    clip_render_timeout_seconds: int = 120
+    probe_workers: int = 2
+    scene_analysis_fps: float = 4.0
+    scene_frame_width: int = 64
+    scene_frame_height: int = 36
+    scene_block_frames: int = 512
+    scene_cut_ratio: float = 4.0
+    scene_dead_ball_seconds: float = 3.0
+    scene_min_segment_seconds: int = 6
+    scene_max_segment_seconds: int = 45
+    scene_timeout_seconds: int = 3600
+    probe_timeout_seconds: int = 300
+    thumbnail_interval_seconds: int = 10
+    thumbnail_width: int = 160
+    thumbnail_height: int = 90
+    thumbnail_columns: int = 10
+    thumbnail_rows: int = 10
+    thumbnail_timeout_seconds: int = 900
+    thumbnail_cache_max_age_seconds: int = 86400
+    hls_enabled: bool = False
+    hls_renditions: list[str] = ["1080:5000", "720:2800", "480:1200"]  # height:video kbps
+    hls_audio_bitrate_kbps: int = 128
+    hls_segment_seconds: int = 4
+    hls_timeout_seconds: int = 4 * 3600
 
     class Config:
         env_file = ".env"
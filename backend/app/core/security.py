@@ -1,27 +1,84 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any
+from functools import lru_cache
+from typing import Any, Callable
 
 from jose import jwt
 from passlib.context import CryptContext
 
 from .config import get_settings
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
+class PasswordHasherBusy(Exception):
+    """Raised when the password hashing pool and its queue are full."""
 
-def create_access_token(subject: str, expires_delta: timedelta | None = None) -> str:
+
+@lru_cache
+def get_pwd_context() -> CryptContext:
+    # Hashes made with other parameters still verify; verify_and_update flags them for rehash.
+    settings = get_settings()
+    return CryptContext(
+        schemes=["argon2"],
+        deprecated="auto",
+        argon2__time_cost=settings.password_hash_time_cost,
+        argon2__memory_cost=settings.password_hash_memory_kib,
+        argon2__parallelism=settings.password_hash_parallelism,
+    )
+
+
+class PasswordHashPool:
+    """Dedicated, bounded pool for argon2 work.
+
+    argon2-cffi releases the GIL while hashing, so threads run in parallel
+    without the pickling cost of a process pool. At most ``workers`` hashes
+    run at once and ``max_queue`` more may wait; beyond that ``submit`` raises
+    ``PasswordHasherBusy`` instead of letting a login burst tie up the
+    threads every other route shares.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="argon2")
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+
+    def submit(self, fn: Callable, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy()
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+
+@lru_cache
+def get_password_hash_pool() -> PasswordHashPool:
+    settings = get_settings()
+    return PasswordHashPool(settings.password_hash_workers, settings.password_hash_max_queue)
+
+
+def create_access_token(
+    subject: str, expires_delta: timedelta | None = None, claims: dict[str, Any] | None = None
+) -> str:
     settings = get_settings()
     if expires_delta is None:
         expires_delta = timedelta(minutes=settings.access_token_expire_minutes)
     expire = datetime.utcnow() + expires_delta
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {**(claims or {}), "exp": expire, "sub": str(subject)}
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.jwt_algorithm)
     return encoded_jwt
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Verify a password; also return a new hash when the stored one uses outdated parameters."""
+    return get_pwd_context().verify_and_update(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
@@ -0,0 +1,12 @@
+import re
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str | None) -> str:
+    """Lowercase and collapse everything but ASCII letters/digits into single spaces."""
+    if not text:
+        return ""
+    normalized = _NON_ALNUM.sub(" ", text.lower())
+    return _WHITESPACE.sub(" ", normalized).strip()
@@ -0,0 +1,33 @@
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+AFTER_COMMIT_KEY = "after_commit_actions"
+
+
+def _run_actions(session: Session) -> None:
+    if session.in_nested_transaction():
+        return
+    for action in session.info.pop(AFTER_COMMIT_KEY, ()):
+        try:
+            action()
+        except Exception as exc:
+            print(f"[MEDIA] Post-commit cleanup failed: {exc}")
+
+
+def _drop_actions(session: Session) -> None:
+    if not session.in_nested_transaction():
+        session.info.pop(AFTER_COMMIT_KEY, None)
+
+
+def after_commit(db: Session, action: Callable[[], None]) -> None:
+    """Run ``action`` once ``db``'s transaction commits; a rollback discards it.
+
+    Used for file deletions, which cannot be rolled back: if the commit fails,
+    the rows survive and still find their files.
+    """
+    if not event.contains(db, "after_commit", _run_actions):
+        event.listen(db, "after_commit", _run_actions)
+        event.listen(db, "after_rollback", _drop_actions)
+    db.info.setdefault(AFTER_COMMIT_KEY, []).append(action)
@@ -0,0 +1,117 @@
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy import event, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models.cache_version import CacheVersion
+from app.models.clip import Clip
+from app.models.clip_possession_link import ClipPossessionLink
+from app.models.game import Game
+from app.models.game_stats_snapshot import GameStatsSnapshot
+from app.models.game_upload import GameUpload
+from app.models.player import Player
+from app.models.possession import Possession
+from app.models.team import Team
+
+# Game data (games, possessions, players, snapshots) is shared by every team.
+STATS_SCOPE = "stats"
+# Narrower scope for the games table alone, watched by the in-process matchup index.
+GAMES_SCOPE = "games"
+PENDING_KEY = "cache_scopes"
+
+_STATS_MODELS = (Game, GameStatsSnapshot, Possession, Player, Team, ClipPossessionLink)
+
+
+def team_scope(team_id: int) -> str:
+    return f"team:{team_id}"
+
+
+def _scopes_for(obj) -> set[str]:
+    if isinstance(obj, (Clip, GameUpload)):
+        return {team_scope(obj.team_id)} if obj.team_id is not None else set()
+    if isinstance(obj, Game):
+        return {STATS_SCOPE, GAMES_SCOPE}
+    if isinstance(obj, _STATS_MODELS):
+        return {STATS_SCOPE}
+    return set()
+
+
+def get_versions(db: Session, scopes: Iterable[str]) -> dict[str, int]:
+    """Current version per scope; scopes never written are version 0."""
+    scopes = list(scopes)
+    rows = db.query(CacheVersion.scope, CacheVersion.version).filter(CacheVersion.scope.in_(scopes))
+    versions = dict.fromkeys(scopes, 0)
+    versions.update({scope: version for scope, version in rows})
+    return versions
+
+
+def bump_versions(db: Session, *scopes: str) -> None:
+    """Bump scopes explicitly, for writes that bypass the ORM (bulk ``insert()``/``update()``).
+
+    Like ORM writes, the bump is written when the session commits.
+    """
+    db.info.setdefault(PENDING_KEY, set()).update(scopes)
+
+
+def _bump(connection: Connection, scopes: Iterable[str]) -> None:
+    # Sorted so concurrent transactions lock the rows in the same order.
+    scopes = sorted(set(scopes))
+    if not scopes:
+        return
+    now = datetime.utcnow()
+    table = CacheVersion.__table__
+    dialect = {"postgresql": postgresql, "sqlite": sqlite}.get(connection.dialect.name)
+    if dialect is None:
+        for scope in scopes:
+            bumped = connection.execute(
+                update(table).where(table.c.scope == scope).values(version=table.c.version + 1, updated_at=now)
+            )
+            if not bumped.rowcount:
+                connection.execute(table.insert().values(scope=scope, version=1, updated_at=now))
+        return
+    statement = dialect.insert(table).values([{"scope": scope, "version": 1, "updated_at": now} for scope in scopes])
+    connection.execute(
+        statement.on_conflict_do_update(
+            index_elements=[table.c.scope],
+            set_={"version": table.c.version + 1, "updated_at": statement.excluded.updated_at},
+        )
+    )
+
+
+def _collect_scopes(session: Session, flush_context, instances) -> None:
+    scopes = session.info.setdefault(PENDING_KEY, set())
+    for obj in session.new:
+        scopes |= _scopes_for(obj)
+    for obj in session.deleted:
+        scopes |= _scopes_for(obj)
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            scopes |= _scopes_for(obj)
+
+
+def _write_scopes(session: Session) -> None:
+    # Deferred to commit rather than written per flush: the version rows are
+    # then locked only for the commit itself, not for a whole multi-flush
+    # ingest, and every scope of the transaction is bumped in one sorted
+    # statement, so concurrent writers always lock them in the same order.
+    if session.in_nested_transaction():
+        return
+    session.flush()
+    scopes = session.info.pop(PENDING_KEY, None)
+    if scopes:
+        _bump(session.connection(), scopes)
+
+
+def _discard_scopes(session: Session) -> None:
+    if not session.in_nested_transaction():
+        session.info.pop(PENDING_KEY, None)
+
+
+def track_cache_versions(session_factory) -> None:
+    """Bump cache versions for every ORM write made through ``session_factory``, in the same transaction."""
+    event.listen(session_factory, "before_flush", _collect_scopes)
+    event.listen(session_factory, "before_commit", _write_scopes)
+    event.listen(session_factory, "after_rollback", _discard_scopes)
@@ -1,8 +1,13 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.orm import Session
 
-from app.api.v1.routes import auth, stats, ingestion, teams, clips, film
+from app.api import deps
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.api.v1.routes import auth, stats, ingestion, teams, clips, film, film_sessions, hls
+from app.core.auth_cache import get_auth_cache
 from app.core.config import get_settings
+from app.services.job_queue import JobQueue
 
 settings = get_settings()
 
@@ -20,6 +25,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 app.include_router(auth.router, prefix=settings.api_v1_prefix)
@@ -27,9 +33,22 @@ app.include_router(stats.router, prefix=settings.api_v1_prefix)
 app.include_router(ingestion.router, prefix=settings.api_v1_prefix)
 app.include_router(teams.router, prefix=settings.api_v1_prefix)
 app.include_router(clips.router, prefix=settings.api_v1_prefix)
+app.include_router(film_sessions.router, prefix=settings.api_v1_prefix)
 app.include_router(film.router, prefix=settings.api_v1_prefix)
+app.include_router(hls.router, prefix=settings.api_v1_prefix)
 
 
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
+
+
+@app.get("/health/queue")
+def queue_health(db: Session = Depends(deps.get_db_session), current_user=Depends(deps.get_current_user)):
+    deps.require_superuser(current_user)
+    return {"jobs": JobQueue(db).depth()}
+
+
+@app.get("/health/auth-cache")
+def auth_cache_health():
+    return get_auth_cache().stats()
@@ -10,3 +10,11 @@ from .team_membership import TeamMembership
 from .team_invite import TeamInvite
 from .game_upload import GameUpload
 from .film_segment import FilmSegment
+from .game_stats_snapshot import GameStatsSnapshot
+from .processing_job import ProcessingJob
+from .film_upload_session import FilmUploadSession
+from .film_upload_chunk import FilmUploadChunk
+from .media_blob import MediaBlob
+from .media_probe import MediaProbe
+from .email_outbox import EmailOutbox
+from .cache_version import CacheVersion
@@ -0,0 +1,14 @@
+from sqlalchemy import BigInteger, Column, DateTime, String
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+
+class CacheVersion(Base):
+    """Counter per cache scope (e.g. ``team:12``), bumped in the same transaction as the write."""
+
+    __tablename__ = "cache_version"
+
+    scope = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, server_default=func.now(), default=func.now())
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -12,10 +14,11 @@ class Clip(Base):
     uploaded_by_id = Column(Integer, ForeignKey("user.id"), nullable=True)
     title = Column(String, nullable=False)
     storage_url = Column(String, nullable=False)
+    content_digest = Column(String(64), ForeignKey("media_blob.digest"), nullable=True, index=True)
     shared_with = Column(String, nullable=True)
     notes = Column(Text, nullable=True)
     status = Column(String, nullable=False, default="pending")
-    uploaded_at = Column(DateTime, nullable=False, server_default=func.now(), default=func.now())
+    uploaded_at = Column(DateTime, nullable=False, server_default=func.now(), default=datetime.utcnow)
     source_upload_id = Column(Integer, ForeignKey("game_upload.id"), nullable=True)
     source_start_second = Column(Integer, nullable=True)
     source_end_second = Column(Integer, nullable=True)
@@ -30,6 +33,11 @@ class Clip(Base):
         backref="clip",
     )
 
+    __table_args__ = (
+        # Keyset pagination of a team's clips: newest first, id as tie-breaker.
+        Index("ix_clip_team_uploaded_at_id", "team_id", "uploaded_at", "id"),
+    )
+
     @property
     def game_matchup(self) -> str | None:
         return self.game.matchup if self.game else None
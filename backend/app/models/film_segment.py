@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -20,3 +20,5 @@ class FilmSegment(Base):
 
     upload = relationship("GameUpload", back_populates="segments")
     created_by = relationship("User")
+
+    __table_args__ = (Index("ix_film_segment_upload_start_id", "upload_id", "start_second", "id"),)
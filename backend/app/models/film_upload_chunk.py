@@ -0,0 +1,17 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+
+class FilmUploadChunk(Base):
+    __tablename__ = "film_upload_chunk"
+
+    session_id = Column(String, ForeignKey("film_upload_session.id", ondelete="CASCADE"), primary_key=True)
+    index = Column(Integer, primary_key=True)
+    size = Column(Integer, nullable=False)
+    sha256 = Column(String, nullable=False)
+    received_at = Column(DateTime, nullable=False, server_default=func.now(), default=func.now())
+
+    session = relationship("FilmUploadSession", back_populates="chunks")
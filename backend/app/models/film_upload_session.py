@@ -0,0 +1,41 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+
+class FilmUploadSession(Base):
+    __tablename__ = "film_upload_session"
+
+    id = Column(String, primary_key=True)
+    team_id = Column(Integer, ForeignKey("team.id", ondelete="CASCADE"), nullable=False)
+    uploaded_by_id = Column(Integer, ForeignKey("user.id"), nullable=True)
+    game_id = Column(Integer, ForeignKey("game.id"), nullable=True)
+    title = Column(String, nullable=False)
+    notes = Column(Text, nullable=True)
+    total_size = Column(BigInteger, nullable=False)
+    chunk_size = Column(Integer, nullable=False)
+    storage_url = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="open")
+    upload_id = Column(Integer, ForeignKey("game_upload.id", ondelete="SET NULL"), nullable=True)
+    created_at = Column(DateTime, nullable=False, server_default=func.now(), default=func.now())
+    expires_at = Column(DateTime, nullable=False)
+
+    chunks = relationship(
+        "FilmUploadChunk",
+        back_populates="session",
+        cascade="all, delete-orphan",
+        order_by="FilmUploadChunk.index",
+    )
+
+    @property
+    def total_chunks(self) -> int:
+        return -(-self.total_size // self.chunk_size)
+
+    @property
+    def received_chunks(self) -> list[int]:
+        return [chunk.index for chunk in self.chunks]
+
+    def chunk_length(self, index: int) -> int:
+        return min(self.chunk_size, self.total_size - index * self.chunk_size)
@@ -1,12 +1,14 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import relationship, validates
 
+from app.core.text import normalize_text
 from app.db.base_class import Base
 
 
 class Game(Base):
     id = Column(Integer, primary_key=True, index=True)
     matchup = Column(String, nullable=False)
+    normalized_matchup = Column(String, nullable=True, index=True)
     scheduled_at = Column(DateTime, nullable=False)
     location = Column(String, nullable=True)
     home_team_id = Column(Integer, ForeignKey("team.id"), nullable=True)
@@ -15,5 +17,21 @@ class Game(Base):
     possessions = relationship("Possession", back_populates="game", cascade="all, delete-orphan")
     clips = relationship("Clip", back_populates="game", cascade="all, delete-orphan")
     uploads = relationship("GameUpload", back_populates="game")
+    stats_snapshot = relationship(
+        "GameStatsSnapshot",
+        back_populates="game",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
     home_team = relationship("Team", foreign_keys=[home_team_id], back_populates="games_home")
     away_team = relationship("Team", foreign_keys=[away_team_id], back_populates="games_away")
+
+    __table_args__ = (
+        Index("ix_game_scheduled_at", "scheduled_at"),
+        Index("ix_game_matchup_scheduled_at", "matchup", "scheduled_at"),
+    )
+
+    @validates("matchup")
+    def _sync_normalized_matchup(self, key, value):
+        self.normalized_matchup = normalize_text(value)
+        return value
@@ -0,0 +1,15 @@
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+
+class GameStatsSnapshot(Base):
+    __tablename__ = "game_stats_snapshot"
+
+    game_id = Column(Integer, ForeignKey("game.id", ondelete="CASCADE"), primary_key=True)
+    payload = Column(JSON, nullable=False)
+    refreshed_at = Column(DateTime, nullable=False, server_default=func.now(), default=func.now())
+
+    game = relationship("Game", back_populates="stats_snapshot")
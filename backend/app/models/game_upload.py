@@ -1,7 +1,11 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
-from sqlalchemy.orm import relationship
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text, text
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 
+from app.core.config import get_settings
+from app.core.text import normalize_text
 from app.db.base_class import Base
 
 
@@ -14,16 +18,46 @@ class GameUpload(Base):
     game_id = Column(Integer, ForeignKey("game.id"), nullable=True)
     title = Column(String, nullable=False)
     storage_url = Column(String, nullable=False)
+    content_digest = Column(String(64), ForeignKey("media_blob.digest"), nullable=True, index=True)
     duration_seconds = Column(Integer, nullable=True)
     notes = Column(Text, nullable=True)
+    normalized_text = Column(Text, nullable=True)
+    thumbnail_prefix = Column(String, nullable=True)
+    thumbnail_sheets = Column(Integer, nullable=True)
+    hls_token = Column(String, nullable=True, index=True)
     status = Column(String, nullable=False, default="pending")
-    uploaded_at = Column(DateTime, nullable=False, server_default=func.now(), default=func.now())
+    uploaded_at = Column(DateTime, nullable=False, server_default=func.now(), default=datetime.utcnow)
 
     team = relationship("Team", back_populates="game_uploads")
     uploaded_by = relationship("User")
     game = relationship("Game", back_populates="uploads")
     segments = relationship("FilmSegment", back_populates="upload", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_game_upload_team_uploaded_at_id", "team_id", "uploaded_at", "id"),
+        # Trigram index over unlinked uploads so matchup LIKE '%...%' scans stay cheap.
+        Index(
+            "ix_game_upload_unlinked_text_trgm",
+            "normalized_text",
+            postgresql_using="gin",
+            postgresql_ops={"normalized_text": "gin_trgm_ops"},
+            postgresql_where=text("game_id IS NULL"),
+        ),
+    )
+
+    @validates("title", "notes")
+    def _sync_normalized_text(self, key, value):
+        title = value if key == "title" else self.title
+        notes = value if key == "notes" else self.notes
+        self.normalized_text = normalize_text(f"{title} {notes or ''}")
+        return value
+
+    @property
+    def hls_master_url(self) -> str | None:
+        if not self.hls_token:
+            return None
+        return f"{get_settings().api_v1_prefix}/hls/{self.hls_token}/master.m3u8"
+
     @property
     def game_matchup(self) -> str | None:
         return self.game.matchup if self.game else None
@@ -0,0 +1,20 @@
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+
+class MediaBlob(Base):
+    """One stored file, addressed by the SHA-256 of its contents.
+
+    ``ref_count`` counts the uploads and clips that point at the blob; the file
+    is removed when the last of them is deleted.
+    """
+
+    __tablename__ = "media_blob"
+
+    digest = Column(String(64), primary_key=True)
+    storage_url = Column(String, nullable=False)
+    size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False, server_default=func.now(), default=func.now())
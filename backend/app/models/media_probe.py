@@ -0,0 +1,14 @@
+from sqlalchemy import JSON, Column, DateTime, String
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+
+class MediaProbe(Base):
+    """Cached media metadata (duration, codec, size, fps, bitrate, keyframes)."""
+
+    __tablename__ = "media_probe"
+
+    cache_key = Column(String, primary_key=True)
+    info = Column(JSON, nullable=False)
+    created_at = Column(DateTime, nullable=False, server_default=func.now(), default=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
@@ -15,3 +15,7 @@ class Possession(Base):
 
     game = relationship("Game", back_populates="possessions")
     player = relationship("Player", back_populates="possessions")
+
+    __table_args__ = (
+        Index("ix_possession_game_video_range", "game_id", "video_start_second", "video_end_second"),
+    )
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+
+class ProcessingJob(Base):
+    __tablename__ = "processing_job"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)
+    upload_id = Column(Integer, ForeignKey("game_upload.id", ondelete="CASCADE"), nullable=True)
+    status = Column(String, nullable=False, default="queued")
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_after = Column(DateTime, nullable=False)
+    locked_by = Column(String, nullable=True)
+    locked_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, server_default=func.now(), default=func.now())
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (Index("ix_processing_job_status_run_after", "status", "run_after"),)
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, UniqueConstraint
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -12,9 +14,12 @@ class TeamMembership(Base):
     team_id = Column(Integer, ForeignKey("team.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
     role = Column(String, nullable=False, default="member")
-    joined_at = Column(DateTime, nullable=False, server_default=func.now(), default=func.now())
+    joined_at = Column(DateTime, nullable=False, server_default=func.now(), default=datetime.utcnow)
 
     team = relationship("Team", back_populates="memberships")
     user = relationship("User", back_populates="memberships")
 
-    __table_args__ = (UniqueConstraint("team_id", "user_id", name="uq_team_membership_team_user"),)
+    __table_args__ = (
+        UniqueConstraint("team_id", "user_id", name="uq_team_membership_team_user"),
+        Index("ix_team_membership_user_joined_at_id", "user_id", "joined_at", "id"),
+    )
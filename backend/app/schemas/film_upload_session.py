@@ -0,0 +1,36 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class FilmUploadSessionCreate(BaseModel):
+    title: str
+    notes: str | None = None
+    game_id: int | None = None
+    filename: str
+    total_size: int = Field(gt=0)
+    chunk_size: int | None = None
+
+
+class FilmUploadSessionRead(BaseModel):
+    id: str
+    title: str
+    status: str
+    total_size: int
+    chunk_size: int
+    total_chunks: int
+    received_chunks: list[int]
+    expires_at: datetime
+    upload_id: int | None = None
+
+    class Config:
+        from_attributes = True
+
+
+class FilmUploadChunkRead(BaseModel):
+    index: int
+    size: int
+    sha256: str
+
+    class Config:
+        from_attributes = True
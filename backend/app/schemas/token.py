@@ -8,3 +8,4 @@ class Token(BaseModel):
 
 class TokenPayload(BaseModel):
     sub: str | None = None
+    teams: dict[str, str] | None = None
@@ -0,0 +1,75 @@
+"""Standalone dispatcher that delivers queued email from the outbox.
+
+Usage (from ``backend/``)::
+
+    python -m app.scripts.email_dispatcher --concurrency 4 --rate 10
+
+Batches are claimed with ``FOR UPDATE SKIP LOCKED``, so several dispatchers
+can run side by side; ``--rate`` is per process, so split the provider's
+quota between them.
+"""
+import argparse
+import os
+import signal
+import socket
+import threading
+import time
+import traceback
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.services.email_outbox import EmailDispatcher, EmailOutboxQueue
+
+DEPTH_LOG_INTERVAL_SECONDS = 60
+SWEEP_INTERVAL_SECONDS = 60
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Run the email outbox dispatcher.")
+    parser.add_argument("--concurrency", type=int, default=settings.email_concurrency)
+    parser.add_argument("--rate", type=float, default=settings.email_rate_per_second, help="sends per second")
+    parser.add_argument("--poll-interval", type=float, default=settings.email_poll_interval_seconds)
+    parser.add_argument("--once", action="store_true", help="drain the outbox and exit")
+    args = parser.parse_args()
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    dispatcher = EmailDispatcher(worker_id, concurrency=args.concurrency, rate_per_second=args.rate)
+    print(f"[EMAIL] dispatcher {worker_id} started ({args.concurrency} sender(s), {args.rate}/s)")
+    idle_polls = 0
+    next_sweep = time.monotonic()
+    while not stop.is_set():
+        db = SessionLocal()
+        try:
+            if time.monotonic() >= next_sweep:
+                next_sweep = time.monotonic() + SWEEP_INTERVAL_SECONDS
+                abandoned = EmailOutboxQueue(db).fail_abandoned()
+                if abandoned:
+                    print(f"[EMAIL] failed {abandoned} abandoned message(s) out of attempts")
+            sent = dispatcher.dispatch_batch(db)
+            if sent:
+                idle_polls = 0
+                continue
+            if args.once:
+                break
+            idle_polls += 1
+            if idle_polls * args.poll_interval >= DEPTH_LOG_INTERVAL_SECONDS:
+                idle_polls = 0
+                print(f"[EMAIL] outbox depth: {EmailOutboxQueue(db).depth()}")
+            stop.wait(args.poll_interval)
+        except Exception:
+            # Database hiccups shouldn't kill the dispatcher; back off and retry.
+            traceback.print_exc()
+            stop.wait(args.poll_interval)
+        finally:
+            db.close()
+    dispatcher.close()
+    print("[EMAIL] dispatcher stopped")
+
+
+if __name__ == "__main__":
+    main()
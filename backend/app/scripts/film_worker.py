@@ -0,0 +1,121 @@
+"""Standalone worker that drains the film processing queue.
+
+Usage (from ``backend/``)::
+
+    python -m app.scripts.film_worker --concurrency 4
+
+Run as many worker processes as needed; jobs are claimed with
+``FOR UPDATE SKIP LOCKED`` so they never double-process a job.
+"""
+import argparse
+import os
+import signal
+import socket
+import threading
+import traceback
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.services.film_processing import FilmProcessingService
+from app.services.film_uploads import purge_expired_upload_sessions
+from app.services.hls_packaging import HlsPackagingService
+from app.services.job_queue import FILM_PROCESSING, HLS_PACKAGING, JobQueue
+from app.services.media_probe import shutdown_probe_pool
+from app.services.model_gateway import get_model_gateway
+
+DEPTH_LOG_INTERVAL_SECONDS = 60
+
+
+def _run_job(db, queue: JobQueue, job) -> None:
+    def heartbeat() -> None:
+        # Decodes and encodes can outlast the visibility timeout; keep the claim alive.
+        queue.heartbeat(job)
+
+    if job.kind == FILM_PROCESSING:
+        FilmProcessingService(db).process_upload(job.upload_id, heartbeat=heartbeat)
+    elif job.kind == HLS_PACKAGING:
+        HlsPackagingService(db).package_upload(job.upload_id, heartbeat=heartbeat)
+    else:
+        raise ValueError(f"Unknown job kind: {job.kind}")
+
+
+def _work(worker_id: str, stop: threading.Event, poll_interval: float) -> None:
+    while not stop.is_set():
+        db = SessionLocal()
+        try:
+            queue = JobQueue(db)
+            job = queue.claim(worker_id)
+            if job is None:
+                stop.wait(poll_interval)
+                continue
+            try:
+                _run_job(db, queue, job)
+            except Exception as exc:
+                db.rollback()
+                traceback.print_exc()
+                queue.fail(job, repr(exc))
+                print(f"[WORKER] {worker_id} job {job.id} failed (attempt {job.attempts}/{job.max_attempts})")
+            else:
+                queue.complete(job)
+                print(f"[WORKER] {worker_id} job {job.id} done (upload {job.upload_id})")
+        except Exception:
+            # Database hiccups shouldn't kill the thread; back off and retry.
+            traceback.print_exc()
+            stop.wait(poll_interval)
+        finally:
+            db.close()
+
+
+def _housekeeping() -> None:
+    db = SessionLocal()
+    try:
+        queue = JobQueue(db)
+        abandoned = queue.fail_abandoned()
+        if abandoned:
+            print(f"[WORKER] failed {abandoned} abandoned job(s) out of attempts")
+        purged = purge_expired_upload_sessions(db)
+        if purged:
+            print(f"[WORKER] purged {purged} expired upload session(s)")
+        print(f"[WORKER] queue depth: {queue.depth()}")
+    except Exception as exc:
+        print(f"[WORKER] queue housekeeping failed: {exc}")
+    finally:
+        db.close()
+    gateway = get_model_gateway()
+    if gateway is not None:
+        print(f"[WORKER] model gateway: {gateway.metrics.snapshot()} breaker={gateway.breaker.state}")
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Run the film processing worker.")
+    parser.add_argument("--concurrency", type=int, default=settings.film_worker_concurrency)
+    parser.add_argument("--poll-interval", type=float, default=settings.job_poll_interval_seconds)
+    args = parser.parse_args()
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    host = f"{socket.gethostname()}:{os.getpid()}"
+    threads = [
+        threading.Thread(target=_work, args=(f"{host}:{index}", stop, args.poll_interval), daemon=True)
+        for index in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    print(f"[WORKER] started {args.concurrency} thread(s) on {host}")
+
+    while not stop.wait(DEPTH_LOG_INTERVAL_SECONDS):
+        _housekeeping()
+    for thread in threads:
+        thread.join()
+    gateway = get_model_gateway()
+    if gateway is not None:
+        gateway.close()
+    shutdown_probe_pool()
+    print("[WORKER] stopped")
+
+
+if __name__ == "__main__":
+    main()
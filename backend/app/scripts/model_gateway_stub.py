@@ -0,0 +1,55 @@
+"""Local stand-in for the segment model gateway, for exercising the client.
+
+Usage (from ``backend/``)::
+
+    python -m app.scripts.model_gateway_stub --port 9100 --latency 0.2 --fail-rate 0.1
+    export MODEL_GATEWAY_URL=http://127.0.0.1:9100/segments
+
+Answers single (``{"upload_id": ...}``) and batched (``{"batch": [...]}``)
+requests with evenly spaced fake segments; ``--fail-rate`` returns 503s.
+"""
+import argparse
+import asyncio
+import random
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+def _segments(payload: dict) -> list[dict]:
+    duration = int(payload.get("duration_seconds") or 60)
+    step = max(5, duration // 6)
+    return [
+        {"start_second": start, "end_second": min(duration, start + step), "label": f"Stub segment {index + 1}"}
+        for index, start in enumerate(range(0, duration - 1, step))
+    ]
+
+
+def create_app(latency: float, fail_rate: float) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/segments")
+    async def segments(request: Request):
+        await asyncio.sleep(latency)
+        if random.random() < fail_rate:
+            return JSONResponse({"detail": "stub failure"}, status_code=503)
+        body = await request.json()
+        if "batch" in body:
+            return {"results": [{"segments": _segments(item)} for item in body["batch"]]}
+        return {"segments": _segments(body)}
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a stub model gateway.")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.latency, args.fail_rate), host="127.0.0.1", port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""Rebuild materialized per-game stats snapshots (e.g. after a backfill).
+
+Usage (from ``backend/``)::
+
+    python -m app.scripts.rebuild_game_stats
+    python -m app.scripts.rebuild_game_stats --game-id 12 --game-id 13
+"""
+import argparse
+
+from app.db.session import SessionLocal
+from app.services.stats import StatsService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild game stats snapshots.")
+    parser.add_argument("--game-id", type=int, action="append", dest="game_ids")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rebuilt = StatsService(db).rebuild_snapshots(args.game_ids)
+    finally:
+        db.close()
+    print(f"[STATS] Rebuilt {rebuilt} game snapshot(s)")
+
+
+if __name__ == "__main__":
+    main()
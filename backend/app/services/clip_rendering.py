@@ -0,0 +1,102 @@
+import os
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+from uuid import uuid4
+
+from app.core.config import get_settings
+from app.models.clip import Clip
+from app.models.game_upload import GameUpload
+from app.services.storage import media_source
+
+# Fixed pool of striped locks: renders of the same window serialize, unrelated
+# windows rarely share a stripe, and memory stays constant however many clips exist.
+RENDER_LOCK_STRIPES = 64
+_render_locks = [threading.Lock() for _ in range(RENDER_LOCK_STRIPES)]
+
+
+def _lock_for(key: str) -> threading.Lock:
+    return _render_locks[hash(key) % RENDER_LOCK_STRIPES]
+
+
+class ClipRenderingService:
+    """Cuts published clips out of their source film with a stream copy (no re-encode).
+
+    Rendered files are cached on local disk under ``media_root/clips`` keyed by
+    source upload and time window, so clips that share a window also share the
+    file. The source itself may live in any storage backend.
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.cache_root = Path(self.settings.media_root) / "clips"
+
+    def cached_path(self, clip: Clip) -> Path:
+        suffix = Path(clip.storage_url).suffix or ".mp4"
+        return self.cache_root / f"{clip.source_upload_id}-{clip.source_start_second}-{clip.source_end_second}{suffix}"
+
+    def ensure_clip_file(self, clip: Clip) -> Path | None:
+        """Return a file holding just the clip's window, rendering it on first use.
+
+        Returns None when the clip is not a slice of a source upload or ffmpeg
+        is unavailable; callers then fall back to the full source file.
+        """
+        if clip.source_upload_id is None or clip.source_start_second is None or clip.source_end_second is None:
+            return None
+        target = self.cached_path(clip)
+        if target.exists():
+            return target
+        ffmpeg = shutil.which("ffmpeg")
+        if not ffmpeg:
+            return None
+        # A local path, or a presigned URL ffmpeg range-reads from object storage.
+        source = media_source(clip.storage_url)
+        if source is None:
+            return None
+
+        with _lock_for(target.name):
+            if target.exists():
+                return target
+            target.parent.mkdir(parents=True, exist_ok=True)
+            partial = target.with_name(f".{uuid4().hex}{target.suffix}")
+            try:
+                subprocess.run(
+                    [
+                        ffmpeg,
+                        "-v",
+                        "error",
+                        "-ss",
+                        str(clip.source_start_second),
+                        "-i",
+                        source,
+                        "-t",
+                        str(clip.source_end_second - clip.source_start_second),
+                        "-c",
+                        "copy",
+                        "-avoid_negative_ts",
+                        "make_zero",
+                        "-movflags",
+                        "+faststart",
+                        "-y",
+                        str(partial),
+                    ],
+                    capture_output=True,
+                    check=True,
+                    timeout=self.settings.clip_render_timeout_seconds,
+                )
+                # Atomic so concurrent readers never see a half-written file.
+                os.replace(partial, target)
+            except (subprocess.SubprocessError, OSError) as exc:
+                print(f"[CLIPS] Could not render clip {clip.id}: {exc}")
+                partial.unlink(missing_ok=True)
+                return None
+        return target
+
+    def purge_upload(self, upload_id: int) -> None:
+        """Drop every cached clip rendered from upload ``upload_id``."""
+        for path in self.cache_root.glob(f"{upload_id}-*"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
@@ -1,42 +1,158 @@
-from collections import Counter
-from typing import List
+from collections import Counter, defaultdict
+from heapq import heappop, heappush
+from typing import Iterable, Iterator, List
 
+from sqlalchemy import and_, insert, or_
 from sqlalchemy.orm import Session
 
+from app.db.cache_versions import STATS_SCOPE, bump_versions
 from app.models.clip import Clip
 from app.models.clip_possession_link import ClipPossessionLink
 from app.models.player import Player
 from app.models.possession import Possession
 from app.models.team import Team
 
+Interval = tuple[int, int, int]
+LINK_WINDOW_CHUNK = 200
+HYDRATE_CHUNK = 500
+
+
+def _clip_game_id(clip: Clip) -> int | None:
+    if clip.game_id is not None:
+        return clip.game_id
+    if clip.source_upload is not None:
+        return clip.source_upload.game_id
+    return None
+
 
 def link_clip_to_possessions(db: Session, clip: Clip) -> None:
-    """Attach clip-to-possession links based on overlapping time ranges."""
+    """Attach clip-to-possession links based on overlapping time ranges in the clip's game."""
     if clip.source_start_second is None or clip.source_end_second is None:
         return
+    game_id = _clip_game_id(clip)
+    if game_id is None:
+        return
 
-    matches: List[Possession] = (
-        db.query(Possession)
-        .filter(Possession.video_start_second.isnot(None))
-        .filter(Possession.video_end_second.isnot(None))
-        .filter(Possession.video_end_second > clip.source_start_second)
+    # Served by ix_possession_game_video_range: equality on game_id, range on start.
+    matches: List[int] = [
+        possession_id
+        for (possession_id,) in db.query(Possession.id)
+        .filter(Possession.game_id == game_id)
         .filter(Possession.video_start_second < clip.source_end_second)
+        .filter(Possession.video_end_second > clip.source_start_second)
         .all()
-    )
+    ]
 
     if not matches:
         return
 
     db.query(ClipPossessionLink).filter(ClipPossessionLink.clip_id == clip.id).delete()
-    for possession in matches:
-        db.add(ClipPossessionLink(clip_id=clip.id, possession_id=possession.id))
+    for possession_id in matches:
+        db.add(ClipPossessionLink(clip_id=clip.id, possession_id=possession_id))
     db.commit()
 
 
-def hydrate_clip_stats(db: Session, clip: Clip) -> Clip:
-    """Populate lightweight stats context on a clip ORM object."""
-    rows = (
+def _overlapping_pairs(clips: List[Interval], possessions: List[Interval]) -> Iterator[tuple[int, int]]:
+    """Sort-and-sweep interval join yielding (clip_id, possession_id) overlaps.
+
+    Inputs are (id, start, end) tuples. Intervals are visited in start order and
+    each side keeps a min-heap of still-open intervals keyed by end, so every
+    interval is pushed and popped once and only real overlaps are emitted.
+    """
+    events = sorted(
+        [(start, 0, item_id, end) for item_id, start, end in clips]
+        + [(start, 1, item_id, end) for item_id, start, end in possessions]
+    )
+    open_intervals: tuple[list, list] = ([], [])
+    for start, side, item_id, end in events:
+        for heap in open_intervals:
+            while heap and heap[0][0] <= start:
+                heappop(heap)
+        for _, other_start, other_id in open_intervals[1 - side]:
+            if other_start < end:
+                yield (item_id, other_id) if side == 0 else (other_id, item_id)
+        heappush(open_intervals[side], (end, start, item_id))
+
+
+def _merged_windows(intervals: List[Interval]) -> List[tuple[int, int]]:
+    windows: List[list[int]] = []
+    for _, start, end in sorted(intervals, key=lambda interval: interval[1]):
+        if windows and start <= windows[-1][1]:
+            windows[-1][1] = max(windows[-1][1], end)
+        else:
+            windows.append([start, end])
+    return [(start, end) for start, end in windows]
+
+
+def link_clips_to_possessions(db: Session, clips: Iterable[Clip]) -> int:
+    """Link many clips in one pass using a per-game sort-and-sweep interval join."""
+    clips_by_game: dict[int, List[Interval]] = defaultdict(list)
+    for clip in clips:
+        if clip.source_start_second is None or clip.source_end_second is None:
+            continue
+        game_id = _clip_game_id(clip)
+        if game_id is not None:
+            clips_by_game[game_id].append((clip.id, clip.source_start_second, clip.source_end_second))
+    if not clips_by_game:
+        return 0
+
+    # Only fetch possessions inside the merged clip coverage of each game; each
+    # window is an indexed range probe on (game_id, video_start_second).
+    windows = [
+        (game_id, start, end)
+        for game_id, game_clips in clips_by_game.items()
+        for start, end in _merged_windows(game_clips)
+    ]
+    possessions_by_game: dict[int, dict[int, Interval]] = defaultdict(dict)
+    for offset in range(0, len(windows), LINK_WINDOW_CHUNK):
+        rows = (
+            db.query(
+                Possession.game_id,
+                Possession.id,
+                Possession.video_start_second,
+                Possession.video_end_second,
+            )
+            .filter(
+                or_(
+                    *[
+                        and_(
+                            Possession.game_id == game_id,
+                            Possession.video_start_second < end,
+                            Possession.video_end_second > start,
+                        )
+                        for game_id, start, end in windows[offset : offset + LINK_WINDOW_CHUNK]
+                    ]
+                )
+            )
+            .all()
+        )
+        for game_id, possession_id, start, end in rows:
+            possessions_by_game[game_id][possession_id] = (possession_id, start, end)
+
+    links = [
+        {"clip_id": clip_id, "possession_id": possession_id}
+        for game_id, game_clips in clips_by_game.items()
+        for clip_id, possession_id in _overlapping_pairs(
+            game_clips, list(possessions_by_game[game_id].values())
+        )
+    ]
+    if not links:
+        return 0
+
+    linked_clip_ids = {link["clip_id"] for link in links}
+    db.query(ClipPossessionLink).filter(ClipPossessionLink.clip_id.in_(linked_clip_ids)).delete(
+        synchronize_session=False
+    )
+    db.execute(insert(ClipPossessionLink), links)
+    bump_versions(db, STATS_SCOPE)
+    db.commit()
+    return len(links)
+
+
+def _possession_context_query(db: Session):
+    return (
         db.query(
+            ClipPossessionLink.clip_id,
             ClipPossessionLink.possession_id,
             Possession.label,
             Possession.outcome,
@@ -49,10 +165,11 @@ def hydrate_clip_stats(db: Session, clip: Clip) -> Clip:
         .join(Possession, ClipPossessionLink.possession_id == Possession.id)
         .outerjoin(Player, Possession.player_id == Player.id)
         .outerjoin(Team, Player.team_id == Team.id)
-        .filter(ClipPossessionLink.clip_id == clip.id)
-        .all()
+        .order_by(ClipPossessionLink.clip_id, ClipPossessionLink.possession_id)
     )
 
+
+def _apply_clip_stats(clip: Clip, rows: Iterable) -> Clip:
     contexts = []
     player_counts: Counter[str] = Counter()
     for row in rows:
@@ -84,3 +201,22 @@ def hydrate_clip_stats(db: Session, clip: Clip) -> Clip:
         clip.stats_summary = None
 
     return clip
+
+
+def hydrate_clip_stats(db: Session, clip: Clip) -> Clip:
+    """Populate lightweight stats context on a clip ORM object."""
+    rows = _possession_context_query(db).filter(ClipPossessionLink.clip_id == clip.id).all()
+    return _apply_clip_stats(clip, rows)
+
+
+def hydrate_clips_stats(db: Session, clips: List[Clip]) -> List[Clip]:
+    """Batch version of hydrate_clip_stats: one chunked IN query for all clips."""
+    rows_by_clip: dict[int, list] = defaultdict(list)
+    clip_ids = [clip.id for clip in clips]
+    for offset in range(0, len(clip_ids), HYDRATE_CHUNK):
+        chunk = clip_ids[offset : offset + HYDRATE_CHUNK]
+        for row in _possession_context_query(db).filter(ClipPossessionLink.clip_id.in_(chunk)):
+            rows_by_clip[row.clip_id].append(row)
+    for clip in clips:
+        _apply_clip_stats(clip, rows_by_clip.get(clip.id, ()))
+    return clips
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import smtplib
+from email.message import EmailMessage
+
 try:
     import boto3
     from botocore.exceptions import BotoCoreError, ClientError
@@ -10,27 +13,66 @@ except ImportError:
 from app.core.config import get_settings
 
 
+def verification_email(token: str) -> tuple[str, str]:
+    """(subject, html body) for the account verification email."""
+    frontend = get_settings().frontend_base_url.rstrip("/")
+    link = f"{frontend}/auth/verify?token={token}"
+    html_body = (
+        "<p>Thanks for joining AIM. Click the link below to verify your account:</p>"
+        f'<p><a href="{link}">{link}</a></p>'
+    )
+    return "Confirm your AIM account", html_body
+
+
+def password_reset_email(token: str) -> tuple[str, str]:
+    frontend = get_settings().frontend_base_url.rstrip("/")
+    link = f"{frontend}/auth/reset-password?token={token}"
+    html_body = (
+        "<p>We received a request to reset your password. If this was you, click the link below:</p>"
+        f'<p><a href="{link}">Reset password</a></p>'
+        "<p>If you didn't request this, you can ignore this email.</p>"
+    )
+    return "Reset your AIM password", html_body
+
+
 class EmailService:
+    """Sends one email through SES, SMTP, or (with neither configured) the log.
+
+    Not thread-safe when using SMTP: the connection is reused between sends,
+    so give each thread its own instance.
+    """
+
     def __init__(self):
         self.settings = get_settings()
-        has_creds = (
-            boto3
-            and self.settings.aws_access_key_id
-            and self.settings.aws_secret_access_key
-            and self.settings.aws_region
-        )
-        if has_creds:
+        self.transport = self._pick_transport()
+        self.ses = None
+        self.smtp: smtplib.SMTP | None = None
+        if self.transport == "ses":
             self.ses = boto3.client(
                 "ses",
                 aws_access_key_id=self.settings.aws_access_key_id,
                 aws_secret_access_key=self.settings.aws_secret_access_key,
                 region_name=self.settings.aws_region,
+                endpoint_url=self.settings.aws_ses_endpoint_url,
             )
-        else:
-            self.ses = None
 
-    def _send(self, to_email: str, subject: str, html_body: str) -> None:
+    def _pick_transport(self) -> str:
+        transport = self.settings.email_transport
+        if transport != "auto":
+            return transport
+        has_creds = (
+            boto3
+            and self.settings.aws_access_key_id
+            and self.settings.aws_secret_access_key
+            and self.settings.aws_region
+        )
+        return "ses" if has_creds else "log"
+
+    def send(self, to_email: str, subject: str, html_body: str) -> None:
         from_address = self.settings.email_from_address or "no-reply@aim-platform.test"
+        if self.transport == "smtp":
+            self._send_smtp(from_address, to_email, subject, html_body)
+            return
         if not self.ses:
             print(
                 f"[EMAIL MOCK] {subject} -> {to_email}\n"
@@ -50,21 +92,40 @@ class EmailService:
             print(f"[EMAIL] Failed to send email to {to_email}: {exc}")
             raise
 
+    def _send_smtp(self, from_address: str, to_email: str, subject: str, html_body: str) -> None:
+        message = EmailMessage()
+        message["From"] = from_address
+        message["To"] = to_email
+        message["Subject"] = subject
+        message.set_content(html_body, subtype="html")
+        try:
+            self._smtp_connection().send_message(message)
+        except (smtplib.SMTPException, OSError) as exc:
+            self.close()
+            print(f"[EMAIL] Failed to send email to {to_email}: {exc}")
+            raise
+
+    def _smtp_connection(self) -> smtplib.SMTP:
+        if self.smtp is None:
+            settings = self.settings
+            smtp = smtplib.SMTP(settings.smtp_host, settings.smtp_port, timeout=30)
+            if settings.smtp_starttls:
+                smtp.starttls()
+            if settings.smtp_username:
+                smtp.login(settings.smtp_username, settings.smtp_password or "")
+            self.smtp = smtp
+        return self.smtp
+
+    def close(self) -> None:
+        if self.smtp is not None:
+            try:
+                self.smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.smtp = None
+
     def send_verification_email(self, email: str, token: str) -> None:
-        frontend = self.settings.frontend_base_url.rstrip("/")
-        link = f"{frontend}/auth/verify?token={token}"
-        html_body = (
-            "<p>Thanks for joining AIM. Click the link below to verify your account:</p>"
-            f'<p><a href="{link}">{link}</a></p>'
-        )
-        self._send(email, "Confirm your AIM account", html_body)
+        self.send(email, *verification_email(token))
 
     def send_password_reset_email(self, email: str, token: str) -> None:
-        frontend = self.settings.frontend_base_url.rstrip("/")
-        link = f"{frontend}/auth/reset-password?token={token}"
-        html_body = (
-            "<p>We received a request to reset your password. If this was you, click the link below:</p>"
-            f'<p><a href="{link}">Reset password</a></p>'
-            "<p>If you didn't request this, you can ignore this email.</p>"
-        )
-        self._send(email, "Reset your AIM password", html_body)
+        self.send(email, *password_reset_email(token))
@@ -0,0 +1,204 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.email_outbox import EmailOutbox
+from app.services.email import EmailService
+
+
+class EmailOutboxQueue:
+    """Outbox rows claimed in batches with SELECT ... FOR UPDATE SKIP LOCKED.
+
+    Delivery is at-least-once: a row whose dispatcher died mid-send becomes
+    claimable again after ``email_visibility_timeout_seconds``.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.settings = get_settings()
+
+    def enqueue(self, to_address: str, subject: str, html_body: str) -> EmailOutbox:
+        """Stage an email; it is only sent if the caller's transaction commits."""
+        message = EmailOutbox(
+            to_address=to_address,
+            subject=subject,
+            html_body=html_body,
+            status="pending",
+            attempts=0,
+            max_attempts=self.settings.email_max_attempts,
+            run_after=datetime.utcnow(),
+        )
+        self.db.add(message)
+        return message
+
+    def claim_batch(self, worker_id: str, limit: int) -> list[EmailOutbox]:
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=self.settings.email_visibility_timeout_seconds)
+        claimable = or_(
+            and_(EmailOutbox.status == "pending", EmailOutbox.run_after <= now),
+            and_(
+                EmailOutbox.status == "sending",
+                EmailOutbox.locked_at < stale_before,
+                EmailOutbox.attempts < EmailOutbox.max_attempts,
+            ),
+        )
+        ids = [
+            row.id
+            for row in self.db.query(EmailOutbox.id)
+            .filter(claimable)
+            .order_by(EmailOutbox.run_after, EmailOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        ]
+        if not ids:
+            self.db.rollback()
+            return []
+        # Re-checking the claim condition keeps it exclusive on databases
+        # without row locks (e.g. SQLite in local development).
+        self.db.query(EmailOutbox).filter(EmailOutbox.id.in_(ids), claimable).update(
+            {
+                EmailOutbox.status: "sending",
+                EmailOutbox.attempts: EmailOutbox.attempts + 1,
+                EmailOutbox.locked_by: worker_id,
+                EmailOutbox.locked_at: now,
+            },
+            synchronize_session=False,
+        )
+        self.db.commit()
+        return (
+            self.db.query(EmailOutbox)
+            .filter(EmailOutbox.id.in_(ids), EmailOutbox.locked_by == worker_id, EmailOutbox.locked_at == now)
+            .order_by(EmailOutbox.id)
+            .all()
+        )
+
+    def fail_abandoned(self) -> int:
+        """Fail messages whose dispatcher died mid-send on their last attempt.
+
+        ``claim_batch`` never reclaims these, so without this they would stay
+        "sending" forever. Returns how many messages were failed.
+        """
+        stale_before = datetime.utcnow() - timedelta(seconds=self.settings.email_visibility_timeout_seconds)
+        failed = (
+            self.db.query(EmailOutbox)
+            .filter(
+                EmailOutbox.status == "sending",
+                EmailOutbox.locked_at < stale_before,
+                EmailOutbox.attempts >= EmailOutbox.max_attempts,
+            )
+            .update(
+                {
+                    EmailOutbox.status: "failed",
+                    EmailOutbox.locked_by: None,
+                    EmailOutbox.last_error: "Dispatcher stopped during the final attempt",
+                },
+                synchronize_session=False,
+            )
+        )
+        self.db.commit()
+        return failed
+
+    def mark_sent(self, messages: list[EmailOutbox]) -> None:
+        if not messages:
+            return
+        self.db.query(EmailOutbox).filter(EmailOutbox.id.in_([message.id for message in messages])).update(
+            {EmailOutbox.status: "sent", EmailOutbox.locked_by: None, EmailOutbox.sent_at: datetime.utcnow()},
+            synchronize_session=False,
+        )
+        self.db.commit()
+
+    def mark_failed(self, message: EmailOutbox, error: str) -> None:
+        message.last_error = error
+        message.locked_by = None
+        if message.attempts >= message.max_attempts:
+            message.status = "failed"
+        else:
+            # Exponential backoff with full jitter so a provider outage doesn't end in a stampede.
+            backoff = self.settings.email_retry_backoff_seconds * 2 ** (message.attempts - 1)
+            message.status = "pending"
+            message.run_after = datetime.utcnow() + timedelta(seconds=random.uniform(backoff / 2, backoff))
+        self.db.commit()
+
+    def depth(self) -> dict[str, int]:
+        rows = self.db.query(EmailOutbox.status, func.count(EmailOutbox.id)).group_by(EmailOutbox.status).all()
+        return {status: count for status, count in rows}
+
+
+class TokenBucket:
+    """Blocking rate limiter shared by the sender threads: ``rate`` sends/second, bursts up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class EmailDispatcher:
+    """Drains the outbox: claims a batch, sends it on ``email_concurrency`` threads, records results."""
+
+    def __init__(self, worker_id: str, concurrency: int | None = None, rate_per_second: float | None = None):
+        self.settings = get_settings()
+        self.worker_id = worker_id
+        self.concurrency = concurrency or self.settings.email_concurrency
+        self.bucket = TokenBucket(rate_per_second or self.settings.email_rate_per_second)
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="email")
+        # One EmailService per sender thread so SMTP connections are reused but never shared.
+        self._local = threading.local()
+        self._services: list[EmailService] = []
+        self._services_lock = threading.Lock()
+
+    def dispatch_batch(self, db: Session) -> int:
+        """Send one batch. Returns how many messages were claimed (0 when the outbox is idle)."""
+        queue = EmailOutboxQueue(db)
+        messages = queue.claim_batch(self.worker_id, self.settings.email_batch_size)
+        if not messages:
+            return 0
+        payloads = [(message.to_address, message.subject, message.html_body) for message in messages]
+        results = list(self._executor.map(self._deliver, payloads))
+        queue.mark_sent([message for message, error in zip(messages, results) if error is None])
+        for message, error in zip(messages, results):
+            if error is not None:
+                queue.mark_failed(message, error)
+                print(f"[EMAIL] outbox {message.id} failed (attempt {message.attempts}/{message.max_attempts}): {error}")
+        return len(messages)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        for service in self._services:
+            service.close()
+
+    def _deliver(self, payload: tuple[str, str, str]) -> str | None:
+        self.bucket.acquire()
+        try:
+            self._service().send(*payload)
+        except Exception as exc:
+            return repr(exc)
+        return None
+
+    def _service(self) -> EmailService:
+        service = getattr(self._local, "service", None)
+        if service is None:
+            service = self._local.service = EmailService()
+            with self._services_lock:
+                self._services.append(service)
+        return service
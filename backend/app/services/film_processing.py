@@ -1,14 +1,18 @@
 import math
-import subprocess
-from pathlib import Path
-from typing import List
+import shutil
+from typing import Callable, List
 
-import httpx
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
 from app.models.film_segment import FilmSegment
 from app.models.game_upload import GameUpload
+from app.services.job_queue import JobQueue
+from app.services.media_probe import MediaProbeService
+from app.services.model_gateway import get_model_gateway
+from app.services.scene_detection import SceneDetector
+from app.services.storage import media_source
+from app.services.thumbnails import ThumbnailService
 
 
 class FilmProcessingService:
@@ -18,7 +22,12 @@ class FilmProcessingService:
         self.db = db
         self.settings = get_settings()
 
-    def process_upload(self, upload_id: int) -> None:
+    def process_upload(self, upload_id: int, heartbeat: Callable[[], None] | None = None) -> None:
+        """Probe, segment and preview an upload.
+
+        ``heartbeat`` keeps a queue claim alive between stages and while scene
+        detection decodes the film; it commits the session.
+        """
         upload = (
             self.db.query(GameUpload)
             .filter(GameUpload.id == upload_id)
@@ -27,14 +36,22 @@ class FilmProcessingService:
         if not upload or not upload.storage_url:
             return
 
+        if self.reuse_processed_duplicate(upload):
+            self.db.commit()
+            return
+
         upload.status = "processing"
         self.db.commit()
 
         status = "ready"
-        duration = self._probe_duration(Path(upload.storage_url))
+        source = media_source(upload.storage_url)
+        info = MediaProbeService(self.db).probe(upload, source) if source else None
+        duration = info.duration if info else None
         try:
             if duration is not None:
                 upload.duration_seconds = int(duration)
+            if heartbeat:
+                heartbeat()
 
             existing_segments = (
                 self.db.query(FilmSegment)
@@ -42,7 +59,11 @@ class FilmProcessingService:
                 .count()
             )
             if existing_segments == 0 and duration and duration > 0:
-                segments = self._fetch_model_segments(upload) or self._suggest_segments(duration)
+                segments = (
+                    self._fetch_model_segments(upload)
+                    or SceneDetector().suggest_segments(source, duration, heartbeat)
+                    or self._suggest_segments(duration)
+                )
                 for segment in segments:
                     film_segment = FilmSegment(
                         upload_id=upload.id,
@@ -52,6 +73,13 @@ class FilmProcessingService:
                         notes=segment.get("notes"),
                     )
                     self.db.add(film_segment)
+
+            if source and duration and duration > 0:
+                if heartbeat:
+                    heartbeat()
+                ThumbnailService().generate(upload, source, duration)
+                if self.settings.hls_enabled and shutil.which("ffmpeg"):
+                    JobQueue(self.db).enqueue_hls_packaging(upload.id)
         except Exception:
             status = "error"
             raise
@@ -59,9 +87,62 @@ class FilmProcessingService:
             upload.status = status
             self.db.commit()
 
+    def reuse_processed_duplicate(self, upload: GameUpload) -> bool:
+        """Copy duration, previews, HLS output and auto-generated segments from a ready upload of the same content.
+
+        Returns True when the upload was filled in this way. Does not commit.
+        """
+        if not upload.content_digest:
+            return False
+        source = (
+            self.db.query(GameUpload)
+            .filter(
+                GameUpload.content_digest == upload.content_digest,
+                GameUpload.id != upload.id,
+                GameUpload.status == "ready",
+            )
+            .order_by(GameUpload.id.asc())
+            .first()
+        )
+        if source is None:
+            return False
+        upload.duration_seconds = source.duration_seconds
+        # Same bytes, same sheets: share them rather than render again.
+        upload.thumbnail_prefix = source.thumbnail_prefix
+        upload.thumbnail_sheets = source.thumbnail_sheets
+        upload.hls_token = source.hls_token
+        if not upload.hls_token and self.settings.hls_enabled and shutil.which("ffmpeg"):
+            # The original's packaging may still be queued; this job shares its
+            # output if it lands first and encodes otherwise.
+            JobQueue(self.db).enqueue_hls_packaging(upload.id)
+        existing_segments = (
+            self.db.query(FilmSegment)
+            .filter(FilmSegment.upload_id == upload.id)
+            .count()
+        )
+        if existing_segments == 0:
+            # Coach-made segments (created_by_id set) belong to the other team.
+            for segment in (
+                self.db.query(FilmSegment)
+                .filter(FilmSegment.upload_id == source.id, FilmSegment.created_by_id.is_(None))
+                .order_by(FilmSegment.start_second.asc())
+            ):
+                self.db.add(
+                    FilmSegment(
+                        upload_id=upload.id,
+                        start_second=segment.start_second,
+                        end_second=segment.end_second,
+                        label=segment.label,
+                        notes=segment.notes,
+                    )
+                )
+        upload.status = "ready"
+        return True
+
     def _fetch_model_segments(self, upload: GameUpload) -> List[dict]:
         """Try to fetch model-generated segments from a gateway. Returns [] on failure."""
-        if not self.settings.model_gateway_url:
+        gateway = get_model_gateway()
+        if gateway is None:
             return []
         payload = {
             "upload_id": upload.id,
@@ -70,22 +151,7 @@ class FilmProcessingService:
             "game_id": upload.game_id,
             "title": upload.title,
         }
-        headers = {}
-        if self.settings.model_gateway_token:
-            headers["Authorization"] = f"Bearer {self.settings.model_gateway_token}"
-        try:
-            response = httpx.post(
-                self.settings.model_gateway_url,
-                json=payload,
-                headers=headers,
-                timeout=20,
-            )
-            response.raise_for_status()
-            data = response.json()
-        except (httpx.HTTPError, ValueError) as exc:
-            print(f"[FILM] Model gateway failed: {exc}")
-            return []
-        segments = data.get("segments", [])
+        segments = gateway.fetch_segments(payload) or []
         normalized = []
         for segment in segments:
             start = int(segment.get("start_second", segment.get("start", 0)))
@@ -102,34 +168,6 @@ class FilmProcessingService:
             )
         return normalized
 
-    def _probe_duration(self, path: Path) -> float | None:
-        """Use ffprobe if available to detect duration of the uploaded video."""
-        if not path.exists():
-            return None
-        try:
-            result = subprocess.run(
-                [
-                    "ffprobe",
-                    "-v",
-                    "error",
-                    "-select_streams",
-                    "v:0",
-                    "-show_entries",
-                    "format=duration",
-                    "-of",
-                    "default=noprint_wrappers=1:nokey=1",
-                    str(path),
-                ],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            return float(result.stdout.strip())
-        except FileNotFoundError:
-            return path.stat().st_size / 4_000_000 if path.stat().st_size else None
-        except (subprocess.SubprocessError, ValueError):
-            return None
-
     def _suggest_segments(self, duration: float) -> List[dict]:
         """Create evenly spaced placeholder segments."""
         if duration <= 0:
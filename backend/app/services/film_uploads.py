@@ -0,0 +1,77 @@
+import os
+from datetime import datetime
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.models.film_upload_session import FilmUploadSession
+from app.models.game import Game
+from app.models.game_upload import GameUpload
+from app.services.film_processing import FilmProcessingService
+from app.services.game_matching import find_game_for_upload
+from app.services.job_queue import JobQueue
+
+
+def resolve_upload_game(db: Session, game_id: int | None, title: str, notes: str | None) -> Game | None:
+    """Explicit game id wins; otherwise try to match the matchup from the title/notes."""
+    if game_id is None:
+        return find_game_for_upload(db, title, notes)
+    game = db.query(Game).filter(Game.id == game_id).first()
+    if not game:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Game not found")
+    return game
+
+
+def create_game_upload(
+    db: Session,
+    *,
+    team_id: int,
+    uploaded_by_id: int,
+    title: str,
+    notes: str | None,
+    game: Game | None,
+    storage_url: str,
+    content_digest: str | None = None,
+) -> GameUpload:
+    """Record a stored film file as a GameUpload and enqueue its processing job.
+
+    Film whose content was already processed for another upload copies that
+    result instead of queueing a job.
+    """
+    upload = GameUpload(
+        team_id=team_id,
+        uploaded_by_id=uploaded_by_id,
+        title=title,
+        notes=notes,
+        storage_url=storage_url,
+        content_digest=content_digest,
+        status="processing",
+        game_id=game.id if game else None,
+    )
+    db.add(upload)
+    db.flush()
+    if not FilmProcessingService(db).reuse_processed_duplicate(upload):
+        # Enqueued in the same transaction so no upload is ever left without a job.
+        JobQueue(db).enqueue_film_processing(upload.id)
+    db.commit()
+    db.refresh(upload)
+    return upload
+
+
+def purge_expired_upload_sessions(db: Session) -> int:
+    """Delete open resumable-upload sessions past their expiry, with their preallocated files."""
+    expired = (
+        db.query(FilmUploadSession)
+        .filter(FilmUploadSession.status == "open", FilmUploadSession.expires_at < datetime.utcnow())
+        .all()
+    )
+    for session in expired:
+        try:
+            if os.path.exists(session.storage_url):
+                os.remove(session.storage_url)
+        except OSError as exc:
+            print(f"[UPLOADS] Could not remove {session.storage_url}: {exc}")
+            continue
+        db.delete(session)
+    db.commit()
+    return len(expired)
@@ -1,52 +1,183 @@
-import re
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Iterable
 
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
+from app.core.text import normalize_text
+from app.db.cache_versions import GAMES_SCOPE, bump_versions, get_versions, team_scope
 from app.models.game import Game
 from app.models.game_upload import GameUpload
 
 
-def _normalize(text: str | None) -> str:
-    if not text:
-        return ""
-    normalized = re.sub(r"[^a-z0-9]+", " ", text.lower())
-    return re.sub(r"\s+", " ", normalized).strip()
-
-
 def _combined_upload_text(upload: GameUpload | None, title: str | None = None, notes: str | None = None) -> str:
     if upload is not None:
-        return _normalize(f"{upload.title} {upload.notes or ''}")
-    return _normalize(f"{title or ''} {notes or ''}")
+        return normalize_text(f"{upload.title} {upload.notes or ''}")
+    return normalize_text(f"{title or ''} {notes or ''}")
+
+
+class MatchupAutomaton:
+    """Aho-Corasick automaton over normalized matchups.
+
+    Scanning a text costs O(len(text) + matches) no matter how many matchups
+    are indexed, and reports every matchup that occurs as a substring.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[str]] = [[]]
+        for pattern in patterns:
+            self._add(pattern)
+        self._link()
+
+    def _add(self, pattern: str) -> None:
+        node = 0
+        for char in pattern:
+            child = self._goto[node].get(char)
+            if child is None:
+                child = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[node][char] = child
+            node = child
+        self._out[node].append(pattern)
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def findall(self, text: str) -> set[str]:
+        found: set[str] = set()
+        node = 0
+        for char in text:
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            found.update(self._out[node])
+        return found
+
+
+class _MatchupIndex:
+    """Process-wide automaton over every game's normalized matchup.
+
+    Rebuilt whenever the committed ``games`` cache version moves, so inserts,
+    updates and deletes from any process are picked up regardless of the
+    order in which their ids commit.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latest: dict[str, tuple[datetime, int]] = {}
+        self._version: int | None = None
+        self._automaton = MatchupAutomaton(())
+
+    def invalidate(self) -> None:
+        self._version = None
+
+    def match(self, db: Session, text: str) -> int | None:
+        with self._lock:
+            self._refresh(db)
+            automaton, latest = self._automaton, self._latest
+        matches = automaton.findall(text)
+        if not matches:
+            return None
+        # Same tie-break as scanning games newest-first: latest scheduled_at wins.
+        return max(latest[matchup] for matchup in matches)[1]
+
+    def _refresh(self, db: Session) -> None:
+        # Read the version before the games: a write committed in between
+        # bumps it past what we record, so the next call reloads again.
+        version = get_versions(db, [GAMES_SCOPE])[GAMES_SCOPE]
+        if version == self._version:
+            return
+        latest: dict[str, tuple[datetime, int]] = {}
+        for game_id, matchup, scheduled_at in db.query(Game.id, Game.normalized_matchup, Game.scheduled_at):
+            if not matchup:
+                continue
+            candidate = (scheduled_at, game_id)
+            if matchup not in latest or candidate > latest[matchup]:
+                latest[matchup] = candidate
+        self._latest = latest
+        self._automaton = MatchupAutomaton(latest)
+        self._version = version
+
+
+matchup_index = _MatchupIndex()
 
 
 def find_game_for_upload(db: Session, title: str | None, notes: str | None) -> Game | None:
     combined = _combined_upload_text(None, title=title, notes=notes)
     if not combined:
         return None
-    games = db.query(Game).order_by(Game.scheduled_at.desc()).all()
-    for game in games:
-        matchup = _normalize(game.matchup)
-        if matchup and matchup in combined:
-            return game
-    return None
+    game_id = matchup_index.match(db, combined)
+    if game_id is None:
+        return None
+    game = db.get(Game, game_id)
+    if game is None:
+        # Deleted (or rolled back) elsewhere since the index was built.
+        matchup_index.invalidate()
+    return game
 
 
 def link_uploads_to_game(db: Session, game: Game) -> int:
-    matchup = _normalize(game.matchup)
+    matchup = game.normalized_matchup or normalize_text(game.matchup)
     if not matchup:
         return 0
-    uploads = (
-        db.query(GameUpload)
+    # Normalized text is [a-z0-9 ] only, so the matchup needs no LIKE escaping.
+    unlinked = (GameUpload.game_id.is_(None), GameUpload.normalized_text.like(f"%{matchup}%"))
+    team_ids = {team_id for (team_id,) in db.query(GameUpload.team_id).filter(*unlinked).distinct()}
+    result = db.execute(
+        update(GameUpload).where(*unlinked).values(game_id=game.id).execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        # Bulk updates skip the flush hook; bump the cached upload lists ourselves.
+        bump_versions(db, *(team_scope(team_id) for team_id in team_ids))
+        db.commit()
+    return result.rowcount
+
+
+def link_uploads_to_games(db: Session, games: Iterable[Game]) -> int:
+    """Link unlinked uploads to a batch of games in a single pass over the uploads.
+
+    When an upload mentions several of the games, the earliest game in
+    ``games`` wins, as if link_uploads_to_game had been called for each in turn.
+    """
+    priority: dict[str, tuple[int, int]] = {}
+    for position, game in enumerate(games):
+        matchup = game.normalized_matchup or normalize_text(game.matchup)
+        if matchup:
+            priority.setdefault(matchup, (position, game.id))
+    if not priority:
+        return 0
+
+    automaton = MatchupAutomaton(priority)
+    assignments = []
+    team_ids = set()
+    unlinked = (
+        db.query(GameUpload.id, GameUpload.team_id, GameUpload.normalized_text)
         .filter(GameUpload.game_id.is_(None))
-        .order_by(GameUpload.uploaded_at.desc())
-        .all()
+        .execution_options(yield_per=1000)
     )
-    updated = 0
-    for upload in uploads:
-        combined = _combined_upload_text(upload)
-        if matchup in combined:
-            upload.game_id = game.id
-            updated += 1
-    if updated:
+    for upload_id, team_id, normalized in unlinked:
+        matches = automaton.findall(normalized or "")
+        if matches:
+            _, game_id = min(priority[matchup] for matchup in matches)
+            assignments.append({"id": upload_id, "game_id": game_id})
+            team_ids.add(team_id)
+    if assignments:
+        db.execute(update(GameUpload), assignments)
+        bump_versions(db, *(team_scope(team_id) for team_id in team_ids))
         db.commit()
-    return updated
+    return len(assignments)
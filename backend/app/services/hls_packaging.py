@@ -0,0 +1,238 @@
+import secrets
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.after_commit import after_commit
+from app.models.game_upload import GameUpload
+from app.services.media_probe import MediaProbeService
+from app.services.storage import get_storage, media_source
+
+HEARTBEAT_INTERVAL_SECONDS = 60
+
+
+def parse_renditions(specs: list[str]) -> list[tuple[int, int]]:
+    """``["720:2800", ...]`` -> ``[(720, 2800), ...]`` as (height, video kbps)."""
+    renditions = []
+    for spec in specs:
+        height, _, kbps = spec.partition(":")
+        renditions.append((int(height), int(kbps)))
+    return renditions
+
+
+def fit_renditions(renditions: list[tuple[int, int]], source_height: int | None) -> list[tuple[int, int]]:
+    """Drop rungs taller than the source so nothing is upscaled.
+
+    Film shorter than every rung gets a single rendition at its own height,
+    at the lowest rung's bitrate. An unknown height keeps the full ladder.
+    """
+    if not source_height:
+        return renditions
+    fitting = [rendition for rendition in renditions if rendition[0] <= source_height]
+    return fitting or [(source_height, min(renditions)[1])]
+
+
+class HlsPackagingService:
+    """Packages game film into adaptive-bitrate HLS (master playlist + renditions).
+
+    Output lives in the storage backend under ``hls/<token>/``. The token is
+    random and new on every packaging run, so everything under it is immutable
+    and can be served with long-lived cache headers without auth.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.settings = get_settings()
+        self.storage = get_storage()
+
+    @staticmethod
+    def key(token: str, path: str) -> str:
+        return f"hls/{token}/{path}"
+
+    def package_upload(self, upload_id: int, heartbeat: Callable[[], None] | None = None) -> bool:
+        """Encode and store HLS renditions for an upload. Returns False when skipped."""
+        upload = self.db.get(GameUpload, upload_id)
+        if upload is None or upload.hls_token:
+            return False
+        shared = self._duplicate_token(upload)
+        if shared:
+            # A duplicate of this film finished packaging first; share its output.
+            upload.hls_token = shared
+            self.db.commit()
+            return True
+        ffmpeg = shutil.which("ffmpeg")
+        if not ffmpeg:
+            print(f"[HLS] ffmpeg not found, skipping upload {upload_id}")
+            return False
+        source = media_source(upload.storage_url)
+        if source is None:
+            return False
+
+        info = MediaProbeService(self.db).probe(upload, source)
+        token = secrets.token_urlsafe(24)
+        with tempfile.TemporaryDirectory() as workdir:
+            self._encode(self._command(ffmpeg, source, Path(workdir), info.height if info else None), heartbeat)
+            for path in sorted(Path(workdir).rglob("*")):
+                if path.is_file():
+                    self.storage.put_file(self.key(token, path.relative_to(workdir).as_posix()), path)
+        upload.hls_token = token
+        self._link_duplicates(upload)
+        self.db.commit()
+        return True
+
+    def purge(self, upload: GameUpload) -> None:
+        """Delete an upload's HLS output, once the session commits, unless a duplicate upload still shares it."""
+        if not upload.hls_token:
+            return
+        shared = (
+            self.db.query(GameUpload.id)
+            .filter(GameUpload.hls_token == upload.hls_token, GameUpload.id != upload.id)
+            .first()
+        )
+        if shared:
+            return
+        token = upload.hls_token
+        after_commit(self.db, lambda: self._delete_output(token))
+
+    def _delete_output(self, token: str) -> None:
+        # Storage has no prefix listing; the playlists name every file.
+        for variant in self._playlist_entries(self.key(token, "master.m3u8")):
+            variant_dir = variant.rsplit("/", 1)[0] + "/" if "/" in variant else ""
+            for segment in self._playlist_entries(self.key(token, variant)):
+                self.storage.delete(self.key(token, variant_dir + segment))
+            self.storage.delete(self.key(token, variant))
+        self.storage.delete(self.key(token, "master.m3u8"))
+
+    def _duplicate_token(self, upload: GameUpload) -> str | None:
+        if not upload.content_digest:
+            return None
+        row = (
+            self.db.query(GameUpload.hls_token)
+            .filter(
+                GameUpload.content_digest == upload.content_digest,
+                GameUpload.id != upload.id,
+                GameUpload.hls_token.isnot(None),
+            )
+            .first()
+        )
+        return row.hls_token if row else None
+
+    def _link_duplicates(self, upload: GameUpload) -> None:
+        """Hand the new output to duplicates that reused this film before packaging finished."""
+        if not upload.content_digest:
+            return
+        duplicates = (
+            self.db.query(GameUpload)
+            .filter(
+                GameUpload.content_digest == upload.content_digest,
+                GameUpload.id != upload.id,
+                GameUpload.hls_token.is_(None),
+            )
+            .all()
+        )
+        for duplicate in duplicates:
+            duplicate.hls_token = upload.hls_token
+
+    def _playlist_entries(self, key: str) -> list[str]:
+        if self.storage.stat(key) is None:
+            return []
+        body = self.storage.open_range(key)
+        try:
+            text = body.read().decode("utf-8")
+        finally:
+            body.close()
+        return [line.strip() for line in text.splitlines() if line.strip() and not line.startswith("#")]
+
+    def _command(self, ffmpeg: str, source: str, workdir: Path, source_height: int | None = None) -> list[str]:
+        settings = self.settings
+        renditions = fit_renditions(parse_renditions(settings.hls_renditions), source_height)
+        count = len(renditions)
+        has_audio = self._has_audio(source)
+        split = f"[0:v]split={count}" + "".join(f"[v{index}]" for index in range(count))
+        scales = [f"[v{index}]scale=-2:{height}[v{index}out]" for index, (height, _) in enumerate(renditions)]
+        command = [ffmpeg, "-v", "error", "-i", source, "-filter_complex", ";".join([split, *scales])]
+        for index, (_, kbps) in enumerate(renditions):
+            command += [
+                "-map",
+                f"[v{index}out]",
+                f"-c:v:{index}",
+                "libx264",
+                f"-b:v:{index}",
+                f"{kbps}k",
+                f"-maxrate:v:{index}",
+                f"{int(kbps * 1.07)}k",
+                f"-bufsize:v:{index}",
+                f"{int(kbps * 1.5)}k",
+            ]
+            if has_audio:
+                command += ["-map", "0:a:0"]
+        if has_audio:
+            command += ["-c:a", "aac", "-b:a", f"{settings.hls_audio_bitrate_kbps}k", "-ac", "2"]
+        stream_map = " ".join(
+            f"v:{index},a:{index}" if has_audio else f"v:{index}" for index in range(count)
+        )
+        segment = settings.hls_segment_seconds
+        command += [
+            "-preset",
+            "veryfast",
+            # Aligned keyframes on segment boundaries so players can switch renditions cleanly.
+            "-sc_threshold",
+            "0",
+            "-force_key_frames",
+            f"expr:gte(t,n_forced*{segment})",
+            "-f",
+            "hls",
+            "-hls_time",
+            str(segment),
+            "-hls_playlist_type",
+            "vod",
+            "-hls_flags",
+            "independent_segments",
+            "-hls_segment_filename",
+            str(workdir / "v%v" / "seg_%05d.ts"),
+            "-master_pl_name",
+            "master.m3u8",
+            "-var_stream_map",
+            stream_map,
+            str(workdir / "v%v" / "index.m3u8"),
+        ]
+        return command
+
+    def _encode(self, command: list[str], heartbeat: Callable[[], None] | None) -> None:
+        process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        waited = 0
+        while True:
+            try:
+                _, stderr = process.communicate(timeout=HEARTBEAT_INTERVAL_SECONDS)
+                break
+            except subprocess.TimeoutExpired:
+                waited += HEARTBEAT_INTERVAL_SECONDS
+                if waited >= self.settings.hls_timeout_seconds:
+                    process.kill()
+                    process.communicate()
+                    raise
+                if heartbeat:
+                    heartbeat()
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, command, stderr=stderr)
+
+    def _has_audio(self, source: str) -> bool:
+        ffprobe = shutil.which("ffprobe")
+        if not ffprobe:
+            return True
+        try:
+            result = subprocess.run(
+                [ffprobe, "-v", "error", "-select_streams", "a", "-show_entries", "stream=index", "-of", "csv=p=0", source],
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=60,
+            )
+        except (subprocess.SubprocessError, OSError):
+            return True
+        return bool(result.stdout.strip())
@@ -1,71 +1,128 @@
+import codecs
 import csv
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Iterable
+from typing import BinaryIO, Iterable, Iterator
 
+from sqlalchemy import insert, select, tuple_
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
 from app.models.game import Game
 from app.models.player import Player
 from app.models.possession import Possession
 from app.models.team import Team
 from app.services.game_matching import link_uploads_to_game
+from app.services.stats import StatsService
+
+
+def iter_csv_rows(stream: BinaryIO, encoding: str = "utf-8") -> Iterator[dict]:
+    """Lazily parse CSV rows from a binary stream, one line at a time."""
+    yield from csv.DictReader(codecs.iterdecode(stream, encoding))
+
+
+def _batched(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
 
 
 class StatsIngestionService:
-    def __init__(self, db: Session):
+    """Loads play-by-play CSVs with set-based player/team resolution and bulk inserts."""
+
+    def __init__(self, db: Session, batch_size: int | None = None):
         self.db = db
+        self.batch_size = batch_size or get_settings().ingestion_batch_size
+        self._team_ids: dict[str, int] = {}
+        self._player_ids: dict[tuple[str, str], int] = {}
 
     def ingest_possession_csv(self, file_path: Path, matchup: str, scheduled_at: datetime) -> Game:
+        with file_path.open(newline="") as csvfile:
+            return self.ingest_possession_rows(csv.DictReader(csvfile), matchup, scheduled_at)
+
+    def ingest_possession_rows(self, rows: Iterable[dict], matchup: str, scheduled_at: datetime) -> Game:
         game = Game(matchup=matchup, scheduled_at=scheduled_at)
         self.db.add(game)
         self.db.flush()
 
-        with file_path.open() as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                player = self._get_or_create_player(row["player"], row["jersey"], row.get("team"))
-                start_second = self._parse_int(row.get("start_second"))
-                end_second = self._parse_int(row.get("end_second"))
-                possession = Possession(
-                    game_id=game.id,
-                    player_id=player.id,
-                    label=row["label"],
-                    outcome=row.get("outcome"),
-                    video_start_second=start_second,
-                    video_end_second=end_second,
-                )
-                self.db.add(possession)
+        for batch in _batched(rows, self.batch_size):
+            self._resolve_players(batch)
+            self.db.execute(
+                insert(Possession),
+                [
+                    {
+                        "game_id": game.id,
+                        "player_id": self._player_ids[(row["player"], row["jersey"])],
+                        "label": row["label"],
+                        "outcome": row.get("outcome"),
+                        "video_start_second": self._parse_int(row.get("start_second")),
+                        "video_end_second": self._parse_int(row.get("end_second")),
+                    }
+                    for row in batch
+                ],
+            )
+        StatsService(self.db).refresh_snapshot(game)
         self.db.commit()
         self.db.refresh(game)
         link_uploads_to_game(self.db, game)
         return game
 
-    def _get_or_create_team(self, team_name: str) -> Team:
-        team = self.db.query(Team).filter(Team.name == team_name).first()
-        if team:
-            return team
-        team = Team(name=team_name)
-        self.db.add(team)
-        self.db.flush()
-        return team
+    def _resolve_players(self, batch: list[dict]) -> None:
+        """Map every (name, jersey) in the batch to a player id, creating missing rows in bulk."""
+        team_by_key: dict[tuple[str, str], str | None] = {}
+        for row in batch:
+            key = (row["player"], row["jersey"])
+            if key not in self._player_ids:
+                team_by_key.setdefault(key, row.get("team"))
+        if not team_by_key:
+            return
 
-    def _get_or_create_player(self, name: str, jersey: str, team_name: str | None) -> Player:
-        player = (
-            self.db.query(Player)
-            .filter(Player.name == name, Player.jersey_number == jersey)
-            .first()
+        existing = self.db.execute(
+            select(Player.id, Player.name, Player.jersey_number)
+            .where(tuple_(Player.name, Player.jersey_number).in_(list(team_by_key)))
+            .order_by(Player.id)
         )
-        if player:
-            return player
-        team_id = None
-        if team_name:
-            team = self._get_or_create_team(team_name)
-            team_id = team.id
-        player = Player(name=name, jersey_number=jersey, team_id=team_id)
-        self.db.add(player)
-        self.db.flush()
-        return player
+        for player_id, name, jersey in existing:
+            self._player_ids.setdefault((name, jersey), player_id)
+
+        missing = [key for key in team_by_key if key not in self._player_ids]
+        if not missing:
+            return
+        self._resolve_teams({team_by_key[key] for key in missing if team_by_key[key]})
+        created = self.db.execute(
+            insert(Player).returning(Player.id, Player.name, Player.jersey_number),
+            [
+                {
+                    "name": name,
+                    "jersey_number": jersey,
+                    "team_id": self._team_ids[team_by_key[(name, jersey)]] if team_by_key[(name, jersey)] else None,
+                }
+                for name, jersey in missing
+            ],
+        )
+        for player_id, name, jersey in created:
+            self._player_ids[(name, jersey)] = player_id
+
+    def _resolve_teams(self, team_names: set[str]) -> None:
+        names = [name for name in team_names if name not in self._team_ids]
+        if not names:
+            return
+        existing = self.db.execute(
+            select(Team.id, Team.name).where(Team.name.in_(names)).order_by(Team.id)
+        )
+        for team_id, name in existing:
+            self._team_ids.setdefault(name, team_id)
+
+        missing = [name for name in names if name not in self._team_ids]
+        if not missing:
+            return
+        created = self.db.execute(
+            insert(Team).returning(Team.id, Team.name),
+            [{"name": name} for name in missing],
+        )
+        for team_id, name in created:
+            self._team_ids[name] = team_id
 
     @staticmethod
     def _parse_int(value: str | None) -> int | None:
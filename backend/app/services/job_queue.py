@@ -0,0 +1,141 @@
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.processing_job import ProcessingJob
+
+FILM_PROCESSING = "film_processing"
+HLS_PACKAGING = "hls_packaging"
+
+
+class JobQueue:
+    """Database-backed work queue claimed with SELECT ... FOR UPDATE SKIP LOCKED."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.settings = get_settings()
+
+    def enqueue_film_processing(self, upload_id: int) -> ProcessingJob:
+        return self.enqueue(FILM_PROCESSING, upload_id)
+
+    def enqueue_hls_packaging(self, upload_id: int) -> ProcessingJob:
+        return self.enqueue(HLS_PACKAGING, upload_id)
+
+    def enqueue(self, kind: str, upload_id: int) -> ProcessingJob:
+        """Stage a job; it becomes visible when the caller commits."""
+        job = ProcessingJob(
+            kind=kind,
+            upload_id=upload_id,
+            status="queued",
+            attempts=0,
+            max_attempts=self.settings.job_max_attempts,
+            run_after=datetime.utcnow(),
+        )
+        self.db.add(job)
+        return job
+
+    def claim(self, worker_id: str) -> ProcessingJob | None:
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=self.settings.job_visibility_timeout_seconds)
+        candidate = (
+            self.db.query(ProcessingJob.id, ProcessingJob.attempts)
+            .filter(
+                or_(
+                    and_(ProcessingJob.status == "queued", ProcessingJob.run_after <= now),
+                    # Jobs whose worker died mid-run become claimable again.
+                    and_(
+                        ProcessingJob.status == "running",
+                        ProcessingJob.locked_at < stale_before,
+                        ProcessingJob.attempts < ProcessingJob.max_attempts,
+                    ),
+                )
+            )
+            .order_by(ProcessingJob.run_after, ProcessingJob.id)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if candidate is None:
+            self.db.rollback()
+            return None
+        # Guarded on attempts so the claim stays exclusive even on databases
+        # without row locks (e.g. SQLite in local development).
+        claimed = (
+            self.db.query(ProcessingJob)
+            .filter(ProcessingJob.id == candidate.id, ProcessingJob.attempts == candidate.attempts)
+            .update(
+                {
+                    ProcessingJob.status: "running",
+                    ProcessingJob.attempts: candidate.attempts + 1,
+                    ProcessingJob.locked_by: worker_id,
+                    ProcessingJob.locked_at: now,
+                },
+                synchronize_session=False,
+            )
+        )
+        self.db.commit()
+        if not claimed:
+            return None
+        return self.db.get(ProcessingJob, candidate.id)
+
+    def fail_abandoned(self) -> int:
+        """Fail running jobs whose worker stopped heartbeating on their last attempt.
+
+        ``claim`` never hands these out again, so without this they would stay
+        "running" forever. Returns how many jobs were failed.
+        """
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=self.settings.job_visibility_timeout_seconds)
+        failed = (
+            self.db.query(ProcessingJob)
+            .filter(
+                ProcessingJob.status == "running",
+                ProcessingJob.locked_at < stale_before,
+                ProcessingJob.attempts >= ProcessingJob.max_attempts,
+            )
+            .update(
+                {
+                    ProcessingJob.status: "failed",
+                    ProcessingJob.locked_by: None,
+                    ProcessingJob.finished_at: now,
+                    ProcessingJob.last_error: "Worker stopped heartbeating on the final attempt",
+                },
+                synchronize_session=False,
+            )
+        )
+        self.db.commit()
+        return failed
+
+    def heartbeat(self, job: ProcessingJob) -> None:
+        """Push back the visibility timeout for a long-running job."""
+        job.locked_at = datetime.utcnow()
+        self.db.commit()
+
+    def complete(self, job: ProcessingJob) -> None:
+        job.status = "done"
+        job.locked_by = None
+        job.finished_at = datetime.utcnow()
+        self.db.commit()
+
+    def fail(self, job: ProcessingJob, error: str) -> None:
+        job.last_error = error
+        job.locked_by = None
+        if job.attempts >= job.max_attempts:
+            job.status = "failed"
+            job.finished_at = datetime.utcnow()
+        else:
+            # Exponential backoff with full jitter so retries don't stampede.
+            backoff = self.settings.job_retry_backoff_seconds * 2 ** (job.attempts - 1)
+            job.status = "queued"
+            job.run_after = datetime.utcnow() + timedelta(seconds=random.uniform(backoff / 2, backoff))
+        self.db.commit()
+
+    def depth(self) -> dict[str, int]:
+        rows = (
+            self.db.query(ProcessingJob.status, func.count(ProcessingJob.id))
+            .group_by(ProcessingJob.status)
+            .all()
+        )
+        return {status: count for status, count in rows}
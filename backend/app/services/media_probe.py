@@ -0,0 +1,289 @@
+import json
+import mmap
+import multiprocessing
+import os
+import shutil
+import struct
+import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from fractions import Fraction
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.game_upload import GameUpload
+from app.models.media_probe import MediaProbe
+from app.services.storage import resolve_storage_url
+
+
+@dataclass
+class MediaInfo:
+    duration: float | None = None
+    codec: str | None = None
+    width: int | None = None
+    height: int | None = None
+    fps: float | None = None
+    bit_rate: int | None = None
+    keyframes: list[float] = field(default_factory=list)
+    source: str = "ffprobe"
+
+
+def _rate(value: str | None) -> float | None:
+    try:
+        rate = Fraction(value)
+    except (TypeError, ValueError, ZeroDivisionError):
+        return None
+    return float(rate) if rate > 0 else None
+
+
+def _number(value, cast=float):
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def ffprobe_media(source: str, timeout: int) -> MediaInfo | None:
+    """Format, first video stream and keyframe times in a single ffprobe run.
+
+    Keyframes come from packet flags, so ffprobe only demuxes and never decodes.
+    """
+    ffprobe = shutil.which("ffprobe")
+    if not ffprobe:
+        return None
+    try:
+        result = subprocess.run(
+            [
+                ffprobe,
+                "-v",
+                "error",
+                "-select_streams",
+                "v:0",
+                "-show_entries",
+                "format=duration,bit_rate:stream=codec_name,width,height,avg_frame_rate,r_frame_rate:packet=pts_time,flags",
+                "-of",
+                "json",
+                source,
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=timeout,
+        )
+        data = json.loads(result.stdout)
+    except (subprocess.SubprocessError, OSError, ValueError):
+        return None
+    fmt = data.get("format", {})
+    stream = (data.get("streams") or [{}])[0]
+    keyframes = [
+        round(float(packet["pts_time"]), 3)
+        for packet in data.get("packets", [])
+        if "K" in packet.get("flags", "") and packet.get("pts_time") not in (None, "N/A")
+    ]
+    return MediaInfo(
+        duration=_number(fmt.get("duration")),
+        codec=stream.get("codec_name"),
+        width=_number(stream.get("width"), int),
+        height=_number(stream.get("height"), int),
+        fps=_rate(stream.get("avg_frame_rate")) or _rate(stream.get("r_frame_rate")),
+        bit_rate=_number(fmt.get("bit_rate"), int),
+        keyframes=sorted(keyframes),
+        source="ffprobe",
+    )
+
+
+def _atoms(buf, start: int, end: int):
+    """Yield (type, payload_start, atom_end) for the ISO-BMFF boxes in ``buf[start:end]``."""
+    offset = start
+    while offset + 8 <= end:
+        size, kind = struct.unpack_from(">I4s", buf, offset)
+        header = 8
+        if size == 1:
+            if offset + 16 > end:
+                return
+            size = struct.unpack_from(">Q", buf, offset + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - offset
+        if size < header or offset + size > end:
+            return
+        yield kind, offset + header, offset + size
+        offset += size
+
+
+def _child(buf, start: int, end: int, kind: bytes):
+    for child_kind, child_start, child_end in _atoms(buf, start, end):
+        if child_kind == kind:
+            return child_start, child_end
+    return None
+
+
+def _duration_box(buf, start: int) -> tuple[int, int]:
+    """(timescale, duration) from an ``mvhd``/``mdhd`` payload."""
+    if buf[start] == 1:
+        return struct.unpack_from(">IQ", buf, start + 20)
+    return struct.unpack_from(">II", buf, start + 12)
+
+
+def _sample_times(buf, stts: tuple[int, int]) -> list[int]:
+    """Decode time of every sample, in media timescale units, from ``stts``."""
+    start, _ = stts
+    (count,) = struct.unpack_from(">I", buf, start + 4)
+    times = []
+    current = 0
+    for index in range(count):
+        samples, delta = struct.unpack_from(">II", buf, start + 8 + index * 8)
+        for _ in range(samples):
+            times.append(current)
+            current += delta
+    return times
+
+
+def parse_mp4(path: str) -> MediaInfo | None:
+    """Read MP4/MOV metadata straight from the ``moov`` box, without ffprobe.
+
+    The file is memory-mapped so only the pages holding boxes get read, even
+    for multi-gigabyte film. Duration comes from ``mvhd``, size from the video
+    ``tkhd``, codec from ``stsd``, frame rate from ``stts`` and keyframes from
+    ``stss`` (every sample is a keyframe when it is absent).
+    """
+    try:
+        size = os.path.getsize(path)
+        if size < 8:
+            return None
+        with open(path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            moov = _child(buf, 0, size, b"moov")
+            if moov is None:
+                return None
+            mvhd = _child(buf, *moov, b"mvhd")
+            if mvhd is None:
+                return None
+            timescale, duration = _duration_box(buf, mvhd[0])
+            info = MediaInfo(duration=duration / timescale if timescale else None, source="mp4")
+            if info.duration:
+                info.bit_rate = int(size * 8 / info.duration)
+            for kind, trak_start, trak_end in _atoms(buf, *moov):
+                if kind != b"trak":
+                    continue
+                mdia = _child(buf, trak_start, trak_end, b"mdia")
+                hdlr = mdia and _child(buf, *mdia, b"hdlr")
+                if not hdlr or buf[hdlr[0] + 8 : hdlr[0] + 12] != b"vide":
+                    continue
+                tkhd = _child(buf, trak_start, trak_end, b"tkhd")
+                if tkhd:
+                    dims = tkhd[1] - 8
+                    width, height = struct.unpack_from(">II", buf, dims)
+                    info.width, info.height = width >> 16, height >> 16
+                mdhd = _child(buf, *mdia, b"mdhd")
+                media_scale, media_duration = _duration_box(buf, mdhd[0]) if mdhd else (0, 0)
+                minf = _child(buf, *mdia, b"minf")
+                stbl = minf and _child(buf, *minf, b"stbl")
+                if not stbl:
+                    break
+                stsd = _child(buf, *stbl, b"stsd")
+                if stsd:
+                    info.codec = bytes(buf[stsd[0] + 12 : stsd[0] + 16]).decode("latin-1").strip()
+                stts = _child(buf, *stbl, b"stts")
+                if stts and media_scale:
+                    times = _sample_times(buf, stts)
+                    if media_duration and times:
+                        info.fps = round(len(times) * media_scale / media_duration, 3)
+                    stss = _child(buf, *stbl, b"stss")
+                    if stss:
+                        (count,) = struct.unpack_from(">I", buf, stss[0] + 4)
+                        numbers = struct.unpack_from(f">{count}I", buf, stss[0] + 8)
+                        sync = [times[number - 1] for number in numbers if 0 < number <= len(times)]
+                    else:
+                        sync = times
+                    info.keyframes = [round(value / media_scale, 3) for value in sync]
+                break
+            return info
+    except (OSError, ValueError, struct.error, TypeError, IndexError):
+        return None
+
+
+def probe_media(source: str, timeout: int) -> MediaInfo | None:
+    """ffprobe first; local MP4/MOV files fall back to the container parser."""
+    info = ffprobe_media(source, timeout)
+    if info is None and os.path.exists(source):
+        info = parse_mp4(source)
+    return info
+
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _probe_pool() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn, not fork: the worker process is multi-threaded.
+            _executor = ProcessPoolExecutor(
+                max_workers=get_settings().probe_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def shutdown_probe_pool() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+class MediaProbeService:
+    """Probes uploads in a bounded process pool and caches results in ``media_probe``.
+
+    The cache key is the content digest (or storage URL for rows without one)
+    plus the object's mtime, so reprocessing unchanged film never re-probes.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.settings = get_settings()
+
+    def cache_key(self, upload: GameUpload) -> str | None:
+        backend, key = resolve_storage_url(upload.storage_url)
+        stored = backend.stat(key)
+        if stored is None:
+            return None
+        return f"{upload.content_digest or upload.storage_url}:{int(stored.modified * 1_000_000)}"
+
+    def probe(self, upload: GameUpload, source: str) -> MediaInfo | None:
+        return self.probe_many([(upload, source)])[0]
+
+    def probe_many(self, items: list[tuple[GameUpload, str]]) -> list[MediaInfo | None]:
+        """Probe several uploads in parallel, serving cached results where possible."""
+        keys = [self.cache_key(upload) for upload, _ in items]
+        cached = {
+            row.cache_key: row
+            for row in self.db.query(MediaProbe).filter(MediaProbe.cache_key.in_([key for key in keys if key]))
+        }
+        results: list[MediaInfo | None] = [None] * len(items)
+        futures = {}
+        for index, ((_, source), key) in enumerate(zip(items, keys)):
+            if key in cached:
+                results[index] = MediaInfo(**cached[key].info)
+            else:
+                futures[index] = _probe_pool().submit(probe_media, source, self.settings.probe_timeout_seconds)
+        for index, future in futures.items():
+            info = future.result()
+            results[index] = info
+            if info is not None and keys[index]:
+                self._store(keys[index], info)
+        return results
+
+    def _store(self, key: str, info: MediaInfo) -> None:
+        savepoint = self.db.begin_nested()
+        try:
+            self.db.add(MediaProbe(cache_key=key, info=asdict(info)))
+            savepoint.commit()
+        except IntegrityError:
+            # Another worker probed the same file first.
+            savepoint.rollback()
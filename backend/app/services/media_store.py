@@ -0,0 +1,124 @@
+import hashlib
+from pathlib import Path
+from typing import BinaryIO
+from uuid import uuid4
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.after_commit import after_commit
+from app.models.media_blob import MediaBlob
+from app.services.storage import get_storage, resolve_storage_url
+
+
+class MediaStore:
+    """Content-addressed file store for film and clip uploads.
+
+    Files are hashed while they are staged locally, then handed to the storage
+    backend once per SHA-256 digest under the key ``<digest><suffix>``. Every
+    upload or clip that points at a blob holds one reference; ``release``
+    removes the file when the last reference goes. Nothing here commits, so
+    the reference change lands in the same transaction as the row that owns
+    it; file deletions wait until that transaction commits.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.settings = get_settings()
+        self.storage = get_storage()
+        self.incoming = Path(self.settings.media_root) / "incoming"
+        self.incoming.mkdir(parents=True, exist_ok=True)
+
+    def store_stream(self, stream: BinaryIO, suffix: str) -> MediaBlob:
+        """Copy ``stream`` into the store, hashing as it goes, and take a reference.
+
+        This blocks on disk and database I/O, which is why the upload routes
+        calling it are plain ``def``: FastAPI runs them in its threadpool.
+        """
+        partial = self.incoming / uuid4().hex
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with partial.open("wb") as buffer:
+                while True:
+                    chunk = stream.read(self.settings.upload_chunk_size)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    buffer.write(chunk)
+                    size += len(chunk)
+            return self._acquire(partial, digest.hexdigest(), size, suffix)
+        finally:
+            if partial.exists():
+                partial.unlink()
+
+    def store_file(self, path: Path, suffix: str) -> MediaBlob:
+        """Copy an already assembled file (e.g. a resumable upload) into the store.
+
+        ``path`` is only removed once the caller's transaction commits, so a
+        completion that fails can be retried against the same file.
+        """
+        digest = hashlib.sha256()
+        with path.open("rb") as source:
+            while True:
+                chunk = source.read(self.settings.upload_chunk_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+        blob = self._acquire(path, digest.hexdigest(), path.stat().st_size, suffix, keep_source=True)
+        after_commit(self.db, lambda: path.unlink(missing_ok=True))
+        return blob
+
+    def release(self, digest: str) -> None:
+        """Drop one reference; delete the blob and, after commit, its file once nothing points at it."""
+        self.db.query(MediaBlob).filter(MediaBlob.digest == digest).update(
+            {MediaBlob.ref_count: MediaBlob.ref_count - 1}, synchronize_session=False
+        )
+        blob = self.db.get(MediaBlob, digest, populate_existing=True)
+        if blob is None or blob.ref_count > 0:
+            return
+        backend, key = resolve_storage_url(blob.storage_url)
+        self.db.delete(blob)
+        self.db.flush()
+        after_commit(self.db, lambda: backend.delete(key))
+
+    def _acquire(self, source: Path, digest: str, size: int, suffix: str, keep_source: bool = False) -> MediaBlob:
+        blob = self.db.get(MediaBlob, digest)
+        if blob is None or not self._exists(blob):
+            key = f"{digest}{suffix}"
+            url = self.storage.url_for(key)
+            if keep_source:
+                with source.open("rb") as stream:
+                    self.storage.write_stream(key, stream)
+            else:
+                self.storage.put_file(key, source)
+            if blob is None:
+                blob = self._insert(digest, url, size)
+                if blob.storage_url != url:
+                    # Lost the race to the same content under another suffix; our copy is unreferenced.
+                    self.storage.delete(key)
+            else:
+                blob.storage_url = url
+        # Atomic increment so concurrent uploads of the same content don't lose a reference.
+        self.db.query(MediaBlob).filter(MediaBlob.digest == digest).update(
+            {MediaBlob.ref_count: MediaBlob.ref_count + 1}, synchronize_session=False
+        )
+        self.db.refresh(blob)
+        return blob
+
+    def _exists(self, blob: MediaBlob) -> bool:
+        backend, key = resolve_storage_url(blob.storage_url)
+        return backend.stat(key) is not None
+
+    def _insert(self, digest: str, storage_url: str, size: int) -> MediaBlob:
+        blob = MediaBlob(digest=digest, storage_url=storage_url, size=size, ref_count=0)
+        savepoint = self.db.begin_nested()
+        try:
+            self.db.add(blob)
+            savepoint.commit()
+        except IntegrityError:
+            # Another request stored the same content first; share its row.
+            savepoint.rollback()
+            return self.db.get(MediaBlob, digest)
+        return blob
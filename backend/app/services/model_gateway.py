@@ -0,0 +1,304 @@
+import asyncio
+import concurrent.futures
+import random
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+
+import httpx
+
+from app.core.config import get_settings
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class CircuitBreaker:
+    """Stops calling the gateway after repeated failures, then probes it again.
+
+    Opens after ``threshold`` consecutive failed calls; after ``reset_seconds``
+    a single trial call is let through (half-open) and its outcome closes or
+    re-opens the breaker.
+    """
+
+    def __init__(self, threshold: int, reset_seconds: float):
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.trial_in_flight or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self.trial_in_flight = False
+
+
+class GatewayMetrics:
+    def __init__(self, window: int = 1000):
+        self.calls = 0
+        self.requests = 0
+        self.successes = 0
+        self.failures = 0
+        self.retries = 0
+        self.short_circuited = 0
+        self.fallbacks = 0
+        self.latencies: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def observe_latency(self, seconds: float) -> None:
+        with self._lock:
+            self.latencies.append(seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            latencies = sorted(self.latencies)
+
+            def percentile(fraction: float) -> float | None:
+                if not latencies:
+                    return None
+                return round(latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000, 1)
+
+            return {
+                "calls": self.calls,
+                "requests": self.requests,
+                "successes": self.successes,
+                "failures": self.failures,
+                "retries": self.retries,
+                "short_circuited": self.short_circuited,
+                "fallbacks": self.fallbacks,
+                "fallback_rate": round(self.fallbacks / self.calls, 4) if self.calls else 0.0,
+                "latency_ms_p50": percentile(0.50),
+                "latency_ms_p95": percentile(0.95),
+                "latency_ms_p99": percentile(0.99),
+            }
+
+
+class ModelGatewayClient:
+    """Shared, pooled client for the segment model gateway.
+
+    Requests run on one background event loop with a single
+    ``httpx.AsyncClient``, so every worker thread shares its connection pool.
+    Concurrency is bounded by a semaphore, transient errors (timeouts,
+    connection errors, 429/5xx) are retried with full-jitter backoff, and a
+    circuit breaker fails fast while the gateway is down. With ``batch_size``
+    above 1, uploads arriving within ``batch_window`` seconds go out in one
+    ``{"batch": [...]}`` request.
+
+    ``fetch_segments`` returns None whenever the caller should fall back.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        token: str | None = None,
+        *,
+        timeout: float = 20.0,
+        max_concurrency: int = 8,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        breaker: CircuitBreaker | None = None,
+        batch_size: int = 1,
+        batch_window: float = 0.05,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.url = url
+        self.token = token
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker(5, 30.0)
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.transport = transport
+        # Every attempt and backoff of one request, plus as long again queued behind the semaphore.
+        self.call_timeout = 2 * (timeout * (max_retries + 1) + backoff * 2**max_retries) + batch_window
+        self.metrics = GatewayMetrics()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+        self._pending: list[tuple[dict, asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    def fetch_segments(self, payload: dict) -> list[dict] | None:
+        """Blocking entry point for worker threads."""
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(self.fetch_segments_async(payload), loop)
+        try:
+            return future.result(timeout=self.call_timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            self.metrics.increment("fallbacks")
+            print(f"[GATEWAY] Model gateway call timed out after {self.call_timeout:.0f}s")
+            return None
+
+    async def fetch_segments_async(self, payload: dict) -> list[dict] | None:
+        self.metrics.increment("calls")
+        if self.batch_size > 1:
+            future = asyncio.get_running_loop().create_future()
+            self._pending.append((payload, future))
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+            segments = await future
+        else:
+            data = await self._post(payload)
+            segments = data.get("segments") if isinstance(data, dict) else None
+        if segments is None:
+            self.metrics.increment("fallbacks")
+        return segments
+
+    def close(self) -> None:
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._client.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="model-gateway", daemon=True).start()
+                asyncio.run_coroutine_threadsafe(self._setup(), loop).result()
+                self._loop = loop
+            return self._loop
+
+    async def _setup(self) -> None:
+        headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
+        self._client = httpx.AsyncClient(
+            headers=headers,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency),
+            transport=self.transport,
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending[: self.batch_size], self._pending[self.batch_size:]
+        if self._pending:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+        if batch:
+            asyncio.ensure_future(self._send_batch(batch))
+
+    async def _send_batch(self, batch: list[tuple[dict, asyncio.Future]]) -> None:
+        results = None
+        try:
+            data = await self._post({"batch": [payload for payload, _ in batch]})
+            results = data.get("results") if isinstance(data, dict) else None
+        except Exception as exc:
+            # Nobody awaits this task; log instead of leaving an unretrieved exception.
+            self.metrics.increment("failures")
+            print(f"[GATEWAY] Model gateway batch failed: {exc!r}")
+        finally:
+            # Resolve every waiter, even if the request blew up, so no worker hangs.
+            if not isinstance(results, list) or len(results) != len(batch):
+                results = [None] * len(batch)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result.get("segments") if isinstance(result, dict) else None)
+
+    async def _post(self, body: dict) -> dict | None:
+        if not self.breaker.allow():
+            self.metrics.increment("short_circuited")
+            return None
+        self.metrics.increment("requests")
+        # Only transport errors and 5xx say the gateway is unhealthy; a 4xx or a
+        # bad payload is a reply from a live gateway and leaves the breaker closed.
+        gateway_down = True
+        try:
+            async with self._semaphore:
+                for attempt in range(self.max_retries + 1):
+                    if attempt:
+                        self.metrics.increment("retries")
+                        await asyncio.sleep(random.uniform(0, self.backoff * 2 ** (attempt - 1)))
+                    started = time.perf_counter()
+                    try:
+                        response = await self._client.post(self.url, json=body)
+                    except httpx.HTTPError as exc:
+                        error = repr(exc)
+                        gateway_down = True
+                        continue
+                    finally:
+                        self.metrics.observe_latency(time.perf_counter() - started)
+                    gateway_down = response.status_code >= 500
+                    if response.status_code in RETRYABLE_STATUS:
+                        error = f"HTTP {response.status_code}"
+                        continue
+                    try:
+                        response.raise_for_status()
+                        data = response.json()
+                    except (httpx.HTTPError, ValueError) as exc:
+                        # Client errors and bad payloads won't improve with a retry.
+                        error = repr(exc)
+                        break
+                    self.metrics.increment("successes")
+                    return data
+        finally:
+            # Runs on every exit, including cancellation and unexpected errors,
+            # so a half-open trial is always settled.
+            if gateway_down:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+        self.metrics.increment("failures")
+        print(f"[GATEWAY] Model gateway failed: {error}")
+        return None
+
+
+@lru_cache
+def get_model_gateway() -> ModelGatewayClient | None:
+    """Process-wide gateway client, or None when ``MODEL_GATEWAY_URL`` is unset."""
+    settings = get_settings()
+    if not settings.model_gateway_url:
+        return None
+    return ModelGatewayClient(
+        settings.model_gateway_url,
+        settings.model_gateway_token,
+        timeout=settings.model_gateway_timeout_seconds,
+        max_concurrency=settings.model_gateway_max_concurrency,
+        max_retries=settings.model_gateway_max_retries,
+        backoff=settings.model_gateway_backoff_seconds,
+        breaker=CircuitBreaker(
+            settings.model_gateway_breaker_threshold,
+            settings.model_gateway_breaker_reset_seconds,
+        ),
+        batch_size=settings.model_gateway_batch_size,
+        batch_window=settings.model_gateway_batch_window_ms / 1000,
+    )
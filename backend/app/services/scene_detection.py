@@ -0,0 +1,197 @@
+import shutil
+import subprocess
+import threading
+import time
+from typing import Callable, Iterable, Iterator, List
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.core.config import get_settings
+
+EPSILON = 1e-3
+HEARTBEAT_INTERVAL_SECONDS = 60
+
+
+def frame_difference_signal(blocks: Iterable[np.ndarray]) -> np.ndarray:
+    """Mean absolute difference between consecutive frames, one value per frame pair.
+
+    ``blocks`` yields ``(frames, height, width)`` uint8 arrays; only one block
+    plus the previous block's last frame is held at a time.
+    """
+    parts = []
+    previous = None
+    for block in blocks:
+        if len(block) == 0:
+            continue
+        frames = block.astype(np.int16)
+        if previous is not None:
+            frames = np.concatenate([previous[None], frames])
+        if len(frames) > 1:
+            parts.append(np.abs(np.diff(frames, axis=0)).mean(axis=(1, 2), dtype=np.float32))
+        previous = frames[-1]
+    return np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+
+
+def _runs(mask: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Start and end (exclusive) indices of the True runs in ``mask``."""
+    edges = np.diff(np.concatenate([[0], mask.astype(np.int8), [0]]))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def detect_boundaries(
+    signal: np.ndarray,
+    fps: float,
+    cut_ratio: float = 4.0,
+    min_cut: float = 6.0,
+    still_ratio: float = 0.35,
+    dead_ball_seconds: float = 3.0,
+    window_seconds: float = 10.0,
+) -> np.ndarray:
+    """Times (seconds) where play likely breaks: hard cuts and the end of dead-ball stretches.
+
+    A cut is a difference spike well above the local (rolling median) motion
+    level. A dead ball is a stretch of near-still frames at least
+    ``dead_ball_seconds`` long; the boundary is where motion resumes.
+    """
+    if len(signal) == 0:
+        return np.zeros(0)
+    window = max(3, int(window_seconds * fps)) | 1
+    padded = np.pad(signal, window // 2, mode="edge")
+    baseline = np.median(sliding_window_view(padded, window), axis=1)
+    cuts = np.flatnonzero((signal > cut_ratio * (baseline + EPSILON)) & (signal > min_cut)) + 1
+
+    still = signal < still_ratio * (float(np.median(signal)) + EPSILON)
+    starts, ends = _runs(still)
+    long_enough = (ends - starts) >= dead_ball_seconds * fps
+    resumes = ends[long_enough] + 1
+
+    return np.unique(np.concatenate([cuts, resumes])) / fps
+
+
+def segments_from_boundaries(
+    boundaries: Iterable[float],
+    duration: float,
+    min_seconds: float,
+    max_seconds: float,
+) -> List[dict]:
+    """Turn boundary times into segments no shorter than ``min_seconds`` and no longer than ``max_seconds``."""
+    edges = [0.0]
+    for boundary in boundaries:
+        if boundary - edges[-1] >= min_seconds and duration - boundary >= min_seconds:
+            edges.append(float(boundary))
+    edges.append(float(duration))
+
+    segments = []
+    for start, end in zip(edges, edges[1:]):
+        # Long stretches without a break (e.g. a half-court set) get split evenly.
+        pieces = max(1, int(-(-(end - start) // max_seconds)))
+        step = (end - start) / pieces
+        for piece in range(pieces):
+            piece_start = int(start + piece * step)
+            piece_end = int(end if piece == pieces - 1 else start + (piece + 1) * step)
+            if piece_end - piece_start >= 2:
+                segments.append({"start": piece_start, "end": piece_end})
+    for index, segment in enumerate(segments, start=1):
+        segment["label"] = f"Suggested segment {index}"
+        segment["notes"] = "Auto-detected from scene changes."
+    return segments
+
+
+class SceneDetector:
+    """Suggests possession-like segments from scene cuts and dead-ball pauses.
+
+    ffmpeg decodes the film (multi-threaded, deblocking skipped) to tiny
+    grayscale frames at ``scene_analysis_fps`` and pipes them here; NumPy
+    reduces each block of frames to a difference signal. Memory stays bounded
+    by ``scene_block_frames`` no matter how long the film is.
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+
+    @property
+    def available(self) -> bool:
+        return shutil.which("ffmpeg") is not None
+
+    def suggest_segments(
+        self, source: str, duration: float, heartbeat: Callable[[], None] | None = None
+    ) -> List[dict] | None:
+        """Segments for the film at ``source``, or None when detection isn't possible.
+
+        ``heartbeat`` is called about once a minute while frames are decoded.
+        """
+        if not self.available or duration <= 0:
+            return None
+        settings = self.settings
+        try:
+            signal = frame_difference_signal(self._frame_blocks(source, heartbeat))
+        except (subprocess.SubprocessError, OSError) as exc:
+            print(f"[FILM] Scene detection failed: {exc}")
+            return None
+        if len(signal) < 2:
+            return None
+        boundaries = detect_boundaries(
+            signal,
+            settings.scene_analysis_fps,
+            cut_ratio=settings.scene_cut_ratio,
+            dead_ball_seconds=settings.scene_dead_ball_seconds,
+        )
+        return segments_from_boundaries(
+            boundaries,
+            duration,
+            settings.scene_min_segment_seconds,
+            settings.scene_max_segment_seconds,
+        )
+
+    def _frame_blocks(self, source: str, heartbeat: Callable[[], None] | None = None) -> Iterator[np.ndarray]:
+        settings = self.settings
+        width, height = settings.scene_frame_width, settings.scene_frame_height
+        frame_bytes = width * height
+        command = [
+            shutil.which("ffmpeg"),
+            "-v",
+            "error",
+            "-threads",
+            "0",
+            "-skip_loop_filter",
+            "all",
+            "-i",
+            source,
+            "-an",
+            "-sn",
+            "-vf",
+            f"fps={settings.scene_analysis_fps},scale={width}:{height}:flags=area,format=gray",
+            "-f",
+            "rawvideo",
+            "-pix_fmt",
+            "gray",
+            "-",
+        ]
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        # Reads block while ffmpeg decodes, so the deadline is enforced by
+        # killing it from a timer; the read then sees EOF.
+        watchdog = threading.Timer(settings.scene_timeout_seconds, process.kill)
+        watchdog.start()
+        last_beat = time.monotonic()
+        try:
+            while True:
+                data = process.stdout.read(frame_bytes * settings.scene_block_frames)
+                frames = len(data) // frame_bytes
+                if frames:
+                    yield np.frombuffer(data[: frames * frame_bytes], dtype=np.uint8).reshape(frames, height, width)
+                if len(data) < frame_bytes * settings.scene_block_frames:
+                    break
+                if heartbeat and time.monotonic() - last_beat >= HEARTBEAT_INTERVAL_SECONDS:
+                    heartbeat()
+                    last_beat = time.monotonic()
+            returncode = process.wait()
+            if not watchdog.is_alive():
+                raise subprocess.TimeoutExpired(command, settings.scene_timeout_seconds)
+            if returncode != 0:
+                raise subprocess.CalledProcessError(returncode, command)
+        finally:
+            watchdog.cancel()
+            if process.poll() is None:
+                process.kill()
+                process.wait()
@@ -1,48 +1,92 @@
-from collections import Counter
+from datetime import datetime
+from typing import Iterable
 
 from fastapi import Depends, HTTPException
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db_session
 from app.models.game import Game
+from app.models.game_stats_snapshot import GameStatsSnapshot
+from app.models.player import Player
 from app.models.possession import Possession
+from app.models.team import Team
 from app.schemas.stats import GameStats, GameSummary, PlayerInsight, PossessionSplit
 
 
 class StatsService:
+    """Serves per-game stats from materialized snapshots, computing them on a miss."""
+
     def __init__(self, db: Session):
         self.db = db
 
     def get_stats(self, matchup: str | None = None) -> GameStats:
-        query = self.db.query(Game).order_by(Game.scheduled_at.desc())
+        query = (
+            self.db.query(Game, GameStatsSnapshot.payload)
+            .outerjoin(GameStatsSnapshot, GameStatsSnapshot.game_id == Game.id)
+            .order_by(Game.scheduled_at.desc())
+        )
         if matchup:
             query = query.filter(Game.matchup == matchup)
-        game = query.first()
-        if not game:
+        row = query.first()
+        if not row:
             raise HTTPException(status_code=404, detail="Game not found")
+        game, payload = row
+        if payload is not None:
+            return GameStats.model_validate(payload)
+        return self.compute_stats(game)
+
+    def refresh_snapshot(self, game: Game) -> GameStats:
+        """Recompute a game's stats and stage the snapshot; the caller commits."""
+        stats = self.compute_stats(game)
+        self.db.merge(
+            GameStatsSnapshot(
+                game_id=game.id,
+                payload=stats.model_dump(mode="json"),
+                refreshed_at=datetime.utcnow(),
+            )
+        )
+        return stats
+
+    def rebuild_snapshots(self, game_ids: Iterable[int] | None = None) -> int:
+        query = self.db.query(Game).order_by(Game.id)
+        if game_ids is not None:
+            query = query.filter(Game.id.in_(list(game_ids)))
+        rebuilt = 0
+        for game in query.all():
+            self.refresh_snapshot(game)
+            self.db.commit()
+            rebuilt += 1
+        return rebuilt
 
-        possessions = (
-            self.db.query(Possession)
+    def compute_stats(self, game: Game) -> GameStats:
+        # Ordering by first possession keeps Counter-style first-appearance order.
+        team_name = func.coalesce(Team.name, "Unassigned")
+        team_counts = (
+            self.db.query(team_name, func.count(Possession.id))
+            .select_from(Possession)
+            .outerjoin(Player, Possession.player_id == Player.id)
+            .outerjoin(Team, Player.team_id == Team.id)
             .filter(Possession.game_id == game.id)
+            .group_by(team_name)
+            .order_by(func.min(Possession.id))
             .all()
         )
-        total_possessions = len(possessions) or 1
-
-        team_counts: Counter[str] = Counter()
-        player_counts: Counter[str] = Counter()
-        for poss in possessions:
-            team_name = (
-                poss.player.team.name
-                if poss.player and poss.player.team
-                else "Unassigned"
-            )
-            team_counts[team_name] += 1
-            if poss.player:
-                player_counts[poss.player.name] += 1
+        touches = func.count(Possession.id)
+        player_counts = (
+            self.db.query(Player.name, touches)
+            .join(Possession, Possession.player_id == Player.id)
+            .filter(Possession.game_id == game.id)
+            .group_by(Player.name)
+            .order_by(touches.desc(), func.min(Possession.id))
+            .limit(4)
+            .all()
+        )
+        total_possessions = sum(count for _, count in team_counts) or 1
 
         possession_split = [
             PossessionSplit(team=team, percentage=int(count / total_possessions * 100))
-            for team, count in team_counts.items()
+            for team, count in team_counts
         ] or [PossessionSplit(team="Unassigned", percentage=100)]
 
         insights = [
@@ -51,7 +95,7 @@ class StatsService:
                 label="High usage",
                 detail=f"Involved in {count} possessions",
             )
-            for name, count in player_counts.most_common(4)
+            for name, count in player_counts
         ]
 
         summary = GameSummary(
@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO
+from uuid import uuid4
+
+try:
+    import boto3
+    from botocore.client import Config as BotoConfig
+    from botocore.exceptions import BotoCoreError, ClientError
+except ImportError:
+    boto3 = None
+    BotoConfig = None
+    BotoCoreError = ClientError = Exception
+
+from app.core.config import get_settings
+
+S3_SCHEME = "s3://"
+
+
+@dataclass
+class StoredObject:
+    size: int
+    modified: float
+    etag: str
+
+
+class StorageBackend(ABC):
+    """Where media bytes live.
+
+    Objects are addressed by a relative ``key``. The value persisted in
+    ``storage_url`` columns comes from ``url_for`` and is turned back into a
+    backend and key with ``resolve_storage_url``.
+    """
+
+    @abstractmethod
+    def url_for(self, key: str) -> str:
+        """Value persisted in ``storage_url`` columns for ``key``."""
+
+    @abstractmethod
+    def write_stream(self, key: str, stream: BinaryIO) -> int:
+        """Store everything read from ``stream`` under ``key``; returns the byte count."""
+
+    def put_file(self, key: str, path: Path) -> None:
+        """Move a finished local file into the store. ``path`` is consumed."""
+        with path.open("rb") as source:
+            self.write_stream(key, source)
+        path.unlink()
+
+    @abstractmethod
+    def open_range(self, key: str, start: int = 0, length: int | None = None) -> BinaryIO:
+        """Readable file-like object over ``[start, start + length)``."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove ``key``; a missing object is not an error."""
+
+    @abstractmethod
+    def stat(self, key: str) -> StoredObject | None:
+        """Size, mtime and ETag of ``key``, or None when it does not exist."""
+
+    def presigned_url(self, key: str, expires_in: int | None = None) -> str | None:
+        """Time-limited URL a client or ffmpeg can fetch directly, if the backend has one."""
+        return None
+
+    def local_path(self, key: str) -> Path | None:
+        """Path on this node's filesystem, or None when the object is remote."""
+        return None
+
+
+class _BoundedReader:
+    def __init__(self, raw: BinaryIO, remaining: int | None):
+        self.raw = raw
+        self.remaining = remaining
+
+    def read(self, size: int = -1) -> bytes:
+        if self.remaining is not None:
+            if self.remaining <= 0:
+                return b""
+            size = self.remaining if size < 0 else min(size, self.remaining)
+        data = self.raw.read(size)
+        if self.remaining is not None:
+            self.remaining -= len(data)
+        return data
+
+    def close(self) -> None:
+        self.raw.close()
+
+
+class LocalStorage(StorageBackend):
+    """Files under ``root``, spread over ``ab/cd/`` shard directories.
+
+    The shard comes from a hash of the key so no directory grows past a few
+    thousand entries. Absolute paths (rows written before this backend existed)
+    are accepted as keys and used as-is.
+    """
+
+    def __init__(self, root: Path):
+        # Resolved so ``url_for`` persists absolute paths even when MEDIA_ROOT
+        # is relative; a relative one would be sharded again as a new key.
+        self.root = root.resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, key: str) -> Path:
+        if os.path.isabs(key):
+            return Path(key)
+        shard = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self.root / shard[:2] / shard[2:4] / key
+
+    def url_for(self, key: str) -> str:
+        return str(self.path_for(key))
+
+    def write_stream(self, key: str, stream: BinaryIO) -> int:
+        target = self.path_for(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(f".{uuid4().hex}.part")
+        size = 0
+        try:
+            with partial.open("wb") as buffer:
+                while True:
+                    chunk = stream.read(get_settings().upload_chunk_size)
+                    if not chunk:
+                        break
+                    buffer.write(chunk)
+                    size += len(chunk)
+            os.replace(partial, target)
+        finally:
+            partial.unlink(missing_ok=True)
+        return size
+
+    def put_file(self, key: str, path: Path) -> None:
+        target = self.path_for(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.replace(path, target)
+        except OSError:
+            # Different filesystem: fall back to a copy.
+            shutil.move(str(path), str(target))
+
+    def open_range(self, key: str, start: int = 0, length: int | None = None) -> BinaryIO:
+        handle = self.path_for(key).open("rb")
+        handle.seek(start)
+        return _BoundedReader(handle, length)
+
+    def delete(self, key: str) -> None:
+        try:
+            self.path_for(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def stat(self, key: str) -> StoredObject | None:
+        try:
+            result = os.stat(self.path_for(key))
+        except OSError:
+            return None
+        return StoredObject(
+            size=result.st_size,
+            modified=result.st_mtime,
+            etag=f'"{result.st_mtime_ns:x}-{result.st_size:x}"',
+        )
+
+    def local_path(self, key: str) -> Path | None:
+        return self.path_for(key)
+
+
+class S3Storage(StorageBackend):
+    """Objects in an S3-compatible bucket (AWS S3, MinIO, R2, ...)."""
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: str | None = None,
+        region: str | None = None,
+        access_key_id: str | None = None,
+        secret_access_key: str | None = None,
+    ):
+        if boto3 is None:
+            raise RuntimeError("boto3 is required for the s3 storage backend")
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+            config=BotoConfig(signature_version="s3v4"),
+        )
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def url_for(self, key: str) -> str:
+        return f"{S3_SCHEME}{self.bucket}/{self._object_key(key)}"
+
+    def write_stream(self, key: str, stream: BinaryIO) -> int:
+        counter = _CountingReader(stream)
+        # upload_fileobj switches to multipart for large bodies on its own.
+        self.client.upload_fileobj(counter, self.bucket, self._object_key(key))
+        return counter.count
+
+    def put_file(self, key: str, path: Path) -> None:
+        self.client.upload_file(str(path), self.bucket, self._object_key(key))
+        path.unlink()
+
+    def open_range(self, key: str, start: int = 0, length: int | None = None) -> BinaryIO:
+        params = {"Bucket": self.bucket, "Key": self._object_key(key)}
+        if start or length is not None:
+            end = "" if length is None else str(start + length - 1)
+            params["Range"] = f"bytes={start}-{end}"
+        return self.client.get_object(**params)["Body"]
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+
+    def stat(self, key: str) -> StoredObject | None:
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return StoredObject(
+            size=head["ContentLength"],
+            modified=head["LastModified"].timestamp(),
+            etag=head["ETag"],
+        )
+
+    def presigned_url(self, key: str, expires_in: int | None = None) -> str | None:
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": self._object_key(key)},
+            ExpiresIn=expires_in or get_settings().storage_presign_ttl_seconds,
+        )
+
+
+class _CountingReader:
+    def __init__(self, raw: BinaryIO):
+        self.raw = raw
+        self.count = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.raw.read(size)
+        self.count += len(data)
+        return data
+
+
+@lru_cache
+def get_storage() -> StorageBackend:
+    """The backend new media is written to, picked by ``Settings.storage_backend``."""
+    settings = get_settings()
+    if settings.storage_backend == "s3":
+        if not settings.storage_s3_bucket:
+            raise RuntimeError("STORAGE_S3_BUCKET must be set when STORAGE_BACKEND=s3")
+        return _s3_storage(settings.storage_s3_bucket, settings.storage_s3_prefix)
+    if settings.storage_backend != "local":
+        raise RuntimeError(f"Unknown storage backend: {settings.storage_backend}")
+    return LocalStorage(Path(settings.media_root) / "objects")
+
+
+@lru_cache
+def _s3_storage(bucket: str, prefix: str = "") -> S3Storage:
+    settings = get_settings()
+    return S3Storage(
+        bucket,
+        prefix=prefix,
+        endpoint_url=settings.storage_s3_endpoint_url,
+        region=settings.aws_region,
+        access_key_id=settings.aws_access_key_id,
+        secret_access_key=settings.aws_secret_access_key,
+    )
+
+
+def resolve_storage_url(storage_url: str) -> tuple[StorageBackend, str]:
+    """Backend and key for a persisted ``storage_url``, whichever backend wrote it.
+
+    ``s3://bucket/key`` goes to S3; anything else is a local path, which covers
+    rows written before the storage abstraction existed.
+    """
+    if storage_url.startswith(S3_SCHEME):
+        bucket, _, key = storage_url[len(S3_SCHEME):].partition("/")
+        return _s3_storage(bucket), key
+    backend = get_storage()
+    if not isinstance(backend, LocalStorage):
+        backend = LocalStorage(Path(get_settings().media_root) / "objects")
+    return backend, storage_url
+
+
+def media_source(storage_url: str) -> str | None:
+    """A path or URL that ffmpeg/ffprobe can read, or None if the object is missing."""
+    backend, key = resolve_storage_url(storage_url)
+    path = backend.local_path(key)
+    if path is not None:
+        return str(path) if path.exists() else None
+    if backend.stat(key) is None:
+        return None
+    return backend.presigned_url(key)
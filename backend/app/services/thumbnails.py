@@ -0,0 +1,145 @@
+import io
+import math
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.after_commit import after_commit
+from app.models.game_upload import GameUpload
+from app.services.storage import get_storage
+
+
+def _timestamp(seconds: float) -> str:
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}.{millis:03d}"
+
+
+def build_thumbnail_vtt(
+    duration: float,
+    sheet_count: int,
+    interval: int,
+    width: int,
+    height: int,
+    columns: int,
+    rows: int,
+) -> str:
+    """WebVTT cues mapping each ``interval`` of film to a tile in a sprite sheet.
+
+    Cue payloads are ``thumbnails/<sheet>.jpg#xywh=x,y,w,h``, relative to the
+    ``thumbnails.vtt`` endpoint that serves the index.
+    """
+    per_sheet = columns * rows
+    tiles = min(math.ceil(duration / interval), sheet_count * per_sheet)
+    lines = ["WEBVTT", ""]
+    for tile in range(tiles):
+        sheet, position = divmod(tile, per_sheet)
+        row, column = divmod(position, columns)
+        start = tile * interval
+        end = min(duration, start + interval)
+        lines.append(f"{_timestamp(start)} --> {_timestamp(end)}")
+        lines.append(f"thumbnails/{sheet}.jpg#xywh={column * width},{row * height},{width},{height}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+class ThumbnailService:
+    """Renders scrub-preview sprite sheets and their WebVTT index for game film.
+
+    ffmpeg only decodes keyframes (``-skip_frame nokey``), picks one frame per
+    ``thumbnail_interval_seconds`` and tiles them into JPEG sheets, so a full
+    game costs a handful of small images instead of a decode of every frame.
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.storage = get_storage()
+
+    @staticmethod
+    def sheet_key(prefix: str, index: int) -> str:
+        return f"{prefix}/sprite-{index}.jpg"
+
+    @staticmethod
+    def index_key(prefix: str) -> str:
+        return f"{prefix}/index.vtt"
+
+    def generate(self, upload: GameUpload, source: str, duration: float) -> bool:
+        """Render sheets for ``upload`` and record them on the row. Does not commit."""
+        ffmpeg = shutil.which("ffmpeg")
+        if not ffmpeg or duration <= 0:
+            return False
+        settings = self.settings
+        width, height = settings.thumbnail_width, settings.thumbnail_height
+        columns, rows = settings.thumbnail_columns, settings.thumbnail_rows
+        video_filter = (
+            f"fps=1/{settings.thumbnail_interval_seconds},"
+            f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,"
+            f"tile={columns}x{rows}"
+        )
+        with tempfile.TemporaryDirectory() as workdir:
+            try:
+                subprocess.run(
+                    [
+                        ffmpeg,
+                        "-v",
+                        "error",
+                        "-skip_frame",
+                        "nokey",
+                        "-i",
+                        source,
+                        "-an",
+                        "-vf",
+                        video_filter,
+                        "-q:v",
+                        "5",
+                        "-start_number",
+                        "0",
+                        str(Path(workdir) / "sprite-%d.jpg"),
+                    ],
+                    capture_output=True,
+                    check=True,
+                    timeout=settings.thumbnail_timeout_seconds,
+                )
+            except (subprocess.SubprocessError, OSError) as exc:
+                print(f"[FILM] Thumbnail render failed for upload {upload.id}: {exc}")
+                return False
+            sheets = sorted(Path(workdir).glob("sprite-*.jpg"), key=lambda path: int(path.stem.split("-")[1]))
+            if not sheets:
+                return False
+            prefix = f"thumbnails/upload-{upload.id}"
+            for index, path in enumerate(sheets):
+                self.storage.put_file(self.sheet_key(prefix, index), path)
+        vtt = build_thumbnail_vtt(
+            duration, len(sheets), settings.thumbnail_interval_seconds, width, height, columns, rows
+        )
+        self.storage.write_stream(self.index_key(prefix), io.BytesIO(vtt.encode("utf-8")))
+        upload.thumbnail_prefix = prefix
+        upload.thumbnail_sheets = len(sheets)
+        return True
+
+    def purge(self, db: Session, upload: GameUpload) -> None:
+        """Delete ``upload``'s sheets, once ``db`` commits, unless a duplicate upload still shares them."""
+        if not upload.thumbnail_prefix:
+            return
+        shared = (
+            db.query(GameUpload.id)
+            .filter(GameUpload.thumbnail_prefix == upload.thumbnail_prefix, GameUpload.id != upload.id)
+            .first()
+        )
+        if shared:
+            return
+        prefix, sheets = upload.thumbnail_prefix, upload.thumbnail_sheets or 0
+
+        def delete_sheets() -> None:
+            for index in range(sheets):
+                self.storage.delete(self.sheet_key(prefix, index))
+            self.storage.delete(self.index_key(prefix))
+
+        after_commit(db, delete_sheets)
@@ -0,0 +1,114 @@
+"""Benchmark clip-to-possession linking for many published clips.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_clip_linking --clips 1000 --possessions 1000000
+
+Compares publishing clips one at a time (indexed per-clip lookup) against the
+batched sort-and-sweep join. Set ``BENCH_DATABASE_URL`` to target Postgres; the
+default is a throwaway SQLite file.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401
+from app.db.base_class import Base
+from app.models.clip import Clip
+from app.models.clip_possession_link import ClipPossessionLink
+from app.models.game import Game
+from app.models.possession import Possession
+from app.services.clip_stats import link_clip_to_possessions, link_clips_to_possessions
+
+POSSESSION_SECONDS = 12
+INSERT_BATCH = 50_000
+
+
+def seed(db: Session, games: int, possessions: int, clips: int) -> list[Clip]:
+    db.execute(
+        insert(Game),
+        [{"matchup": f"Team {n} vs Team {n + 1}", "scheduled_at": datetime(2025, 11, 1)} for n in range(games)],
+    )
+    per_game = possessions // games
+    rows = []
+    for game_id in range(1, games + 1):
+        for index in range(per_game):
+            start = index * POSSESSION_SECONDS
+            rows.append(
+                {
+                    "game_id": game_id,
+                    "label": "Possession",
+                    "video_start_second": start,
+                    "video_end_second": start + POSSESSION_SECONDS,
+                }
+            )
+            if len(rows) >= INSERT_BATCH:
+                db.execute(insert(Possession), rows)
+                rows = []
+    if rows:
+        db.execute(insert(Possession), rows)
+
+    rng = random.Random(7)
+    game_length = per_game * POSSESSION_SECONDS
+    created = []
+    for index in range(clips):
+        start = rng.randrange(0, max(game_length - 60, 1))
+        created.append(
+            Clip(
+                title=f"Clip {index}",
+                storage_url="bench.mp4",
+                status="published",
+                game_id=rng.randint(1, games),
+                source_start_second=start,
+                source_end_second=start + rng.randint(5, 45),
+            )
+        )
+    db.add_all(created)
+    db.commit()
+    return created
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--possessions", type=int, default=1_000_000)
+    parser.add_argument("--clips", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = os.environ.get("BENCH_DATABASE_URL", f"sqlite:///{tmp}/bench.db")
+        engine = create_engine(url)
+        Base.metadata.create_all(engine)
+
+        with Session(engine) as db:
+            started = time.perf_counter()
+            clips = seed(db, args.games, args.possessions, args.clips)
+            print(f"seeded {args.possessions:,} possessions / {args.clips:,} clips in {time.perf_counter() - started:.1f}s")
+
+            started = time.perf_counter()
+            for clip in clips:
+                link_clip_to_possessions(db, clip)
+            per_clip = time.perf_counter() - started
+            per_clip_links = db.query(ClipPossessionLink).count()
+
+            db.query(ClipPossessionLink).delete()
+            db.commit()
+
+            started = time.perf_counter()
+            batched_links = link_clips_to_possessions(db, clips)
+            batched = time.perf_counter() - started
+
+        engine.dispose()
+
+    print(f"per-clip: {per_clip:.2f}s ({args.clips / per_clip:,.0f} clips/s, {per_clip_links:,} links)")
+    print(f"batched:  {batched:.2f}s ({args.clips / batched:,.0f} clips/s, {batched_links:,} links)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark matching film uploads to games by matchup text.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_game_matching --games 50000
+
+Compares the cached Aho-Corasick matchup index against a linear scan of every
+game. Set ``BENCH_DATABASE_URL`` to target Postgres; the default is in-memory
+SQLite.
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401
+from app.core.text import normalize_text
+from app.db.base_class import Base
+from app.models.game import Game
+from app.services.game_matching import find_game_for_upload
+
+
+def linear_scan(db: Session, text: str) -> int | None:
+    combined = normalize_text(text)
+    for game_id, matchup in db.query(Game.id, Game.matchup).order_by(Game.scheduled_at.desc()):
+        normalized = normalize_text(matchup)
+        if normalized and normalized in combined:
+            return game_id
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=50_000)
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    schools = [f"School {n}" for n in range(2000)]
+    season_start = datetime(2025, 11, 1)
+    rows = []
+    for _ in range(args.games):
+        home, away = rng.sample(schools, 2)
+        matchup = f"{home} vs {away}"
+        rows.append(
+            {
+                "matchup": matchup,
+                "normalized_matchup": normalize_text(matchup),
+                "scheduled_at": season_start + timedelta(minutes=rng.randrange(0, 200_000)),
+            }
+        )
+
+    engine = create_engine(os.environ.get("BENCH_DATABASE_URL", "sqlite://"))
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.execute(insert(Game), rows)
+        db.commit()
+
+        titles = [f"Full game film: {rng.choice(rows)['matchup']} (4th quarter)" for _ in range(args.lookups)]
+        titles += [f"Practice scrimmage {n}" for n in range(args.lookups // 4)]
+
+        started = time.perf_counter()
+        find_game_for_upload(db, "warm up the index", None)
+        build = time.perf_counter() - started
+
+        started = time.perf_counter()
+        indexed = [getattr(find_game_for_upload(db, title, None), "id", None) for title in titles]
+        indexed_elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        scanned = [linear_scan(db, title) for title in titles]
+        scan_elapsed = time.perf_counter() - started
+
+    assert indexed == scanned, "indexed and linear matching disagree"
+    print(f"games={args.games:,} lookups={len(titles)} index_build={build:.2f}s")
+    print(f"indexed: {indexed_elapsed / len(titles) * 1000:.3f} ms/lookup")
+    print(f"linear:  {scan_elapsed / len(titles) * 1000:.3f} ms/lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark bulk possession ingestion against a synthetic season-sized CSV.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_ingestion --rows 100000
+
+Rows are derived from ``sample_data/valley_central_possessions.csv`` with the
+roster spread across many teams so player/team resolution is exercised. Set
+``BENCH_DATABASE_URL`` to target Postgres; the default is in-memory SQLite.
+"""
+import argparse
+import csv
+import os
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Settings are required at import time but unused here.
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401
+from app.db.base_class import Base
+from app.services.ingestion import StatsIngestionService
+
+SAMPLE_CSV = Path(__file__).resolve().parent.parent / "sample_data" / "valley_central_possessions.csv"
+
+
+def write_synthetic_csv(path: Path, rows: int, teams: int) -> None:
+    with SAMPLE_CSV.open(newline="") as source:
+        reader = csv.DictReader(source)
+        fieldnames = reader.fieldnames
+        template = list(reader)
+
+    with path.open("w", newline="") as target:
+        writer = csv.DictWriter(target, fieldnames=fieldnames)
+        writer.writeheader()
+        for index in range(rows):
+            cycle, position = divmod(index, len(template))
+            row = dict(template[position])
+            suffix = cycle % teams
+            offset = cycle * 50
+            row["player"] = f"{row['player']} {suffix}"
+            row["team"] = f"{row['team']} {suffix}"
+            row["start_second"] = int(row["start_second"]) + offset
+            row["end_second"] = int(row["end_second"]) + offset
+            writer.writerow(row)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--teams", type=int, default=40)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    engine = create_engine(os.environ.get("BENCH_DATABASE_URL", "sqlite://"))
+    Base.metadata.create_all(engine)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "synthetic_possessions.csv"
+        write_synthetic_csv(csv_path, args.rows, args.teams)
+
+        with Session(engine) as db:
+            started = time.perf_counter()
+            game = StatsIngestionService(db, batch_size=args.batch_size).ingest_possession_csv(
+                csv_path, "Valley vs Central", datetime(2025, 11, 26, 19, 0)
+            )
+            elapsed = time.perf_counter() - started
+
+    print(f"game_id={game.id} rows={args.rows} batch_size={args.batch_size}")
+    print(f"elapsed={elapsed:.2f}s rows_per_second={args.rows / elapsed:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
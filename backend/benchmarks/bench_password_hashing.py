@@ -0,0 +1,95 @@
+"""Benchmark login throughput and tail latency under a sign-in burst.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_password_hashing --logins 400 --concurrency 64
+
+Seeds one user in a throwaway SQLite database, then fires concurrent
+``POST /auth/login`` requests at the app in-process while a second task polls
+``GET /health`` (a plain sync route on the shared threadpool). Reports
+logins/second, login p50/p99, how many logins were shed with 503 and the
+health-check p99, which should stay flat while argon2 runs on its own pool.
+Argon2 cost and pool size come from the usual ``PASSWORD_HASH_*`` settings.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+import httpx  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.core.security import get_password_hash  # noqa: E402
+from app.db.base_class import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+EMAIL = "bench@example.com"
+PASSWORD = "correct horse battery staple"
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+
+
+async def run(logins: int, concurrency: int) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies: list[float] = []
+        statuses: dict[int, int] = {}
+        health: list[float] = []
+        done = asyncio.Event()
+
+        async def login() -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post("/api/v1/auth/login", data={"username": EMAIL, "password": PASSWORD})
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                if response.status_code == 200:
+                    latencies.append(time.perf_counter() - started)
+
+        async def poll_health() -> None:
+            while not done.is_set():
+                started = time.perf_counter()
+                await client.get("/health")
+                health.append(time.perf_counter() - started)
+                await asyncio.sleep(0.01)
+
+        poller = asyncio.create_task(poll_health())
+        started = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await poller
+
+    ok = statuses.get(200, 0)
+    print(f"logins:  {ok}/{logins} ok in {elapsed:.2f}s ({ok / elapsed:.1f}/s), statuses {statuses}")
+    print(f"latency: p50 {percentile(latencies, 0.50):.0f} ms, p99 {percentile(latencies, 0.99):.0f} ms")
+    print(f"/health: p99 {percentile(health, 0.99):.1f} ms over {len(health)} polls")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        if not db.query(User).filter(User.email == EMAIL).first():
+            db.add(User(email=EMAIL, hashed_password=get_password_hash(PASSWORD), is_verified=True))
+            db.commit()
+    asyncio.run(run(args.logins, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
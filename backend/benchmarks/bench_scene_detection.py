@@ -0,0 +1,154 @@
+"""Benchmark scene-cut / dead-ball segment detection on a 2-hour film.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_scene_detection --minutes 120 --fps 4
+    python -m benchmarks.bench_scene_detection --film path/to/game.mp4
+
+Two stages:
+
+* detection: synthesizes downsampled grayscale frames the way ffmpeg pipes
+  them (64x36 at the analysis frame rate) with textured "plays" separated by
+  hard cuts and still dead-ball stretches, and times only the NumPy
+  detection. Reports how many planted cuts were found within one second.
+* end to end: times ``SceneDetector.suggest_segments`` on a real file, so the
+  ffmpeg decode and scaling are included. Pass ``--film`` with real game film;
+  otherwise a ``--minutes`` long 720p30 H.264 test pattern is encoded first
+  (not timed). Skipped when ffmpeg is not on ``PATH``.
+
+Both report throughput as a multiple of real time.
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import numpy as np  # noqa: E402
+
+from app.core.config import get_settings  # noqa: E402
+from app.services.scene_detection import (  # noqa: E402
+    SceneDetector,
+    detect_boundaries,
+    frame_difference_signal,
+    segments_from_boundaries,
+)
+
+WIDTH, HEIGHT = 64, 36
+BLOCK_FRAMES = 512
+
+
+def synthesize(minutes: float, fps: float, seed: int = 7) -> tuple[list[np.ndarray], list[float]]:
+    rng = np.random.default_rng(seed)
+    total = int(minutes * 60 * fps)
+    frames = np.empty((total, HEIGHT, WIDTH), dtype=np.uint8)
+    cuts = []
+    index = 0
+    while index < total:
+        play = int(rng.uniform(12, 30) * fps)
+        dead = int(rng.uniform(4, 8) * fps)
+        scene = rng.integers(40, 200, size=(HEIGHT, WIDTH)).astype(np.int16)
+        for offset in range(min(play, total - index)):
+            # Camera pan plus sensor noise: steady, moderate frame-to-frame change.
+            shifted = np.roll(scene, offset, axis=1)
+            frames[index + offset] = np.clip(shifted + rng.integers(-6, 7, size=scene.shape), 0, 255)
+        index += play
+        still = frames[min(index, total) - 1]
+        for offset in range(min(dead, total - index)):
+            frames[index + offset] = np.clip(still + rng.integers(-1, 2, size=still.shape), 0, 255)
+        index += dead
+        if index < total:
+            cuts.append(index / fps)
+    blocks = [frames[start : start + BLOCK_FRAMES] for start in range(0, total, BLOCK_FRAMES)]
+    return blocks, cuts
+
+
+def bench_detection(minutes: float, fps: float) -> None:
+    started = time.perf_counter()
+    blocks, cuts = synthesize(minutes, fps)
+    print(f"synthesized {sum(len(block) for block in blocks):,} frames in {time.perf_counter() - started:.1f}s")
+
+    duration = minutes * 60
+    started = time.perf_counter()
+    signal = frame_difference_signal(iter(blocks))
+    boundaries = detect_boundaries(signal, fps)
+    segments = segments_from_boundaries(boundaries, duration, 6, 45)
+    elapsed = time.perf_counter() - started
+
+    found = sum(1 for cut in cuts if np.any(np.abs(boundaries - cut) <= 1.0))
+    print(f"detection:  {elapsed:.2f}s for {duration / 60:.0f} min of film ({duration / elapsed:,.0f}x real time)")
+    print(f"segments:   {len(segments):,} (planted cuts found: {found}/{len(cuts)})")
+
+
+def encode_test_film(ffmpeg: str, minutes: float, path: str) -> None:
+    subprocess.run(
+        [
+            ffmpeg,
+            "-v",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            f"testsrc2=size=1280x720:rate=30:duration={minutes * 60}",
+            "-c:v",
+            "libx264",
+            "-preset",
+            "ultrafast",
+            "-g",
+            "60",
+            "-y",
+            path,
+        ],
+        check=True,
+    )
+
+
+def bench_end_to_end(film: str | None, minutes: float) -> None:
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        print("end to end: skipped (ffmpeg not found)")
+        return
+    with tempfile.TemporaryDirectory() as workdir:
+        if film is None:
+            film = os.path.join(workdir, "film.mp4")
+            started = time.perf_counter()
+            encode_test_film(ffmpeg, minutes, film)
+            print(f"encoded {minutes:.0f} min 720p30 test film in {time.perf_counter() - started:.1f}s (not timed)")
+            duration = minutes * 60
+        else:
+            duration = float(
+                subprocess.run(
+                    [shutil.which("ffprobe") or "ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", film],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                ).stdout.strip()
+            )
+
+        started = time.perf_counter()
+        segments = SceneDetector().suggest_segments(film, duration)
+        elapsed = time.perf_counter() - started
+    print(
+        f"end to end: {elapsed:.2f}s for {duration / 60:.0f} min of film at {get_settings().scene_analysis_fps:g} fps "
+        f"({duration / elapsed:,.1f}x real time), decode included"
+    )
+    print(f"segments:   {len(segments or []):,}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=120)
+    parser.add_argument("--fps", type=float, default=4.0)
+    parser.add_argument("--film", help="real film for the end-to-end stage instead of a generated test pattern")
+    args = parser.parse_args()
+
+    bench_detection(args.minutes, args.fps)
+    bench_end_to_end(args.film, args.minutes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import os
+
+# Settings are read at import time; tests build their own engines, so these only need to parse.
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
@@ -0,0 +1,74 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401
+from app.db.base_class import Base
+from app.models.clip import Clip
+from app.models.clip_possession_link import ClipPossessionLink
+from app.models.game import Game
+from app.models.player import Player
+from app.models.possession import Possession
+from app.models.team import Team
+from app.services.clip_stats import hydrate_clips_stats
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def _seed_clips(db: Session, count: int) -> list[Clip]:
+    team = Team(name="Home")
+    game = Game(matchup="Home vs Away", scheduled_at=datetime(2026, 1, 1))
+    players = [Player(name=f"Player {number}", jersey_number=str(number), team=team) for number in range(3)]
+    db.add_all([team, game, *players])
+    db.flush()
+    clips = []
+    for index in range(count):
+        clip = Clip(title=f"Clip {index}", storage_url=f"clips/{index}.mp4", game_id=game.id, team_id=team.id)
+        possessions = [
+            Possession(game_id=game.id, player_id=player.id, label="drive", video_start_second=index, video_end_second=index + 5)
+            for player in players
+        ]
+        db.add(clip)
+        db.add_all(possessions)
+        db.flush()
+        db.add_all(ClipPossessionLink(clip_id=clip.id, possession_id=possession.id) for possession in possessions)
+        clips.append(clip)
+    db.commit()
+    return clips
+
+
+def _count_queries(db: Session, func, *args) -> int:
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        func(*args)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return len(statements)
+
+
+@pytest.mark.parametrize("count", [1, 10, 120])
+def test_hydrate_clips_stats_runs_one_query_regardless_of_clip_count(db, count):
+    clips = _seed_clips(db, count)
+    # Load the clips up front so only hydration is counted.
+    clips = db.query(Clip).filter(Clip.id.in_([clip.id for clip in clips])).all()
+
+    assert _count_queries(db, hydrate_clips_stats, db, clips) == 1
+    for clip in clips:
+        assert clip.stats_summary["total_possessions"] == 3
+        assert len(clip.possession_context) == 3
@@ -0,0 +1,22 @@
+import io
+from pathlib import Path
+
+from app.services.storage import get_storage, media_source, resolve_storage_url
+
+
+def test_upload_reads_back_and_deletes_with_relative_media_root(tmp_path, monkeypatch):
+    # The default MEDIA_ROOT ("storage/uploads") is relative to the working directory.
+    monkeypatch.chdir(tmp_path)
+    backend = get_storage()
+    backend.write_stream("abc.mp4", io.BytesIO(b"film bytes"))
+    storage_url = backend.url_for("abc.mp4")
+
+    resolved, key = resolve_storage_url(storage_url)
+    assert resolved.stat(key).size == len(b"film bytes")
+    assert resolved.open_range(key, 5).read() == b"bytes"
+    assert Path(media_source(storage_url)).read_bytes() == b"film bytes"
+
+    resolved.delete(key)
+    assert resolved.stat(key) is None
+    assert media_source(storage_url) is None
+    assert not [path for path in tmp_path.rglob("*") if path.is_file()]